@@ -0,0 +1,64 @@
+from typing import Dict, Iterable
+
+import numpy as np
+from django.db.models import Sum
+
+from .models import CardBenefit
+
+
+class BenefitCalculator:
+    """
+    카드 혜택 계산기
+
+    기간 내 카테고리별 지출 벡터와 대상 카드들의 혜택(혜택율/한도)을 각각 한 번씩만 조회한 뒤,
+    모든 카드의 한도 적용 혜택을 배열 연산으로 한 번에 계산합니다.
+    카드/혜택 수와 무관하게 쿼리 수가 일정합니다.
+    """
+
+    def __init__(self, expenses):
+        """
+        Args:
+            expenses (QuerySet): 계산 대상 기간의 Expense QuerySet (예: Expense.objects.for_month(...))
+        """
+        rows = expenses.values('category').annotate(total=Sum('amount')).order_by()
+        self.spend_by_category = {row['category']: row['total'] or 0 for row in rows}
+
+    def per_card(self, card_ids: Iterable[int]) -> Dict[int, float]:
+        """
+        카드별 예상 혜택 금액
+
+        Args:
+            card_ids (Iterable[int]): 대상 카드 ID 목록
+
+        Returns:
+            Dict[int, float]: {card_id: 한도 적용 후 혜택 합계}
+        """
+        card_ids = list(dict.fromkeys(card_ids))
+        if not card_ids:
+            return {}
+
+        benefits = list(
+            CardBenefit.objects.filter(card_id__in=card_ids)
+            .values_list('card_id', 'category_id', 'benefit_rate', 'benefit_limit')
+        )
+        if not benefits:
+            return {card_id: 0.0 for card_id in card_ids}
+
+        card_index = {card_id: index for index, card_id in enumerate(card_ids)}
+        card_pos = np.fromiter((card_index[b[0]] for b in benefits), dtype=np.int64, count=len(benefits))
+        spend = np.fromiter((self.spend_by_category.get(b[1], 0) for b in benefits), dtype=np.float64, count=len(benefits))
+        rate = np.fromiter((float(b[2] or 0) for b in benefits), dtype=np.float64, count=len(benefits))
+        limit = np.fromiter((b[3] or 0 for b in benefits), dtype=np.float64, count=len(benefits))
+
+        # 혜택 = 지출 × 혜택율, 한도가 있으면 한도까지만
+        raw = spend * (rate / 100)
+        capped = np.where(limit > 0, np.minimum(raw, limit), raw)
+
+        totals = np.bincount(card_pos, weights=capped, minlength=len(card_ids))
+        return dict(zip(card_ids, totals.tolist()))
+
+    def total(self, card_ids: Iterable[int]) -> float:
+        """대상 카드들의 예상 혜택 총합 (같은 카드가 여러 번 포함되면 그만큼 합산)"""
+        card_ids = list(card_ids)
+        per_card = self.per_card(card_ids)
+        return float(sum(per_card[card_id] for card_id in card_ids))
@@ -36,3 +36,47 @@ class CodefApiTest(TestCase):
         
         # 결과 확인을 위해 출력 (옵션)
         print(json.dumps(result, indent=4, ensure_ascii=False))'''
+
+
+from datetime import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from category.models import Category
+from expense.models import Expense
+from users.models import User, UserCard
+from .benefits import BenefitCalculator
+from .models import Card, CardBenefit
+
+
+class BenefitCalculatorTests(TestCase):
+    """카드별 예상 혜택 (혜택율 × 카테고리 지출, 한도 적용)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(phone='01000000000', name='테스트', password='pw')
+        self.food = Category.objects.create(category_name='식비')
+        self.cafe = Category.objects.create(category_name='카페/디저트')
+        self.card = Card.objects.create(card_name='굿데이', company='국민카드')
+        self.plain_card = Card.objects.create(card_name='기본', company='국민카드')
+        CardBenefit.objects.create(card=self.card, category=self.food, benefit_rate=10, benefit_limit=3000)
+        CardBenefit.objects.create(card=self.card, category=self.cafe, benefit_rate=5)
+        user_card = UserCard.objects.create(user=self.user, card=self.card)
+        spent_at = timezone.make_aware(datetime(2026, 9, 1, 12))
+        for category, amount, status in ((self.food, 50000, 'PAID'), (self.cafe, 20000, 'PAID'), (self.cafe, 9000, 'CANCELLED')):
+            Expense.objects.create(
+                user=self.user, user_card=user_card, category=category, merchant_name='가게',
+                amount=amount, spent_at=spent_at, status=status,
+            )
+        self.expenses = Expense.objects.for_month(self.user, 2026, 9)
+
+    def test_per_card_applies_rate_and_limit(self):
+        with self.assertNumQueries(2):
+            per_card = BenefitCalculator(self.expenses).per_card([self.card.card_id, self.plain_card.card_id])
+        # 식비 5,000 → 한도 3,000 + 카페 20,000 × 5% (취소 건 제외)
+        self.assertEqual(per_card, {self.card.card_id: 4000.0, self.plain_card.card_id: 0.0})
+
+    def test_total_counts_repeated_cards(self):
+        calculator = BenefitCalculator(self.expenses)
+        self.assertEqual(calculator.total([self.card.card_id, self.card.card_id]), 8000.0)
+        self.assertEqual(calculator.total([]), 0.0)
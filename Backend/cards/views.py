@@ -6,7 +6,9 @@ from datetime import timedelta, date
 from .models import CardBenefit, Card  # [설명] 본인 앱(cards)의 모델
 from users.models import UserCard  # [설명] users 앱의 User 모델
 from expense.models import Expense  # [설명] expense 앱의 Expense 모델
+from expense import response_cache  # [설명] 사용자별 응답 캐시
 from django.db.models import Avg, Sum  # [설명] 집계 함수 import
+from .benefits import BenefitCalculator
 from .serializers import CardSerializer, RecommendedCardSerializer, UserCardListSerializer, CardRecommendationsResponseSerializer
 from drf_spectacular.utils import extend_schema, OpenApiParameter  # [추가] drf-spectacular 스웨거 설정을 위해 import
 from category.models import Category
@@ -31,6 +33,7 @@ class CardListView(APIView):
         responses={200: UserCardListSerializer(many=True)},
         tags=["Cards"]
     )
+    @response_cache.cached_response('card-list')
     def get(self, request):
         # UserCard 목록을 가져옵니다.
         user_card_queryset = UserCard.objects.filter(user=request.user).select_related('card')
@@ -65,16 +68,13 @@ class CardRecommendationView(APIView):
         tags=["Cards"]
     )
 
+    @response_cache.cached_response('card-recommendation')
     def get(self, request):
         user = request.user
         three_months_ago = timezone.now() - timedelta(days=90)
 
         # 1. 최근 3개월간 가장 많이 소비한 카테고리 Top 1 추출
-        top_category_data = Expense.objects.filter(
-            user=user,
-            spent_at__gte=three_months_ago,
-            deleted_at__isnull=True
-        ).values('category').annotate(
+        top_category_data = Expense.objects.for_range(user, three_months_ago).values('category').annotate(
             total_amount=Sum('amount')
         ).order_by('-total_amount').first()
 
@@ -114,32 +114,26 @@ class CardBenefitAnalysisView(APIView):
         description="보유 카드의 효율 분석 결과와 소비 패턴 기반 추천 카드 TOP 5를 함께 반환합니다.",
         tags=["Analysis"]
     )
+    @response_cache.cached_response('card-benefit-analysis')
     def get(self, request):
         user = request.user
         three_months_ago = timezone.now() - timedelta(days=90)
         
         try:
             # --- 1. 내 카드 효율(ROI) 분석 로직 ---
-            user_cards = UserCard.objects.filter(user=user).select_related('card')
+            user_cards = list(UserCard.objects.filter(user=user).select_related('card'))
             my_cards_analysis = []
             seen_card_ids = set() # 내 카드 ID 저장용 (이미 가진 카드 추천 제외용)
 
+            # 최근 3개월 카테고리별 지출과 보유 카드 혜택을 한 번씩만 조회하여 카드별 혜택 계산
+            calculator = BenefitCalculator(Expense.objects.for_range(user, three_months_ago))
+            benefit_by_card = calculator.per_card(uc.card_id for uc in user_cards)
+
             for uc in user_cards:
                 card = uc.card
                 seen_card_ids.add(card.card_id) 
                 
-                total_benefit = 0
-                benefits = CardBenefit.objects.filter(card=card)
-                
-                for benefit in benefits:
-                    expense_sum = Expense.objects.filter(
-                        user=user, category=benefit.category,
-                        spent_at__gte=three_months_ago, deleted_at__isnull=True
-                    ).aggregate(Sum('amount'))['amount__sum'] or 0
-                    
-                    if expense_sum > 0:
-                        calc = expense_sum * (float(benefit.benefit_rate) / 100)
-                        total_benefit += min(calc, benefit.benefit_limit) if benefit.benefit_limit else calc
+                total_benefit = benefit_by_card.get(card.card_id, 0)
 
                 annual_fee = max(card.annual_fee_domestic, 1000)
                 monthly_avg = total_benefit / 3
@@ -155,16 +149,14 @@ class CardBenefitAnalysisView(APIView):
 
             # --- 2. 추천 카드 분석 로직 ---
             # (소비패턴 전체 분석 후 상위 카테고리 3개 추출)
-            category_stats = Expense.objects.filter(
-                user=user, spent_at__gte=three_months_ago
-            ).values('category').annotate(total_amount=Sum('amount')).order_by('-total_amount')[:3]
+            category_stats = Expense.objects.for_range(user, three_months_ago).values('category').annotate(total_amount=Sum('amount')).order_by('-total_amount')[:3]
             
             top_category_ids = [s['category'] for s in category_stats]
             
             # 해당 카테고리 혜택이 좋은 카드 검색
             candidate_benefits = CardBenefit.objects.filter(
                 category_id__in=top_category_ids
-            ).select_related('card').order_by('-benefit_rate')
+            ).select_related('card', 'category').order_by('-benefit_rate')
 
             recommendations = []
             for ben in candidate_benefits:
@@ -220,6 +212,7 @@ class CardRecommendationsView(APIView):
         responses={200: CardRecommendationsResponseSerializer},
         tags=["Cards"]
     )
+    @response_cache.cached_response('card-recommendations')
     def get(self, request):
         user = request.user
         now = timezone.now()
@@ -232,12 +225,7 @@ class CardRecommendationsView(APIView):
         }
 
         # 1. 최근 3개월 지출 내역 가져오기
-        expenses = Expense.objects.filter(
-            user=user,
-            spent_at__gte=three_months_ago,
-            deleted_at__isnull=True,
-            status='PAID'
-        ).select_related('category')
+        expenses = Expense.objects.for_range(user, three_months_ago).select_related('category')
 
         if not expenses.exists():
             return Response({
@@ -0,0 +1,139 @@
+"""
+가맹점명 → 카테고리 분류기
+
+카테고리 키워드 테이블(category.keywords)을 하나의 Aho-Corasick 오토마톤으로 컴파일해
+가맹점명을 한 번만 훑어 모든 키워드를 찾고, 가장 긴 키워드의 카테고리를 선택합니다.
+같은 가맹점은 반복해서 들어오므로 결과는 크기 제한이 있는 LRU 캐시에 보관합니다.
+"""
+from collections import deque
+from functools import lru_cache
+
+from .keywords import (
+    CATEGORY_KEYWORDS, KEYWORD_TO_CATEGORY, MERCHANT_KEYWORD_TO_CATEGORY, MERCHANT_EXCLUDED_KEYWORDS,
+)
+from .models import Category
+
+DEFAULT_CATEGORY_NAME = "기타"  # [설명] 분류되지 않은 거래의 카테고리
+CLASSIFY_CACHE_SIZE = 4096  # [설명] 가맹점명 → 카테고리 LRU 캐시 크기
+SHORT_ASCII_KEYWORD = 3  # [설명] 이 길이 이하의 영문 키워드는 단어 경계에서만 일치 (예: CU가 CUCKOO에 걸리지 않도록)
+
+
+def merchant_keywords():
+    """가맹점 분류용 키워드 → 카테고리 (뒤에 오는 테이블이 우선)"""
+    table = {}
+    for category_name, keywords in CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            table[keyword] = category_name
+    table.update(KEYWORD_TO_CATEGORY)
+    table.update(MERCHANT_KEYWORD_TO_CATEGORY)
+    return {
+        keyword.lower(): category_name
+        for keyword, category_name in table.items()
+        if keyword not in MERCHANT_EXCLUDED_KEYWORDS
+    }
+
+
+class KeywordAutomaton:
+    """
+    다중 패턴 검색용 Aho-Corasick 오토마톤
+
+    텍스트 길이에 비례하는 한 번의 순회로 모든 키워드 출현 위치를 찾습니다.
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns (Dict[str, Any]): {키워드(소문자): 값}
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern, value in patterns.items():
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append((pattern, value))
+
+        # BFS로 실패 링크 계산, 실패 노드의 출력을 병합
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, text):
+        """
+        Yields:
+            Tuple[int, str, Any]: (시작 위치, 키워드, 값)
+        """
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for pattern, value in self.output[node]:
+                yield index - len(pattern) + 1, pattern, value
+
+
+def _is_word_boundary(text, start, end):
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return not (before.isascii() and before.isalnum()) and not (after.isascii() and after.isalnum())
+
+
+@lru_cache(maxsize=1)
+def _automaton():
+    return KeywordAutomaton(merchant_keywords())
+
+
+@lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+def classify(merchant_name):
+    """
+    가맹점명의 카테고리명 (가장 긴 일치 키워드 기준)
+
+    Returns:
+        str | None: 카테고리명 (일치하는 키워드가 없으면 None)
+    """
+    text = (merchant_name or '').lower()
+    best = None
+    for start, keyword, category_name in _automaton().search(text):
+        if len(keyword) <= SHORT_ASCII_KEYWORD and keyword.isascii():
+            if not _is_word_boundary(text, start, start + len(keyword)):
+                continue
+        if best is None or len(keyword) > len(best[0]):
+            best = (keyword, category_name)
+    return best[1] if best else None
+
+
+class CategoryResolver:
+    """
+    가맹점명 → Category 객체 변환 (Codef 동기화 한 번에 하나씩 생성)
+
+    카테고리 목록을 한 번만 조회해 두고, 분류되지 않거나 DB에 없는 카테고리는 기본 카테고리로 보냅니다.
+    """
+
+    def __init__(self, default_category=None):
+        self.categories = {
+            category.category_name: category
+            for category in Category.objects.filter(deleted_at__isnull=True)
+        }
+        if default_category is None:
+            default_category = self.categories.get(DEFAULT_CATEGORY_NAME)
+            if default_category is None:
+                default_category, _ = Category.objects.get_or_create(category_name=DEFAULT_CATEGORY_NAME)
+        self.default = default_category
+
+    def resolve(self, merchant_name):
+        """가맹점명에 해당하는 Category (없으면 기본 카테고리)"""
+        return self.categories.get(classify(merchant_name), self.default)
@@ -0,0 +1,116 @@
+# 카테고리 키워드 테이블
+# [설명] 카드 혜택 텍스트 분석(link_categories)과 거래 가맹점명 분류(classifier)가 함께 사용
+
+# 카드 주요혜택 텍스트 → 카테고리 (link_categories 명령)
+CATEGORY_KEYWORDS = {
+    '식비': ['식음료', '식당', '푸드', '베이커리', '외식', '음식점'],
+    '카페/디저트': ['카페', '커피', '스타벅스', '디저트', '제과'],
+    '대중교통': ['대중교통', '버스', '지하철', '택시', '철도'],
+    '편의점': ['편의점', 'GS25', 'CU', '세븐일레븐', '생활 편의'],  # '생활 편의' 추가
+    '온라인쇼핑': ['온라인 쇼핑', '온라인쇼핑', '쿠팡', '11번가', 'G마켓', '쇼핑'],
+    '대형마트': ['마트', '이마트', '홈플러스', '롯데마트'],
+    '주유/차량': ['주유', '충전', '주차', '정비', 'LPG'],
+    '통신/공과금': ['통신', '공과금', '핸드폰', '전기', '수도'],
+    '디지털구독': ['디지털콘텐츠', '멤버십', '넷플릭스', '유튜브', '구독', 'OTT'],  # '디지털콘텐츠' 추가
+    '문화/여가': ['영화', '테마파크', '놀이공원', '공연', '스포츠'],
+    '의료/건강': ['병원', '약국', '건강검진'],
+    '교육': ['학원', '교육', '도서', '서점'],
+    '뷰티/잡화': ['뷰티', '화장품', '올리브영'],
+    '여행/숙박': ['여행', '항공', '숙박', '호텔', '면세점'],
+}
+
+# 카드 혜택 키워드 → 카테고리 (scripts/csv_to_sql.py도 이 테이블을 import해서 사용)
+KEYWORD_TO_CATEGORY = {
+    # 식비
+    '식음료': '식비', '식비': '식비', '음식점': '식비', '외식': '식비',
+    '일반음식점': '식비', '식당': '식비', '레스토랑': '식비',
+
+    # 카페/디저트
+    '카페': '카페/디저트', '디저트': '카페/디저트', '커피': '카페/디저트',
+    '스타벅스': '카페/디저트', '베이커리': '카페/디저트',
+
+    # 대중교통
+    '교통': '대중교통', '대중교통': '대중교통', '택시': '대중교통',
+    '버스': '대중교통', '지하철': '대중교통', '전철': '대중교통',
+
+    # 편의점
+    '편의점': '편의점', 'CVS': '편의점', 'GS25': '편의점', 'CU': '편의점',
+    '세븐일레븐': '편의점',
+
+    # 온라인쇼핑
+    '온라인': '온라인쇼핑', '쇼핑': '온라인쇼핑', '인터넷': '온라인쇼핑',
+    '온라인쇼핑': '온라인쇼핑', '쿠팡': '온라인쇼핑', '배달': '온라인쇼핑',
+    '배달앱': '온라인쇼핑', '간편결제': '온라인쇼핑',
+
+    # 대형마트
+    '마트': '대형마트', '대형마트': '대형마트', '슈퍼마켓': '대형마트',
+    '백화점': '대형마트', '대형할인점': '대형마트', '이마트': '대형마트',
+    '홈플러스': '대형마트', '롯데마트': '대형마트',
+
+    # 주유/차량
+    '주유': '주유/차량', '차량': '주유/차량', '자동차': '주유/차량',
+    '정유사': '주유/차량', '차량서비스': '주유/차량', '주차': '주유/차량',
+
+    # 통신/공과금
+    '통신': '통신/공과금', '공과금': '통신/공과금', 'SKT': '통신/공과금',
+    'KT': '통신/공과금', 'LG': '통신/공과금', '통신요금': '통신/공과금',
+    '관리비': '통신/공과금', '아파트관리비': '통신/공과금',
+
+    # 디지털구독
+    '디지털': '디지털구독', '구독': '디지털구독', 'OTT': '디지털구독',
+    '넷플릭스': '디지털구독', '스포티파이': '디지털구독', '스트리밍': '디지털구독',
+    '디지털콘텐츠': '디지털구독', '멤버십': '디지털구독', '인앱': '디지털구독',
+
+    # 문화/여가
+    '문화': '문화/여가', '영화': '문화/여가', '공연': '문화/여가',
+    'CGV': '문화/여가', '롯데시네마': '문화/여가', '메가박스': '문화/여가',
+    '여가': '문화/여가',
+
+    # 의료/건강
+    '의료': '의료/건강', '건강': '의료/건강', '병원': '의료/건강',
+    '약국': '의료/건강',
+
+    # 교육
+    '교육': '교육', '학원': '교육', '도서': '교육', '서점': '교육',
+
+    # 뷰티/잡화
+    '뷰티': '뷰티/잡화', '화장품': '뷰티/잡화', '올리브영': '뷰티/잡화',
+    '패션': '뷰티/잡화', '의류': '뷰티/잡화',
+
+    # 여행/숙박
+    '여행': '여행/숙박', '숙박': '여행/숙박', '항공': '여행/숙박',
+    '호텔': '여행/숙박', '면세': '여행/숙박', '면세점': '여행/숙박',
+    '공항': '여행/숙박', '라운지': '여행/숙박', '골프': '여행/숙박',
+}
+
+# 가맹점명에만 나오는 브랜드 키워드 → 카테고리 (거래 분류 보강용)
+MERCHANT_KEYWORD_TO_CATEGORY = {
+    '배달의민족': '식비', '요기요': '식비', '쿠팡이츠': '식비', '맥도날드': '식비', '버거킹': '식비',
+    '롯데리아': '식비', '맘스터치': '식비', '김밥': '식비', '치킨': '식비', '분식': '식비',
+    '이디야': '카페/디저트', '투썸': '카페/디저트', '메가커피': '카페/디저트', '빽다방': '카페/디저트',
+    '컴포즈': '카페/디저트', '할리스': '카페/디저트', '파리바게뜨': '카페/디저트', '뚜레쥬르': '카페/디저트',
+    '배스킨라빈스': '카페/디저트',
+    '티머니': '대중교통', '코레일': '대중교통', 'KTX': '대중교통', 'SRT': '대중교통', '카카오T': '대중교통',
+    '이마트24': '편의점', '미니스톱': '편의점', '씨유': '편의점', 'GS리테일': '편의점',
+    '11번가': '온라인쇼핑', 'G마켓': '온라인쇼핑', '옥션': '온라인쇼핑', '무신사': '온라인쇼핑',
+    '네이버페이': '온라인쇼핑', '마켓컬리': '온라인쇼핑', '컬리': '온라인쇼핑', 'SSG': '온라인쇼핑',
+    '코스트코': '대형마트', '트레이더스': '대형마트', '하나로마트': '대형마트',
+    'GS칼텍스': '주유/차량', 'SK에너지': '주유/차량', 'S-OIL': '주유/차량', '현대오일뱅크': '주유/차량',
+    '주유소': '주유/차량', 'LPG': '주유/차량',
+    'SK텔레콤': '통신/공과금', 'LG유플러스': '통신/공과금', 'LGU+': '통신/공과금', '한국전력': '통신/공과금',
+    '도시가스': '통신/공과금',
+    '유튜브': '디지털구독', 'YOUTUBE': '디지털구독', 'NETFLIX': '디지털구독', '왓챠': '디지털구독',
+    '티빙': '디지털구독', '웨이브': '디지털구독', '멜론': '디지털구독', '디즈니플러스': '디지털구독',
+    'SPOTIFY': '디지털구독', 'APPLE.COM': '디지털구독', 'GOOGLE': '디지털구독',
+    '의원': '의료/건강', '치과': '의료/건강', '한의원': '의료/건강',
+    '교보문고': '교육', '영풍문고': '교육', 'YES24': '교육', '알라딘': '교육',
+    '다이소': '뷰티/잡화', '시코르': '뷰티/잡화', '랄라블라': '뷰티/잡화',
+    '대한항공': '여행/숙박', '아시아나': '여행/숙박', '제주항공': '여행/숙박', '야놀자': '여행/숙박',
+    '여기어때': '여행/숙박', '에어비앤비': '여행/숙박', 'AIRBNB': '여행/숙박', 'AGODA': '여행/숙박',
+}
+
+# 혜택 설명에는 쓰이지만 가맹점명 분류에는 너무 포괄적인 키워드
+MERCHANT_EXCLUDED_KEYWORDS = {
+    '온라인', '인터넷', '쇼핑', '디지털', '간편결제', '문화', '여가', '건강', '교통',
+    '멤버십', '인앱', '충전', '전기', '수도', '정비', 'LG', '생활 편의', '스포츠',
+}
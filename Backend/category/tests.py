@@ -1,3 +1,45 @@
-from django.test import TestCase
+import runpy
+from pathlib import Path
+from unittest import skipUnless
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from . import keywords
+from .classifier import DEFAULT_CATEGORY_NAME, CategoryResolver, KeywordAutomaton, classify
+from .models import Category
+
+CSV_TO_SQL = Path(__file__).resolve().parents[2] / 'scripts' / 'csv_to_sql.py'
+
+
+class ClassifierTests(SimpleTestCase):
+    """가맹점명 → 카테고리 분류 확인"""
+
+    def test_classifies_by_longest_keyword(self):
+        self.assertEqual(classify('스타벅스 강남점'), '카페/디저트')
+        self.assertEqual(classify('이마트24 역삼점'), '편의점')  # '이마트'(대형마트)보다 긴 키워드 우선
+        self.assertEqual(classify('GS칼텍스 주유소'), '주유/차량')
+        self.assertIsNone(classify('알 수 없는 가맹점'))
+
+    def test_short_ascii_keyword_needs_word_boundary(self):
+        self.assertEqual(classify('CU 역삼점'), '편의점')
+        self.assertIsNone(classify('CUCKOO'))
+
+    def test_automaton_finds_overlapping_patterns(self):
+        automaton = KeywordAutomaton({'he': 1, 'she': 2, 'hers': 3})
+        self.assertEqual(sorted(automaton.search('ushers')), [(1, 'she', 2), (2, 'he', 1), (2, 'hers', 3)])
+
+    @skipUnless(CSV_TO_SQL.exists(), 'scripts/ 없음 (Docker 이미지에는 Backend만 포함)')
+    def test_csv_to_sql_uses_same_keyword_table(self):
+        script = runpy.run_path(str(CSV_TO_SQL), run_name='csv_to_sql')
+        self.assertIs(script['KEYWORD_TO_CATEGORY'], keywords.KEYWORD_TO_CATEGORY)
+
+
+class CategoryResolverTests(TestCase):
+    """Category 객체 변환 (DB에 없는 카테고리는 기본 카테고리)"""
+
+    def test_resolves_known_and_falls_back_to_default(self):
+        cafe = Category.objects.create(category_name='카페/디저트')
+        resolver = CategoryResolver()
+        self.assertEqual(resolver.resolve('스타벅스'), cafe)
+        self.assertEqual(resolver.resolve('이마트').category_name, DEFAULT_CATEGORY_NAME)
+        self.assertEqual(resolver.resolve('알 수 없는 가맹점'), resolver.default)
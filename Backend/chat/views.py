@@ -9,8 +9,7 @@ from drf_spectacular.utils import extend_schema, inline_serializer
 
 from .models import ChatRoom, ChatLog, ChatMessage
 from cards.models import Card
-from expense.models import Expense
-from django.db.models import Sum
+from expense import monthly_stats
 from .serializers import ChatCardResponseSerializer, ChatMessageSerializer
 
 # 공통 에러 응답 헬퍼 함수
@@ -166,13 +165,10 @@ class ChatView(APIView):
         aiResponseText = ""
         try:
             # --- Gather User Context (Simple) ---
-            now = timezone.now()
-            start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            now = timezone.localtime()
             
-            # This Month Total
-            total_spent = Expense.objects.filter(
-                user=request.user, spent_at__gte=start_of_month
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
+            # This Month Total (materialized MonthlyStat)
+            total_spent = monthly_stats.get_stat(request.user, now.year, now.month).total_spent
 
             # Top Spending Category (Simple approximation)
             # Note: Group by category needs Category model relation. Assuming 'category__category_name' or similar if reachable.
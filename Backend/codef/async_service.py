@@ -0,0 +1,149 @@
+"""
+Codef API async 클라이언트
+
+CodefAPIService와 같은 메서드/반환값을 갖지만 Codef 응답을 기다리는 동안 이벤트 루프를 막지 않습니다.
+요청 본문 구성과 응답 해석은 CodefAPIService의 것을 그대로 쓰고, 전송만 transport.apost로 바꿉니다.
+ASGI(uvicorn) 워커 하나가 수십~수백 건의 Codef 요청을 동시에 기다릴 수 있습니다.
+"""
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from . import token_provider, transport
+from .service import CodefAPIService
+
+logger = logging.getLogger(__name__)
+
+TOKEN_ERROR = {"success": False, "error_message": "Failed to obtain Codef API access token"}
+
+
+class AsyncCodefAPIService(CodefAPIService):
+    """CodefAPIService의 async 버전 (공개 메서드는 모두 코루틴)"""
+
+    async def get_access_token(self) -> Optional[str]:
+        """Codef API 액세스 토큰 (token_provider 캐시 사용, 만료 전에만 새로 발급)"""
+        try:
+            self.access_token = await token_provider.aget_token(self.client_id, self.client_secret)
+            return self.access_token
+        except Exception as e:
+            logger.error(f"Failed to get Access Token: {e}")
+            return None
+
+    async def _post(self, url: str, payload: Dict, endpoint: str) -> httpx.Response:
+        """Bearer 토큰으로 Codef API POST 요청 (401이면 토큰을 새로 발급받아 한 번만 다시 요청)"""
+        response = await transport.apost(url, endpoint, json=payload, headers=self._headers())
+        if response.status_code == 401:
+            logger.warning(f"Codef API returned 401, refreshing access token: {url}")
+            await token_provider.ainvalidate(self.client_id, self.access_token)
+            if await self.get_access_token():
+                response = await transport.apost(url, endpoint, json=payload, headers=self._headers())
+        return response
+
+    async def _ensure_token(self) -> bool:
+        return bool(self.access_token or await self.get_access_token())
+
+    async def create_connected_id(
+        self,
+        organization: str,
+        card_id: str = "",
+        password: str = "",
+        card_no: str = "",
+        card_password: str = "",
+        login_type: str = "1",
+        user_name: str = "",
+        phone_no: str = "",
+        identity: str = "",
+        telecom: str = "",
+        two_way_info: Dict = None
+    ) -> Dict:
+        """Connected ID 발급 (자동 RSA 암호화 적용)"""
+        try:
+            if not await self._ensure_token():
+                return {"success": False, "error_message": "Token Error"}
+
+            payload = self._connected_id_payload(
+                organization, card_id, password, card_no, card_password,
+                login_type, user_name, phone_no, identity, telecom, two_way_info,
+            )
+            response = await self._post(f"{self.CODEF_API_URL}/v1/account/create", payload, 'account-create')
+            return self._connected_id_result(response.status_code, response.text)
+        except Exception as e:
+            logger.error(f"Service Error: {str(e)}")
+            return {"success": False, "error_message": str(e)}
+
+    async def get_card_list(
+        self,
+        organization: str,
+        connected_id: str,
+        birth_date: str = "",
+        card_no: str = "",
+        card_password: str = "",
+        inquiry_type: str = "0"
+    ) -> Dict:
+        """보유 카드 목록 조회 (CodefAPIService.get_card_list 참고)"""
+        try:
+            if not await self._ensure_token():
+                return dict(TOKEN_ERROR)
+
+            payload = self._account_query_payload(organization, connected_id, birth_date, card_no, card_password, inquiry_type)
+            response = await self._post(f"{self.CODEF_API_URL}/v1/kr/card/p/account/card-list", payload, 'card-list')
+            return self._card_list_result(response.status_code, response.text)
+        except httpx.HTTPError as e:
+            logger.error(f"Codef API request failed: {str(e)}")
+            return {"success": False, "error_message": f"API request failed: {str(e)}"}
+        except Exception as e:
+            logger.error(f"Unexpected error in get_card_list: {str(e)}")
+            return {"success": False, "error_message": f"Unexpected error: {str(e)}"}
+
+    async def get_billing_list(
+        self,
+        organization: str,
+        connected_id: str,
+        birth_date: str = "",
+        card_no: str = "",
+        card_password: str = "",
+        inquiry_type: str = "0",
+        encrypted_card_password: str = "",
+    ) -> Dict:
+        """보유 카드 청구 내역 조회 (CodefAPIService.get_billing_list 참고)"""
+        try:
+            if not await self._ensure_token():
+                return dict(TOKEN_ERROR)
+
+            payload = self._account_query_payload(
+                organization, connected_id, birth_date, card_no, card_password, inquiry_type,
+                encrypted_card_password=encrypted_card_password,
+            )
+            response = await self._post(f"{self.CODEF_API_URL}/v1/kr/card/p/account/billing-list", payload, 'billing-list')
+            return self._billing_list_result(response.status_code, response.text)
+        except Exception as e:
+            logger.error(f"Unexpected error in get_billing_list: {str(e)}")
+            return {"success": False, "error_message": f"Unexpected error: {str(e)}"}
+
+    async def get_approval_list(
+        self,
+        organization: str,
+        connected_id: str,
+        start_date: str,
+        end_date: str,
+        card_no: str = "",
+        card_password: str = "",
+        birth_date: str = "",
+        inquiry_type: str = "0",  # 0: 전체, 1: 승인, 2: 취소
+        encrypted_card_password: str = "",
+    ) -> Dict:
+        """카드 승인 내역 조회 (CodefAPIService.get_approval_list 참고)"""
+        try:
+            if not await self._ensure_token():
+                return dict(TOKEN_ERROR)
+
+            payload = self._approval_list_payload(
+                organization, connected_id, start_date, end_date, card_no, card_password, birth_date, inquiry_type,
+                encrypted_card_password=encrypted_card_password,
+            )
+            response = await self._post(f"{self.CODEF_API_URL}/v1/kr/card/p/account/approval-list", payload, 'approval-list')
+            return self._approval_list_result(response.status_code, response.text)
+        except Exception as e:
+            logger.error(f"Error in get_approval_list: {str(e)}")
+            return {"success": False, "error_message": str(e)}
@@ -0,0 +1,68 @@
+"""
+Codef 거래 → 사용자 보유 카드(UserCard) 매칭
+
+청구/승인 내역의 resUsedCard/resCardName(카드명 또는 카드번호 뒷자리)으로 거래한 카드를 찾습니다.
+동기화 한 번에 UserCardMatcher를 하나 만들어 보유 카드를 한 번만 조회하고,
+카드명 부분 문자열/카드번호 끝 4자리 색인으로 행마다 DB 조회 없이 찾습니다.
+
+매칭 규칙 (기존 쿼리 기반 매칭과 같은 순서)
+1. 카드명에 값이 포함된 카드 (대소문자/공백 무시)
+2. 값이 숫자면 카드번호 끝 4자리가 같은 카드
+3. 보유 카드가 하나뿐이면 그 카드
+여러 카드가 해당하면 user_card_id가 가장 작은 카드를 사용합니다. (기존 .first()와 같은 기준)
+"""
+from users.models import UserCard
+
+
+def _normalize(value):
+    # [설명] 대소문자/공백 차이 무시 ("신한 Deep Dream" == "신한deepdream")
+    return ''.join((value or '').split()).casefold()
+
+
+def _last4(value):
+    digits = ''.join(ch for ch in (value or '') if ch.isdigit())
+    return digits[-4:] if len(digits) >= 4 else None
+
+
+class UserCardMatcher:
+    """사용자 보유 카드 색인 (Codef 동기화 한 번에 하나씩 생성)"""
+
+    def __init__(self, user):
+        user_cards = list(UserCard.objects.filter(user=user).select_related('card').order_by('user_card_id'))
+        self.by_name = {}
+        self.by_last4 = {}
+        # [설명] user_card_id 순으로 setdefault → 같은 키는 가장 먼저 등록한 카드가 유지됨
+        for user_card in user_cards:
+            name = _normalize(user_card.card.card_name)
+            # 카드명의 모든 부분 문자열을 키로 등록 (icontains와 같은 결과를 dict 조회 한 번으로)
+            for start in range(len(name)):
+                for end in range(start + 1, len(name) + 1):
+                    self.by_name.setdefault(name[start:end], user_card)
+            last4 = _last4(user_card.card_number)
+            if last4:
+                self.by_last4.setdefault(last4, user_card)
+        self.default = user_cards[0] if len(user_cards) == 1 else None
+        self._memo = {}
+
+    def match(self, value):
+        """
+        resUsedCard/resCardName 값에 해당하는 UserCard
+
+        Args:
+            value (str): 카드명 또는 카드번호 뒷자리
+
+        Returns:
+            UserCard: 매칭된 카드 (없으면 None)
+        """
+        value = (value or '').strip()
+        if value not in self._memo:
+            self._memo[value] = self._lookup(value)
+        return self._memo[value]
+
+    def _lookup(self, value):
+        user_card = None
+        if value:
+            user_card = self.by_name.get(_normalize(value))
+            if user_card is None and value.isdigit():
+                user_card = self.by_last4.get(_last4(value))
+        return user_card or self.default
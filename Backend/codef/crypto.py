@@ -0,0 +1,85 @@
+"""
+Codef 요청 필드 RSA 암호화
+
+Codef는 비밀번호/주민번호/휴대폰번호/카드번호 등을 공개키(RSA, PKCS#1 v1.5)로 암호화해 보내야 합니다.
+공개키 Base64 디코드와 DER 파싱은 프로세스당 한 번만 하고(get_cipher), 만들어 둔 cipher를 재사용합니다.
+PKCS1_v1_5 cipher는 암호화 시 내부 상태를 바꾸지 않으므로 스레드/코루틴 간에 공유해도 안전합니다.
+
+seal/unseal은 동기화 작업(sync_jobs) params처럼 서버가 잠시 보관했다가 다시 써야 하는 값을
+SECRET_KEY에서 파생한 키로 AES-GCM 암호화합니다. (DB 유출 시 평문 노출 방지)
+"""
+import base64
+import hashlib
+import hmac
+import logging
+from functools import lru_cache
+from typing import Dict
+
+from Crypto.Cipher import AES, PKCS1_v1_5 as PKCS1
+from Crypto.PublicKey import RSA
+from Crypto.Random import get_random_bytes
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FieldCipher:
+    """파싱된 공개키로 필드를 암호화 (암호문은 Base64 문자열)"""
+
+    def __init__(self, public_key: str):
+        # ⭐ Codef 공식 방식: Base64 디코드(DER) → RSA 공개키
+        self.key = RSA.importKey(base64.b64decode(public_key))
+        self.cipher = PKCS1.new(self.key)
+        logger.debug(f"Codef RSA public key loaded ({self.key.size_in_bits()} bits)")
+
+    def encrypt(self, data: str) -> str:
+        """문자열 하나 암호화"""
+        return base64.b64encode(self.cipher.encrypt(data.encode())).decode('utf-8')
+
+    def encrypt_fields(self, fields: Dict[str, str]) -> Dict[str, str]:
+        """
+        여러 필드를 한 번에 암호화 (빈 값은 그대로 유지)
+
+        Args:
+            fields (Dict[str, str]): {필드명: 평문}
+
+        Returns:
+            Dict[str, str]: {필드명: 암호문}
+        """
+        encrypted = {name: self.encrypt(value) if value else value for name, value in fields.items()}
+        logger.debug(f"Encrypted Codef fields: {[name for name, value in fields.items() if value]}")
+        return encrypted
+
+
+@lru_cache(maxsize=4)
+def get_cipher(public_key: str) -> FieldCipher:
+    """공개키별 FieldCipher (프로세스당 한 번 생성, 잘못된 키면 ValueError)"""
+    return FieldCipher(public_key)
+
+
+def _secret_key(purpose: str) -> bytes:
+    # [설명] 용도별로 다른 키 (SECRET_KEY 자체를 암호화/서명에 같이 쓰지 않음)
+    return hashlib.sha256(f"{purpose}:{settings.SECRET_KEY}".encode()).digest()
+
+
+def seal(value: str) -> str:
+    """서버 보관용 AES-GCM 암호화 (Base64: nonce 12 + tag 16 + 암호문, 빈 값은 그대로)"""
+    if not value:
+        return value
+    cipher = AES.new(_secret_key('codef-seal'), AES.MODE_GCM, nonce=get_random_bytes(12))
+    ciphertext, tag = cipher.encrypt_and_digest(value.encode())
+    return base64.b64encode(cipher.nonce + tag + ciphertext).decode('utf-8')
+
+
+def unseal(token: str) -> str:
+    """seal의 역변환 (변조되었거나 SECRET_KEY가 바뀌었으면 ValueError)"""
+    if not token:
+        return token
+    raw = base64.b64decode(token)
+    cipher = AES.new(_secret_key('codef-seal'), AES.MODE_GCM, nonce=raw[:12])
+    return cipher.decrypt_and_verify(raw[28:], raw[12:28]).decode()
+
+
+def digest(value: str) -> str:
+    """비밀값 비교용 HMAC-SHA256 (원문 없이 같은 값인지만 확인)"""
+    return hmac.new(_secret_key('codef-digest'), value.encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,224 @@
+"""
+Codef 동기화 백그라운드 작업 큐 (DB 테이블 sync_jobs, 외부 브로커 없음)
+
+청구/승인 내역 동기화는 Codef 응답 대기와 저장 때문에 수 초~수십 초가 걸리므로,
+API는 SyncJob 행만 만들어 작업 ID를 바로 반환하고(enqueue), run_sync_worker 커맨드가 처리합니다.
+클라이언트는 작업 ID로 상태를 조회합니다. (GET /codef/sync-jobs/<job_id>/)
+
+- 워커는 SELECT ... FOR UPDATE SKIP LOCKED로 대기 작업을 가져가므로 여러 워커가 같은 작업을 중복 실행하지 않습니다.
+- 같은 사용자의 작업은 한 번에 하나만 실행합니다. (같은 카드사 동시 조회/같은 Expense upsert 충돌 방지)
+  실행 중인 작업은 running_user(유니크)에 user_id를 두므로, 여러 워커가 동시에 가져가도 DB가 하나만 허용합니다.
+- 실패하면 max_attempts까지 RETRY_BACKOFF * 2^(시도-1)초 뒤 다시 실행하고,
+  워커가 죽어 LEASE_TIMEOUT 넘게 RUNNING으로 남은 작업은 대기열로 되돌립니다. (실행 횟수에 포함)
+- 카드 정보는 평문으로 저장하지 않습니다. 카드 비밀번호는 Codef 공개키로 암호화한 값(Codef가 받는 형태)만,
+  카드번호/생년월일은 서버 키로 봉인(crypto.seal)한 값만 params에 두고, 작업이 끝나면(완료/최종 실패) 모두 지웁니다.
+"""
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from prometheus_client import Counter, Histogram
+
+from expense.models import SyncJob
+from . import crypto
+from .service import CodefAPIService
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('billing', 'approval')
+ACTIVE_STATUSES = ('PENDING', 'RUNNING')
+MAX_ACTIVE_JOBS_PER_USER = 5  # [설명] 사용자당 대기/실행 중 작업 수 상한 (초과 시 enqueue 거절)
+RETRY_BACKOFF = 30  # [설명] 첫 재시도 대기 시간 (초). 이후 두 배씩 증가
+LEASE_TIMEOUT = timedelta(minutes=10)  # [설명] 이 시간 넘게 RUNNING이면 워커가 죽은 것으로 보고 되돌림
+CLAIM_SCAN_FACTOR = 4  # [설명] 같은 사용자 작업을 건너뛸 수 있도록 가져올 수보다 넉넉히 조회
+SEALED_PARAMS = ('card_no', 'birth_date')  # [설명] 실행 시 복호화해 Codef에 보내는 값 (crypto.seal)
+SECRET_PARAMS = SEALED_PARAMS + ('encrypted_card_password',)  # [설명] 작업 종료 시 params에서 삭제
+
+codef_sync_jobs = Counter(
+    'codef_sync_jobs_total',
+    'Codef 동기화 작업 실행 결과',
+    ['kind', 'outcome'],  # outcome: succeeded | retry | failed
+)
+codef_sync_job_seconds = Histogram(
+    'codef_sync_job_seconds',
+    'Codef 동기화 작업 실행 시간',
+    ['kind'],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+class SyncJobError(Exception):
+    """Codef 조회 실패 (재시도 대상)"""
+
+
+def _protect(params):
+    """평문 파라미터 → 저장용 파라미터 (카드 비밀번호는 Codef RSA 암호문, 카드번호/생년월일은 봉인)"""
+    stored = {key: value for key, value in params.items() if key != 'card_password' and key not in SEALED_PARAMS}
+    if params.get('card_password'):
+        stored['encrypted_card_password'] = CodefAPIService().encrypt_card_password(params['card_password'])
+    for name in SEALED_PARAMS:
+        if params.get(name):
+            stored[name] = crypto.seal(params[name])
+    return stored
+
+
+def enqueue(user, kind, params):
+    """
+    동기화 작업 등록 (같은 조건의 작업이 이미 대기 중이면 그 작업을 반환)
+
+    Args:
+        user: 요청한 사용자
+        kind (str): 'billing' | 'approval'
+        params (Dict): Codef 조회 파라미터 평문 (organization, connected_id, card_password, ...)
+
+    Returns:
+        Tuple[SyncJob, bool]: (작업, 새로 만들었는지 여부). 대기/실행 중 작업이 상한을 넘으면 (None, False)
+
+    Raises:
+        ValueError: Codef 공개키가 없어 카드 비밀번호를 암호화할 수 없음
+    """
+    # 암호문은 매번 달라지므로 같은 조건인지는 평문의 HMAC으로 비교
+    params_digest = crypto.digest(json.dumps(params, sort_keys=True))
+    active = SyncJob.objects.filter(user=user, status__in=ACTIVE_STATUSES)
+    job = active.filter(kind=kind, status='PENDING', params_digest=params_digest).first()
+    if job is not None:
+        return job, False
+    if active.count() >= MAX_ACTIVE_JOBS_PER_USER:
+        return None, False
+    return SyncJob.objects.create(user=user, kind=kind, params=_protect(params), params_digest=params_digest), True
+
+
+def claim(worker_id, limit):
+    """
+    실행할 작업을 최대 limit개 가져와 RUNNING으로 표시
+
+    잠긴 행(다른 워커가 가져가는 중)은 건너뛰고, 이미 실행 중인 작업이 있는 사용자의 작업은 가져가지 않습니다.
+    실행 중 사용자 제외 조건은 잠그지 않는 조회라서 동시에 가져가는 워커끼리는 겹칠 수 있으므로,
+    작업마다 running_user를 채우는 UPDATE를 따로 실행해 유니크 제약 위반(다른 워커가 먼저 가져감)이면 건너뜁니다.
+
+    Returns:
+        List[SyncJob]: 가져온 작업 (user select_related)
+    """
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        busy_users = SyncJob.objects.filter(status='RUNNING').values('user_id')
+        candidates = (
+            SyncJob.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', run_after__lte=now)
+            .exclude(user_id__in=busy_users)
+            .order_by('run_after', 'job_id')
+            .values_list('job_id', 'user_id')[:limit * CLAIM_SCAN_FACTOR]
+        )
+        job_ids, users = [], set()
+        for job_id, user_id in candidates:
+            if user_id in users:
+                continue
+            users.add(user_id)
+            try:
+                with transaction.atomic():
+                    SyncJob.objects.filter(job_id=job_id).update(
+                        status='RUNNING', running_user=user_id, locked_by=worker_id, locked_at=now,
+                        attempts=F('attempts') + 1,
+                    )
+            except IntegrityError:
+                # 같은 사용자의 다른 작업을 다른 워커가 방금 실행 시작함
+                continue
+            job_ids.append(job_id)
+            if len(job_ids) == limit:
+                break
+        if not job_ids:
+            return []
+    return list(SyncJob.objects.filter(job_id__in=job_ids).select_related('user').order_by('job_id'))
+
+
+def requeue_stale():
+    """LEASE_TIMEOUT 넘게 RUNNING인 작업을 대기열로 되돌림 (실행 횟수를 다 쓴 작업은 실패 처리)"""
+    stale = list(SyncJob.objects.filter(status='RUNNING', locked_at__lt=timezone.now() - LEASE_TIMEOUT))
+    for job in stale:
+        logger.warning(f"Sync job {job.job_id} lease expired (worker {job.locked_by})")
+        _retry_or_fail(job, "작업 시간이 초과되었습니다. (워커 중단)")
+    return len(stale)
+
+
+def run(job):
+    """가져온 작업 하나를 실행하고 결과를 기록 (예외를 밖으로 던지지 않음)"""
+    started = time.perf_counter()
+    try:
+        result = _execute(job)
+    except Exception as e:
+        logger.warning(f"Sync job {job.job_id} attempt {job.attempts}/{job.max_attempts} failed: {e}")
+        outcome = _retry_or_fail(job, str(e))
+    else:
+        _finish(job, status='SUCCEEDED', result=result, error_message=None)
+        outcome = 'succeeded'
+        logger.info(f"Sync job {job.job_id} succeeded: {result}")
+    codef_sync_jobs.labels(job.kind, outcome).inc()
+    codef_sync_job_seconds.labels(job.kind).observe(time.perf_counter() - started)
+    return outcome
+
+
+def _execute(job):
+    # views가 jobs를 import하므로 실행 시점에 import (순환 import 방지)
+    from .views import _save_approval_list, _save_billing_list
+
+    params = job.params
+    card_no, birth_date = (crypto.unseal(params.get(name, '')) for name in SEALED_PARAMS)
+    service = CodefAPIService()
+    if job.kind == 'billing':
+        result = service.get_billing_list(
+            organization=params['organization'],
+            connected_id=params['connected_id'],
+            birth_date=birth_date,
+            card_no=card_no,
+            inquiry_type=params.get('inquiry_type', '0'),
+            encrypted_card_password=params.get('encrypted_card_password', ''),
+        )
+        if not result['success']:
+            raise SyncJobError(result.get('error_message'))
+        return {"saved_count": _save_billing_list(job.user, result.get('data', {}))}
+
+    result = service.get_approval_list(
+        params['organization'], params['connected_id'], params['start_date'], params['end_date'],
+        card_no=card_no,
+        birth_date=birth_date,
+        inquiry_type=params.get('inquiry_type', '0'),
+        encrypted_card_password=params.get('encrypted_card_password', ''),
+    )
+    if not result['success']:
+        raise SyncJobError(result.get('error_message'))
+    return {"saved_count": _save_approval_list(job.user, result.get('data', []))}
+
+
+def _retry_or_fail(job, error_message):
+    if job.attempts >= job.max_attempts:
+        _finish(job, status='FAILED', error_message=error_message)
+        return 'failed'
+    delay = RETRY_BACKOFF * 2 ** max(job.attempts - 1, 0)
+    _release(job, status='PENDING', error_message=error_message, run_after=timezone.now() + timedelta(seconds=delay))
+    return 'retry'
+
+
+def _finish(job, **fields):
+    # [설명] 종료된 작업(완료/최종 실패)은 카드 정보를 암호문으로도 남기지 않음
+    params = {key: value for key, value in job.params.items() if key not in SECRET_PARAMS}
+    _release(job, params=params, finished_at=timezone.now(), **fields)
+
+
+def _release(job, **fields):
+    """
+    작업 상태 갱신 (이 워커가 가져간 그대로일 때만)
+
+    시간 초과로 되돌려진 뒤 다른 워커가 다시 가져간 작업은 덮어쓰지 않습니다.
+    """
+    updated = SyncJob.objects.filter(
+        job_id=job.job_id, status='RUNNING', locked_by=job.locked_by, locked_at=job.locked_at,
+    ).update(running_user=None, locked_by=None, locked_at=None, updated_at=timezone.now(), **fields)
+    if not updated:
+        logger.warning(f"Sync job {job.job_id} was taken over by another worker; result discarded")
+    return updated
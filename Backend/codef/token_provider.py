@@ -0,0 +1,187 @@
+"""
+Codef OAuth 액세스 토큰 공유 캐시
+
+Codef 토큰은 client_credentials로 발급되어 사용자와 무관하고 유효 기간(expires_in, 약 7일)이 길기 때문에,
+요청마다 oauth.codef.io를 호출하지 않고 Django 캐시에 만료 시각과 함께 저장해 모든 요청이 함께 사용합니다.
+
+- 만료 TOKEN_REFRESH_MARGIN 전부터는 락(cache.add)을 잡은 한 요청만 새로 발급하고,
+  나머지 요청은 아직 유효한 기존 토큰을 그대로 사용합니다.
+- 캐시에 토큰이 아예 없으면 락을 잡지 못한 요청은 발급이 끝나기를 잠시 기다린 뒤 캐시된 토큰을 사용합니다.
+- Codef API가 401을 반환하면 invalidate()로 지운 뒤 한 번만 다시 발급합니다. (CodefAPIService._post)
+- async 뷰용 aget_token/ainvalidate는 같은 캐시 항목과 락을 사용합니다.
+
+토큰과 락은 공유 캐시(settings.CACHES['shared'])에 두므로 웹 프로세스와 동기화 워커가
+하나의 토큰을 함께 사용하고, 재발급도 전체에서 한 번만 일어납니다.
+"""
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+from . import transport
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://oauth.codef.io/oauth/token"
+DEFAULT_EXPIRES_IN = 60 * 60  # [설명] 응답에 expires_in이 없을 때 사용할 유효 기간 (초)
+TOKEN_REFRESH_MARGIN = 60 * 10  # [설명] 만료 이 시간(초) 전부터 미리 재발급
+REFRESH_LOCK_TIMEOUT = 30  # [설명] 재발급 락 유지 시간 (초). 발급 요청 타임아웃(transport 'token')보다 길게
+REFRESH_WAIT_TIMEOUT = 5  # [설명] 다른 요청이 발급 중일 때 기다리는 최대 시간 (초)
+REFRESH_WAIT_INTERVAL = 0.1
+
+# [설명] 모든 프로세스(웹/동기화 워커)가 함께 보는 캐시
+cache = ConnectionProxy(caches, 'shared')
+
+
+def _cache_key(client_id):
+    # [설명] 자격 증명이 바뀌면 다른 키를 쓰도록 client_id 해시를 포함
+    digest = hashlib.sha256((client_id or '').encode('utf-8')).hexdigest()[:16]
+    return f"codef:access_token:{digest}"
+
+
+def _token_request(client_id, client_secret):
+    """토큰 발급 요청 (data, headers)"""
+    auth_encoded = base64.b64encode(f"{client_id}:{client_secret}".encode('utf-8')).decode('utf-8')
+    headers = {"Authorization": f"Basic {auth_encoded}", "Content-Type": "application/x-www-form-urlencoded"}
+    params = {"grant_type": "client_credentials", "scope": "read"}
+    return params, headers
+
+
+def _token_entry(response):
+    """
+    발급 응답 → 캐시 항목
+
+    Returns:
+        Tuple[Dict, int]: ({"token", "expires_at"}, 유효 기간(초))
+    """
+    response.raise_for_status()
+    body = response.json()
+    access_token = body.get('access_token')
+    if not access_token:
+        raise ValueError("access_token이 없는 응답입니다.")
+    expires_in = int(body.get('expires_in') or DEFAULT_EXPIRES_IN)
+    logger.info(f"Codef access token issued (expires_in={expires_in}s)")
+    return {"token": access_token, "expires_at": time.time() + expires_in}, expires_in
+
+
+def _refresh(key, client_id, client_secret):
+    """새 토큰을 발급해 캐시에 저장"""
+    params, headers = _token_request(client_id, client_secret)
+    entry, expires_in = _token_entry(transport.post(TOKEN_URL, 'token', data=params, headers=headers))
+    cache.set(key, entry, timeout=expires_in)
+    return entry["token"]
+
+
+async def _arefresh(key, client_id, client_secret):
+    params, headers = _token_request(client_id, client_secret)
+    entry, expires_in = _token_entry(await transport.apost(TOKEN_URL, 'token', data=params, headers=headers))
+    await cache.aset(key, entry, timeout=expires_in)
+    return entry["token"]
+
+
+def _wait_for_token(key):
+    """다른 요청이 발급 중인 토큰을 기다림 (시간 초과 시 None)"""
+    deadline = time.monotonic() + REFRESH_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(REFRESH_WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry:
+            return entry["token"]
+    return None
+
+
+async def _await_token(key):
+    deadline = time.monotonic() + REFRESH_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(REFRESH_WAIT_INTERVAL)
+        entry = await cache.aget(key)
+        if entry:
+            return entry["token"]
+    return None
+
+
+def get_token(client_id, client_secret):
+    """
+    캐시된 Codef 액세스 토큰 (없거나 곧 만료되면 발급)
+
+    Args:
+        client_id (str): Codef 클라이언트 ID
+        client_secret (str): Codef 클라이언트 시크릿
+
+    Returns:
+        str: 액세스 토큰
+
+    Raises:
+        requests.RequestException, ValueError: 발급 실패 (유효한 캐시 토큰도 없는 경우)
+    """
+    key = _cache_key(client_id)
+    entry = cache.get(key)
+    if entry and entry["expires_at"] - time.time() > TOKEN_REFRESH_MARGIN:
+        return entry["token"]
+
+    lock_key = f"{key}:refresh"
+    if not cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+        # 다른 요청이 발급 중: 기존 토큰이 아직 유효하면 그대로 사용
+        if entry:
+            return entry["token"]
+        return _wait_for_token(key) or _refresh(key, client_id, client_secret)
+
+    try:
+        return _refresh(key, client_id, client_secret)
+    except Exception as e:
+        if entry:
+            # 미리 재발급하다 실패한 경우 만료 전까지는 기존 토큰 사용
+            logger.warning(f"Codef access token refresh failed, using cached token: {e}")
+            return entry["token"]
+        raise
+    finally:
+        cache.delete(lock_key)
+
+
+async def aget_token(client_id, client_secret):
+    """get_token의 async 버전 (발급 요청/대기 중 이벤트 루프를 막지 않음)"""
+    key = _cache_key(client_id)
+    entry = await cache.aget(key)
+    if entry and entry["expires_at"] - time.time() > TOKEN_REFRESH_MARGIN:
+        return entry["token"]
+
+    lock_key = f"{key}:refresh"
+    if not await cache.aadd(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+        if entry:
+            return entry["token"]
+        return await _await_token(key) or await _arefresh(key, client_id, client_secret)
+
+    try:
+        return await _arefresh(key, client_id, client_secret)
+    except Exception as e:
+        if entry:
+            logger.warning(f"Codef access token refresh failed, using cached token: {e}")
+            return entry["token"]
+        raise
+    finally:
+        await cache.adelete(lock_key)
+
+
+def invalidate(client_id, access_token=None):
+    """
+    캐시된 토큰 삭제
+
+    access_token을 주면 캐시된 토큰이 그 값일 때만 지웁니다.
+    (다른 요청이 이미 재발급한 토큰을 지우지 않도록)
+    """
+    key = _cache_key(client_id)
+    entry = cache.get(key)
+    if entry and (access_token is None or entry["token"] == access_token):
+        cache.delete(key)
+
+
+async def ainvalidate(client_id, access_token=None):
+    """invalidate의 async 버전"""
+    key = _cache_key(client_id)
+    entry = await cache.aget(key)
+    if entry and (access_token is None or entry["token"] == access_token):
+        await cache.adelete(key)
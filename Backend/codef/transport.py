@@ -0,0 +1,204 @@
+"""
+Codef HTTP 전송 계층 (프로세스 공유 연결 풀)
+
+requests.post를 직접 호출하면 요청마다 새 세션이 만들어져 TCP/TLS 연결을 매번 새로 맺습니다.
+이 모듈은 프로세스에 하나인 requests.Session을 공유해 호스트별 연결 풀(keep-alive)을 재사용하므로,
+한 번의 동기화에서 card-list/billing-list/approval-list를 차례로 호출해도 핸드셰이크는 한 번입니다.
+
+- 세션/연결 풀은 스레드 안전하며, 호스트마다 최대 CODEF_HTTP_POOL_MAXSIZE개의 연결을 유지합니다.
+- 타임아웃은 엔드포인트별 (연결, 읽기) 초로 지정하고 settings.CODEF_HTTP_TIMEOUTS로 덮어쓸 수 있습니다.
+- 연결을 꺼낼 때 새 연결인지 재사용인지를 codef_http_connections_total 메트릭으로 기록합니다.
+
+async 뷰(AsyncCodefAPIService)는 같은 타임아웃/요청 메트릭으로 httpx.AsyncClient를 사용합니다.
+AsyncClient는 이벤트 루프에 묶이므로 루프마다 하나씩 만들어 공유합니다. (uvicorn 워커는 루프 하나)
+"""
+import asyncio
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from django.conf import settings
+from prometheus_client import Counter, Histogram
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+CONNECT_TIMEOUT = 3.05  # [설명] TCP 연결 타임아웃 (초). TCP 재전송 간격(3초)보다 조금 길게
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, 30)
+# 엔드포인트별 (연결, 읽기) 타임아웃 (초). 계정 등록은 카드사 인증을 거치므로 응답이 느림
+ENDPOINT_TIMEOUTS = {
+    'token': (CONNECT_TIMEOUT, 10),
+    'account-create': (CONNECT_TIMEOUT, 60),
+    'card-list': (CONNECT_TIMEOUT, 30),
+    'billing-list': (CONNECT_TIMEOUT, 30),
+    'approval-list': (CONNECT_TIMEOUT, 30),
+}
+POOL_CONNECTIONS = 4  # [설명] 연결 풀을 유지할 호스트 수 (oauth.codef.io, development/api.codef.io)
+DEFAULT_POOL_MAXSIZE = 10  # [설명] 호스트별 유지 연결 수 (워커 스레드 수 이상 권장)
+DEFAULT_ASYNC_MAX_CONNECTIONS = 200  # [설명] async 클라이언트 동시 연결 수 (워커 하나가 동시에 기다릴 수 있는 Codef 요청 수)
+
+codef_http_connections = Counter(
+    'codef_http_connections_total',
+    'Codef HTTP 요청에 사용한 연결 (새 연결/재사용)',
+    ['host', 'state'],  # state: created | reused
+)
+codef_http_requests = Counter(
+    'codef_http_requests_total',
+    'Codef HTTP 요청 수',
+    ['endpoint', 'status'],  # status: HTTP 상태 코드 | error
+)
+codef_http_request_seconds = Histogram(
+    'codef_http_request_seconds',
+    'Codef HTTP 요청 처리 시간',
+    ['endpoint'],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+
+class _CountingPoolMixin:
+    """연결을 꺼낼 때 이미 연결된 소켓인지(재사용) 새로 연결할 것인지 기록"""
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        # [설명] 풀에서 꺼낸 연결의 소켓이 없으면 이번 요청에서 TCP/TLS 연결을 새로 맺음
+        state = 'reused' if getattr(conn, 'sock', None) is not None else 'created'
+        codef_http_connections.labels(self.host, state).inc()
+        return conn
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = _PooledAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=getattr(settings, 'CODEF_HTTP_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+        max_retries=0,  # [설명] Codef 조회는 재시도 여부를 호출부에서 판단 (401 토큰 재발급 등)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """프로세스 공유 세션 (처음 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session():
+    """공유 세션과 연결 풀 정리 (다음 요청 시 다시 생성)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+_async_clients = weakref.WeakKeyDictionary()  # [설명] 이벤트 루프 → AsyncClient
+
+
+def get_async_client():
+    """현재 이벤트 루프의 공유 AsyncClient (처음 호출 시 생성)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        max_connections = getattr(settings, 'CODEF_HTTP_ASYNC_MAX_CONNECTIONS', DEFAULT_ASYNC_MAX_CONNECTIONS)
+        client = _async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+    return client
+
+
+def timeout_for(endpoint):
+    """엔드포인트의 (연결, 읽기) 타임아웃 (settings.CODEF_HTTP_TIMEOUTS 우선)"""
+    overrides = getattr(settings, 'CODEF_HTTP_TIMEOUTS', None) or {}
+    return tuple(overrides.get(endpoint) or ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT))
+
+
+def post(url, endpoint, **kwargs):
+    """
+    공유 연결 풀로 POST 요청
+
+    Args:
+        url (str): 요청 URL
+        endpoint (str): 타임아웃/메트릭 구분용 엔드포인트 이름 (ENDPOINT_TIMEOUTS 키)
+        **kwargs: requests에 그대로 전달 (json, data, headers 등)
+
+    Returns:
+        requests.Response
+    """
+    started = time.perf_counter()
+    try:
+        response = get_session().post(url, timeout=timeout_for(endpoint), **kwargs)
+    except requests.RequestException:
+        codef_http_requests.labels(endpoint, 'error').inc()
+        raise
+    finally:
+        codef_http_request_seconds.labels(endpoint).observe(time.perf_counter() - started)
+    codef_http_requests.labels(endpoint, str(response.status_code)).inc()
+    return response
+
+
+async def apost(url, endpoint, **kwargs):
+    """
+    공유 AsyncClient로 POST 요청 (post의 async 버전)
+
+    Returns:
+        httpx.Response
+    """
+    connect, read = timeout_for(endpoint)
+    started = time.perf_counter()
+    try:
+        response = await get_async_client().post(url, timeout=httpx.Timeout(read, connect=connect), **kwargs)
+    except httpx.HTTPError:
+        codef_http_requests.labels(endpoint, 'error').inc()
+        raise
+    finally:
+        codef_http_request_seconds.labels(endpoint).observe(time.perf_counter() - started)
+    codef_http_requests.labels(endpoint, str(response.status_code)).inc()
+    return response
+
+
+def pool_stats():
+    """
+    호스트별 연결 풀 현황
+
+    Returns:
+        Dict[str, Dict]: {host: {"connections": 새로 만든 연결 수, "requests": 보낸 요청 수, "idle": 대기 중인 연결 수}}
+    """
+    session = _session
+    if session is None:
+        return {}
+    stats = {}
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for pool in filter(None, (pools.get(key) for key in pools.keys())):
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            host = f"{pool.host}:{pool.port}"
+            stats[host] = {"connections": pool.num_connections, "requests": pool.num_requests, "idle": idle}
+    return stats
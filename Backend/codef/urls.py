@@ -9,4 +9,6 @@ urlpatterns = [
     path('card/list/', views.GetCardListView.as_view(), name='get_card_list'),
     path('card/billing/', views.GetBillingListView.as_view(), name='get_billing_list'),
     path('card/approval/', views.GetApprovalListView.as_view(), name='get_approval_list'),
+    path('sync-jobs/', views.SyncJobCreateView.as_view(), name='create_sync_job'),
+    path('sync-jobs/<int:job_id>/', views.SyncJobDetailView.as_view(), name='get_sync_job'),
 ]
@@ -1,4 +1,6 @@
+import inspect
 import logging
+from asgiref.sync import sync_to_async
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.decorators import permission_classes, authentication_classes
@@ -7,10 +9,16 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.openapi import OpenApiExample
 from .service import CodefAPIService
+from .async_service import AsyncCodefAPIService
+from .card_matcher import UserCardMatcher
+from . import jobs
 from cards.models import Card
 from users.models import UserCard
-from expense.models import Expense
+from expense.models import Expense, SyncJob
+from expense.serializers import SyncJobSerializer
+from expense import rollup, ingest, subscription_detector, anomaly_detector
 from category.models import Category
+from category.classifier import CategoryResolver
 import datetime
 
 logger = logging.getLogger(__name__)
@@ -24,6 +32,14 @@ ORG_MAP = {
     '0320': '수협카드', '0321': '제주카드'
 }
 
+# 승인번호가 같은 기존 거래를 upsert할 때 갱신하는 필드 (category는 사용자 수정값 유지를 위해 제외)
+BILLING_UPDATE_FIELDS = [
+    'user_card', 'status', 'benefit_received', 'payment_type', 'installment_month', 'round_no',
+    'payment_principal', 'fee', 'payment_amt', 'after_payment_balance', 'earn_point',
+    'spent_at', 'amount', 'merchant_name', 'updated_at',
+]
+APPROVAL_UPDATE_FIELDS = ['user_card', 'status', 'spent_at', 'amount', 'merchant_name', 'updated_at']
+
 
 def extract_bearer_token(request):
     """
@@ -47,6 +63,275 @@ def extract_bearer_token(request):
     return None
 
 
+def _stored_card_number(user, organization):
+    """카드사의 보유 카드 중 마스킹되지 않은 카드 번호 (없으면 빈 문자열)"""
+    company_name = ORG_MAP.get(organization, organization)
+    user_card = UserCard.objects.filter(
+        user=user, card__company=company_name
+    ).exclude(card_number='').exclude(card_number__contains='*').first()
+    return user_card.card_number if user_card and user_card.card_number else ''
+
+
+def _save_card_list(user, organization, card_no, card_data):
+    """조회한 카드 목록을 Card/UserCard에 저장 (동기 함수, async 뷰에서는 sync_to_async로 호출)"""
+    if isinstance(card_data, dict):
+        card_data = [card_data]
+    elif not isinstance(card_data, list):
+        card_data = []
+
+    company_name = ORG_MAP.get(organization, organization)
+
+    for item in card_data:
+        res_card_name = item.get('resCardName')
+        res_image_link = item.get('resImageLink')
+        res_card_no = item.get('resCardNo')
+
+        if res_card_name:
+            # 1. Card 모델 (전체 카드 카탈로그) 업데이트/생성
+            card, created = Card.objects.update_or_create(
+                card_name=res_card_name,
+                company=company_name,
+                defaults={
+                    'card_image_url': res_image_link
+                }
+            )
+
+            # 2. UserCard 모델 (사용자 소유 카드) 업데이트/생성
+            # 프론트에서 card_no를 보냈으면 전체 번호 저장, 아니면 마스킹된 번호 저장
+            card_number_to_save = card_no if card_no else res_card_no
+            if user.is_authenticated:
+                UserCard.objects.update_or_create(
+                    user=user,
+                    card=card,
+                    defaults={
+                        'card_number': card_number_to_save
+                    }
+                )
+
+
+def _save_billing_list(user, api_data):
+    """
+    청구 내역을 Expense로 저장하고 구독/이상 지출 후처리 (동기 함수)
+
+    Returns:
+        int: 저장 대상 거래 수
+    """
+    # api_data가 dict일 수도, list일 수도 있음. 문서는 dict (단건) 또는 list.
+    # 하지만 청구 내역'목록'은 보통 UserAccount 당 하나씩 오고, 그 안에 'resChargeHistoryList'가 있음.
+    # 지금 예시는 단일 객체 안에 'resChargeHistoryList'가 있는 형태.
+
+    billing_items = []
+    if isinstance(api_data, dict):
+        billing_items = [api_data]
+    elif isinstance(api_data, list):
+        billing_items = api_data
+
+    saved_count = 0
+    expenses = []
+
+    # 기본 카테고리 (없으면 생성)
+    default_category, _ = Category.objects.get_or_create(category_name="기타")
+    # 가맹점명 → 카테고리 분류기 (카테고리 목록은 한 번만 조회)
+    category_resolver = CategoryResolver(default_category)
+    # 거래 카드명 → 보유 카드 매칭 (보유 카드는 한 번만 조회)
+    card_matcher = UserCardMatcher(user)
+
+    # Expense 저장 중 발생하는 일별 롤업 갱신은 루프 종료 후 일괄 처리
+    with rollup.deferred():
+        for bill in billing_items:
+            history_list = bill.get('resChargeHistoryList', [])
+            if not history_list or not isinstance(history_list, list):
+                continue
+
+            for history in history_list:
+                res_used_date = history.get('resUsedDate')
+                if not res_used_date: continue
+
+                # 날짜 파싱 (YYYYMMDD -> Date)
+                try:
+                    spent_at = datetime.datetime.strptime(res_used_date, "%Y%m%d")
+                    # Timezone aware로 변환 (settings.USE_TZ=True 가정)
+                    spent_at = spent_at.replace(tzinfo=datetime.timezone.utc)
+                except ValueError:
+                    continue
+
+                res_used_card = history.get('resUsedCard', '') # 카드명 or 번호뒷자리
+
+                # UserCard 찾기 (카드명 → 번호 뒷자리 → 보유 카드가 1개면 그 카드)
+                user_card = card_matcher.match(res_used_card)
+                if not user_card:
+                    # 매칭 실패 시 스킵
+                    logger.warning(f"Billing List: Card '{res_used_card}' not found for user {user.email}. Skipping.")
+                    continue
+
+                # 금액 파싱 (콤마 제거)
+                def parse_amount(val):
+                    if isinstance(val, int): return val
+                    if isinstance(val, str):
+                        val = val.replace(',', '').strip()
+                        return int(val) if val else 0
+                    return 0
+
+                amount = parse_amount(history.get('resUsedAmount'))
+
+                # Expense 생성/업데이트
+                # 청구 내역에는 승인번호가 없을 수 있으므로 (날짜 + 가맹점명 + 금액) 조합으로 식별
+                # resApprovalNo가 있는지 확인
+                res_approval_no = history.get('resApprovalNo', '')
+
+                # 승인번호가 있으면 (사용자, 승인번호) 기준 upsert, 없으면 (날짜 + 가맹점명 + 금액) 조합으로 중복 제외
+                expenses.append(Expense(
+                    user=user,
+                    category=category_resolver.resolve(history.get('resMemberStoreName')),
+                    user_card=user_card,
+                    status='PAID',
+                    benefit_received=0,
+                    # 추가 필드
+                    payment_type=history.get('resPaymentType'),
+                    installment_month=parse_amount(history.get('resInstallmentMonth')),
+                    round_no=history.get('resRoundNo'),
+                    payment_principal=parse_amount(history.get('resPaymentPrincipal')),
+                    fee=parse_amount(history.get('resFee')),
+                    payment_amt=parse_amount(history.get('resPaymentAmt')),
+                    after_payment_balance=parse_amount(history.get('resAfterPaymentBalance')),
+                    earn_point=parse_amount(history.get('resEarnPoint')),
+                    approval_number=history.get('resApprovalNo') or None,
+                    spent_at=spent_at,
+                    amount=amount,
+                    merchant_name=history.get('resMemberStoreName', 'Unknown'),
+                ))
+
+        # 묶음 단위 bulk upsert (카테고리는 사용자가 바꿨을 수 있으므로 갱신하지 않음)
+        ingest.upsert_expenses(user.pk, expenses, BILLING_UPDATE_FIELDS)
+        saved_count = len(expenses)
+
+    # 새로 저장된 지출 내역으로 구독 자동 감지 / 카테고리별 이상 지출 통계 갱신 (마지막 처리 이후 건만)
+    subscription_detector.detect_safely(user.pk)
+    anomaly_detector.update_safely(user.pk)
+    return saved_count
+
+
+def _save_approval_list(user, api_data):
+    """
+    승인 내역을 Expense로 저장하고 구독/이상 지출 후처리 (동기 함수)
+
+    Returns:
+        int: 새로 저장된 거래 수
+    """
+    approval_list = []
+    if isinstance(api_data, dict):
+        approval_list = [api_data]
+    elif isinstance(api_data, list):
+        approval_list = api_data
+
+    default_category, _ = Category.objects.get_or_create(category_name="기타")
+    # 가맹점명 → 카테고리 분류기 (카테고리 목록은 한 번만 조회)
+    category_resolver = CategoryResolver(default_category)
+    # 거래 카드명 → 보유 카드 매칭 (보유 카드는 한 번만 조회)
+    card_matcher = UserCardMatcher(user)
+    saved_count = 0
+    expenses = []
+
+    # CODEF 응답 구조 처리:
+    # 1) 중첩 구조: data = [{"resApprovalList": [...]}]
+    # 2) 플랫 구조: data = [{"resUsedDate": ..., "resApprovalNo": ...}, ...]
+    flat_approvals = []
+    for item in approval_list:
+        if 'resApprovalList' in item:
+            flat_approvals.extend(item['resApprovalList'])
+        elif 'resUsedDate' in item:
+            flat_approvals.append(item)
+
+    # Expense 저장 중 발생하는 일별 롤업 갱신은 루프 종료 후 일괄 처리
+    with rollup.deferred():
+        for approval in flat_approvals:
+            # Parse fields
+            res_used_date = approval.get('resUsedDate')
+            res_used_time = approval.get('resUsedTime', '000000')
+            res_approval_no = approval.get('resApprovalNo')
+
+            if not res_used_date: continue
+
+            merchant_name = approval.get('resMemberStoreName', 'Unknown')
+
+            try:
+                dt_str = res_used_date + res_used_time
+                spent_at = datetime.datetime.strptime(dt_str, "%Y%m%d%H%M%S")
+                spent_at = spent_at.replace(tzinfo=datetime.timezone.utc)
+            except:
+                continue
+
+            def parse_amount(val):
+                if isinstance(val, int): return val
+                if isinstance(val, float): return int(val)
+                if isinstance(val, str):
+                    val = val.replace(',', '').strip()
+                    return int(float(val)) if val else 0
+                return 0
+
+            amount = parse_amount(approval.get('resUsedAmount'))
+
+            # UserCard 찾기
+            res_card_name = approval.get('resCardName', '')
+            user_card = card_matcher.match(res_card_name)
+            if not user_card:
+                logger.warning(f"Skipping transaction {res_approval_no}: No matching card for '{res_card_name}'")
+                continue
+
+            expenses.append(Expense(
+                user=user,
+                category=category_resolver.resolve(merchant_name),
+                user_card=user_card,
+                status='PAID',
+                spent_at=spent_at,
+                amount=amount,
+                merchant_name=merchant_name,
+                approval_number=res_approval_no or None,
+            ))
+
+        # 묶음 단위 bulk upsert (카테고리는 사용자가 바꿨을 수 있으므로 갱신하지 않음)
+        saved_count, _ = ingest.upsert_expenses(user.pk, expenses, APPROVAL_UPDATE_FIELDS)
+
+    # 새로 저장된 지출 내역으로 구독 자동 감지 / 카테고리별 이상 지출 통계 갱신 (마지막 처리 이후 건만)
+    subscription_detector.detect_safely(user.pk)
+    anomaly_detector.update_safely(user.pk)
+    return saved_count
+
+
+class AsyncAPIView(APIView):
+    """
+    async def 핸들러를 await하는 APIView
+
+    DRF APIView.dispatch는 핸들러 코루틴을 기다리지 않으므로 dispatch만 async로 바꿉니다.
+    인증/권한 확인(initial)은 DB를 조회하므로 sync_to_async로 실행하고,
+    핸들러 안의 DB 작업도 sync_to_async로 감싸야 합니다.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
 class GetCodefTokenView(APIView):
     """Codef API 토큰 발급 뷰"""
     
@@ -117,7 +402,7 @@ class GetCodefTokenView(APIView):
             )
 
 
-class CreateConnectedIdView(APIView):
+class CreateConnectedIdView(AsyncAPIView):
     """Connected ID 발급 뷰 (간편인증 지원)"""
 
     permission_classes = [IsAuthenticated]
@@ -155,15 +440,15 @@ class CreateConnectedIdView(APIView):
         },
         tags=["Codef API"]
     )
-    def post(self, request):
+    async def post(self, request):
         try:
             # 1. CODEF 토큰 추출 (없으면 자동 발급)
             access_token = extract_bearer_token(request)
 
             if not access_token:
                 logger.info("No Authorization header provided, auto-fetching Codef token")
-                codef_service = CodefAPIService()
-                access_token = codef_service.get_access_token()
+                codef_service = AsyncCodefAPIService()
+                access_token = await codef_service.get_access_token()
                 if not access_token:
                     return Response(
                         {"success": False, "error_message": "Codef API 토큰 자동 발급에 실패했습니다."},
@@ -235,10 +520,10 @@ class CreateConnectedIdView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # 3. Codef API 호출
-            codef_service = CodefAPIService()
+            # 3. Codef API 호출 (응답을 기다리는 동안 워커를 점유하지 않음)
+            codef_service = AsyncCodefAPIService()
             
-            result = codef_service.create_connected_id(
+            result = await codef_service.create_connected_id(
                 organization=organization,
                 card_id=card_id,
                 password=password,
@@ -285,7 +570,7 @@ class CreateConnectedIdView(APIView):
             )
 
 
-class GetCardListView(APIView):
+class GetCardListView(AsyncAPIView):
     """보유 카드 목록 조회 뷰"""
 
     permission_classes = [IsAuthenticated]
@@ -357,15 +642,14 @@ class GetCardListView(APIView):
         },
         tags=["Codef API"]
     )
-    def post(self, request):
+    async def post(self, request):
         try:
              # 1. CODEF 토큰 추출 (없으면 자동 발급)
             access_token = request.headers.get('X-Codef-Token')
 
             if not access_token:
                 logger.info("No X-Codef-Token header provided, auto-fetching Codef token")
-                codef_service_token = CodefAPIService()
-                access_token = codef_service_token.get_access_token()
+                access_token = await AsyncCodefAPIService().get_access_token()
                 if not access_token:
                     return Response(
                         {"success": False, "error_message": "Codef API 토큰 자동 발급에 실패했습니다."},
@@ -393,10 +677,10 @@ class GetCardListView(APIView):
                 )
 
             # 3. Codef API 호출
-            codef_service = CodefAPIService()
+            codef_service = AsyncCodefAPIService()
             codef_service.access_token = access_token
 
-            result = codef_service.get_card_list(
+            result = await codef_service.get_card_list(
                 organization=organization,
                 connected_id=connected_id,
                 birth_date=birth_date,
@@ -409,40 +693,7 @@ class GetCardListView(APIView):
             if result['success']:
                 try:
                     # 데이터베이스에 카드 정보 저장/업데이트
-                    card_data = result.get('data')
-                    if isinstance(card_data, dict):
-                        card_data = [card_data]
-                    elif not isinstance(card_data, list):
-                        card_data = []
-
-                    company_name = ORG_MAP.get(organization, organization)
-
-                    for item in card_data:
-                        res_card_name = item.get('resCardName')
-                        res_image_link = item.get('resImageLink')
-                        res_card_no = item.get('resCardNo')
-
-                        if res_card_name:
-                            # 1. Card 모델 (전체 카드 카탈로그) 업데이트/생성
-                            card, created = Card.objects.update_or_create(
-                                card_name=res_card_name,
-                                company=company_name,
-                                defaults={
-                                    'card_image_url': res_image_link
-                                }
-                            )
-
-                            # 2. UserCard 모델 (사용자 소유 카드) 업데이트/생성
-                            # 프론트에서 card_no를 보냈으면 전체 번호 저장, 아니면 마스킹된 번호 저장
-                            card_number_to_save = card_no if card_no else res_card_no
-                            if request.user.is_authenticated:
-                                UserCard.objects.update_or_create(
-                                    user=request.user,
-                                    card=card,
-                                    defaults={
-                                        'card_number': card_number_to_save
-                                    }
-                                )
+                    await sync_to_async(_save_card_list)(request.user, organization, card_no, result.get('data'))
                 except Exception as db_e:
                     logger.error(f"Failed to save card data to DB: {str(db_e)}")
 
@@ -473,7 +724,7 @@ class GetCardListView(APIView):
             )
 
 
-class GetBillingListView(APIView):
+class GetBillingListView(AsyncAPIView):
     """보유 카드 청구 내역 조회 및 Expense 저장 뷰"""
 
     permission_classes = [IsAuthenticated]
@@ -508,14 +759,13 @@ class GetBillingListView(APIView):
         responses={200: OpenApiExample('성공', value={"success": True, "saved_count": 5})},
         tags=["Codef API"]
     )
-    def post(self, request):
+    async def post(self, request):
         try:
             # 1. CODEF 토큰 추출 (없으면 자동 발급)
             access_token = request.headers.get('X-Codef-Token')
             if not access_token:
                 logger.info("No X-Codef-Token header provided, auto-fetching Codef token")
-                codef_service_token = CodefAPIService()
-                access_token = codef_service_token.get_access_token()
+                access_token = await AsyncCodefAPIService().get_access_token()
                 if not access_token:
                     return Response(
                         {"success": False, "error_message": "Codef API 토큰 자동 발급에 실패했습니다."},
@@ -531,12 +781,7 @@ class GetBillingListView(APIView):
             card_no = request.data.get('card_no', '').strip()
             # card_no 없으면 UserCard에서 자동 조회
             if not card_no and request.user.is_authenticated:
-                company_name = ORG_MAP.get(organization, organization)
-                user_card = UserCard.objects.filter(
-                    user=request.user, card__company=company_name
-                ).exclude(card_number='').exclude(card_number__contains='*').first()
-                if user_card and user_card.card_number:
-                    card_no = user_card.card_number
+                card_no = await sync_to_async(_stored_card_number)(request.user, organization)
             card_password = request.data.get('card_password', '').strip()
             inquiry_type = request.data.get('inquiry_type', '0').strip()
 
@@ -550,10 +795,10 @@ class GetBillingListView(APIView):
                 )
 
             # 3. Codef API 호출
-            codef_service = CodefAPIService()
+            codef_service = AsyncCodefAPIService()
             codef_service.access_token = access_token
 
-            result = codef_service.get_billing_list(
+            result = await codef_service.get_billing_list(
                 organization=organization,
                 connected_id=connected_id,
                 birth_date=birth_date,
@@ -565,122 +810,9 @@ class GetBillingListView(APIView):
             if not result['success']:
                 return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
-            # 4. 데이터 파싱 및 Expense 저장
+            # 4. 데이터 파싱 및 Expense 저장 (DB 작업은 스레드에서 실행)
             api_data = result.get('data', {})
-            # api_data가 dict일 수도, list일 수도 있음. 문서는 dict (단건) 또는 list.
-            # 하지만 청구 내역'목록'은 보통 UserAccount 당 하나씩 오고, 그 안에 'resChargeHistoryList'가 있음.
-            # 지금 예시는 단일 객체 안에 'resChargeHistoryList'가 있는 형태.
-            
-            billing_items = []
-            if isinstance(api_data, dict):
-                billing_items = [api_data]
-            elif isinstance(api_data, list):
-                billing_items = api_data
-            
-            saved_count = 0
-            
-            # 기본 카테고리 (없으면 생성)
-            default_category, _ = Category.objects.get_or_create(category_name="기타")
-
-            for bill in billing_items:
-                history_list = bill.get('resChargeHistoryList', [])
-                if not history_list or not isinstance(history_list, list):
-                    continue
-
-                for history in history_list:
-                    res_used_date = history.get('resUsedDate')
-                    if not res_used_date: continue
-                    
-                    # 날짜 파싱 (YYYYMMDD -> Date)
-                    try:
-                        spent_at = datetime.datetime.strptime(res_used_date, "%Y%m%d")
-                        # Timezone aware로 변환 (settings.USE_TZ=True 가정)
-                        spent_at = spent_at.replace(tzinfo=datetime.timezone.utc)
-                    except ValueError:
-                        continue
-
-                    res_used_card = history.get('resUsedCard', '') # 카드명 or 번호뒷자리
-                    
-                    # UserCard 찾기
-                    user_card = None
-                    # ... (UserCard 찾기 로직 생략)
-                    if res_used_card:
-                        # 1. 이름으로 찾기 (icontains로 완화)
-                        user_card = UserCard.objects.filter(
-                            user=request.user, 
-                            card__card_name__icontains=res_used_card
-                        ).first()
-                        
-                        # 2. 번호 뒷자리로 찾기 (숫자인 경우)
-                        if not user_card and res_used_card.isdigit():
-                            user_card = UserCard.objects.filter(
-                                user=request.user, 
-                                card_number__endswith=res_used_card
-                            ).first()
-                    
-                    # 카드 매칭 실패 시 처리 개선
-                    if not user_card:
-                         # 1. 유저 보유 카드가 단 1개
-                         user_cards = UserCard.objects.filter(user=request.user)
-                         if user_cards.count() == 1:
-                             user_card = user_cards.first()
-                         else:
-                             # 2. 매칭 실패 시 스킵
-                             logger.warning(f"Billing List: Card '{res_used_card}' not found for user {request.user.email}. Skipping.")
-                             continue
-
-                    # 금액 파싱 (콤마 제거)
-                    def parse_amount(val):
-                        if isinstance(val, int): return val
-                        if isinstance(val, str):
-                            val = val.replace(',', '').strip()
-                            return int(val) if val else 0
-                        return 0
-
-                    amount = parse_amount(history.get('resUsedAmount'))
-
-                    # Expense 생성/업데이트
-                    # 청구 내역에는 승인번호가 없을 수 있으므로 (날짜 + 가맹점명 + 금액) 조합으로 식별
-                    # resApprovalNo가 있는지 확인
-                    res_approval_no = history.get('resApprovalNo', '')
-
-                    defaults = {
-                        'category': default_category,
-                        'user_card': user_card,
-                        'status': 'PAID',
-                        'benefit_received': 0,
-                        # 추가 필드
-                        'payment_type': history.get('resPaymentType'),
-                        'installment_month': parse_amount(history.get('resInstallmentMonth')),
-                        'round_no': history.get('resRoundNo'),
-                        'payment_principal': parse_amount(history.get('resPaymentPrincipal')),
-                        'fee': parse_amount(history.get('resFee')),
-                        'payment_amt': parse_amount(history.get('resPaymentAmt')),
-                        'after_payment_balance': parse_amount(history.get('resAfterPaymentBalance')),
-                        'earn_point': parse_amount(history.get('resEarnPoint')),
-                        'approval_number': res_approval_no,
-                        'spent_at': spent_at,
-                        'amount': amount,
-                        'merchant_name': history.get('resMemberStoreName', 'Unknown'),
-                    }
-
-                    if res_approval_no:
-                        # 승인번호가 있으면 확실하게 중복 제거/업데이트
-                        Expense.objects.update_or_create(
-                            user=request.user,
-                            approval_number=res_approval_no,
-                            defaults=defaults
-                        )
-                    else:
-                        # 승인번호가 없으면 (날짜 + 가맹점명 + 금액) 조합으로 식별
-                        Expense.objects.get_or_create(
-                            user=request.user,
-                            spent_at=spent_at,
-                            merchant_name=history.get('resMemberStoreName', 'Unknown'),
-                            amount=amount,
-                            defaults=defaults
-                        )
-                    saved_count += 1
+            saved_count = await sync_to_async(_save_billing_list)(request.user, api_data)
 
             return Response({
                 "success": True, 
@@ -693,7 +825,7 @@ class GetBillingListView(APIView):
             logger.error(f"Error in get_billing_list: {str(e)}")
             return Response({"success": False, "error_message": str(e)}, status=500)
 
-class GetApprovalListView(APIView):
+class GetApprovalListView(AsyncAPIView):
     """카드 승인 내역 조회 및 Expense 저장"""
     
     permission_classes = [IsAuthenticated]
@@ -729,13 +861,12 @@ class GetApprovalListView(APIView):
          responses={200: OpenApiExample('성공', value={"success": True, "saved_count": 5})},
          tags=["Codef API"]
     )
-    def post(self, request):
+    async def post(self, request):
         try:
             access_token = request.headers.get('X-Codef-Token')
             if not access_token:
                 logger.info("No X-Codef-Token header provided, auto-fetching Codef token")
-                codef_service_token = CodefAPIService()
-                access_token = codef_service_token.get_access_token()
+                access_token = await AsyncCodefAPIService().get_access_token()
                 if not access_token:
                     return Response(
                         {"success": False, "error_message": "Codef API 토큰 자동 발급에 실패했습니다."},
@@ -754,12 +885,7 @@ class GetApprovalListView(APIView):
             card_no = data.get('card_no', '').strip() if data.get('card_no') else ''
             # card_no 없으면 UserCard에서 자동 조회
             if not card_no and request.user.is_authenticated:
-                company_name = ORG_MAP.get(organization, organization)
-                user_card = UserCard.objects.filter(
-                    user=request.user, card__company=company_name
-                ).exclude(card_number='').exclude(card_number__contains='*').first()
-                if user_card and user_card.card_number:
-                    card_no = user_card.card_number
+                card_no = await sync_to_async(_stored_card_number)(request.user, organization)
             card_password = data.get('card_password', '').strip() if data.get('card_password') else ''
 
             if not all([organization, connected_id, start_date, end_date]):
@@ -769,9 +895,9 @@ class GetApprovalListView(APIView):
                 )
 
             # Codef Service
-            codef_service = CodefAPIService()
+            codef_service = AsyncCodefAPIService()
             codef_service.access_token = access_token
-            result = codef_service.get_approval_list(
+            result = await codef_service.get_approval_list(
                 organization, connected_id, start_date, end_date,
                 card_no=card_no,
                 card_password=card_password,
@@ -782,106 +908,130 @@ class GetApprovalListView(APIView):
             if not result['success']:
                  return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
-             # Parsing & Saving
-            api_data = result.get('data', [])
-            approval_list = []
-            if isinstance(api_data, dict):
-                 approval_list = [api_data]
-            elif isinstance(api_data, list):
-                 approval_list = api_data
-
-            default_category, _ = Category.objects.get_or_create(category_name="기타")
-            saved_count = 0
-
-            # CODEF 응답 구조 처리:
-            # 1) 중첩 구조: data = [{"resApprovalList": [...]}]
-            # 2) 플랫 구조: data = [{"resUsedDate": ..., "resApprovalNo": ...}, ...]
-            flat_approvals = []
-            for item in approval_list:
-                if 'resApprovalList' in item:
-                    flat_approvals.extend(item['resApprovalList'])
-                elif 'resUsedDate' in item:
-                    flat_approvals.append(item)
-
-            for approval in flat_approvals:
-                # Parse fields
-                res_used_date = approval.get('resUsedDate')
-                res_used_time = approval.get('resUsedTime', '000000')
-                res_approval_no = approval.get('resApprovalNo')
+            # Parsing & Saving (DB 작업은 스레드에서 실행)
+            saved_count = await sync_to_async(_save_approval_list)(request.user, result.get('data', []))
 
-                if not res_used_date: continue
+            return Response({
+                "success": True, 
+                "message": f"Saved {saved_count} transactions.",
+                "data": result.get('data')
+            })
 
-                merchant_name = approval.get('resMemberStoreName', 'Unknown')
+        except Exception as e:
+            logger.error(f"Error in approval list: {e}")
+            return Response({"success": False, "error_message": str(e)}, status=500)
 
-                try:
-                    dt_str = res_used_date + res_used_time
-                    spent_at = datetime.datetime.strptime(dt_str, "%Y%m%d%H%M%S")
-                    spent_at = spent_at.replace(tzinfo=datetime.timezone.utc)
-                except:
-                    continue
 
-                def parse_amount(val):
-                    if isinstance(val, int): return val
-                    if isinstance(val, float): return int(val)
-                    if isinstance(val, str):
-                        val = val.replace(',', '').strip()
-                        return int(float(val)) if val else 0
-                    return 0
+class SyncJobCreateView(APIView):
+    """청구/승인 내역 동기화 작업 등록 (작업 ID를 바로 반환, run_sync_worker가 처리)"""
 
-                amount = parse_amount(approval.get('resUsedAmount'))
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        operation_id="create_sync_job",
+        summary="카드 내역 동기화 작업 등록",
+        description=(
+            "청구 내역(kind=billing) 또는 승인 내역(kind=approval) 조회/저장을 백그라운드 작업으로 등록하고 작업 ID를 바로 반환합니다. "
+            "진행 상태는 GET /codef/sync-jobs/{job_id}/로 조회합니다. 같은 조건의 작업이 대기 중이면 그 작업을 반환합니다."
+        ),
+        request={
+            "application/json": {
+                "type": "object",
+                "properties": {
+                    "kind": {"type": "string", "example": "approval", "description": "billing: 청구 내역, approval: 승인 내역"},
+                    "organization": {"type": "string", "example": "0304"},
+                    "connected_id": {"type": "string", "example": "88a0e8..."},
+                    "start_date": {"type": "string", "example": "20240101", "description": "승인 내역 필수"},
+                    "end_date": {"type": "string", "example": "20240131", "description": "승인 내역 필수"},
+                    "card_no": {"type": "string"},
+                    "card_password": {"type": "string"},
+                    "birth_date": {"type": "string", "example": "19900101"},
+                    "inquiry_type": {"type": "string", "example": "0"},
+                },
+                "required": ["kind", "organization", "connected_id"]
+            }
+        },
+        responses={
+            202: OpenApiExample('등록 성공', value={"success": True, "job_id": 42, "status": "PENDING"}),
+            429: OpenApiExample('작업 수 초과', value={"success": False, "error_message": "진행 중인 동기화 작업이 너무 많습니다."}),
+            503: OpenApiExample('카드 정보 암호화 불가', value={"success": False, "error_message": "카드 정보를 안전하게 저장할 수 없습니다."}),
+        },
+        tags=["Codef API"]
+    )
+    def post(self, request):
+        data = request.data
+        kind = (data.get('kind') or '').strip()
+        if kind not in jobs.KINDS:
+            return Response(
+                {"success": False, "error_message": "kind는 billing 또는 approval이어야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-                # UserCard 찾기
-                res_card_name = approval.get('resCardName', '')
-                user_card = None
+        def field(name, default=''):
+            value = data.get(name)
+            return str(value).strip() if value else default
+
+        params = {
+            "organization": field('organization'),
+            "connected_id": field('connected_id'),
+            "birth_date": field('birth_date') or request.user.birth_date or '',
+            "card_no": field('card_no'),
+            "card_password": field('card_password'),
+            "inquiry_type": field('inquiry_type', '0'),
+        }
+        if kind == 'approval':
+            params.update(start_date=field('start_date'), end_date=field('end_date'))
+
+        required = ['organization', 'connected_id'] + (['start_date', 'end_date'] if kind == 'approval' else [])
+        if not all(params[name] for name in required):
+            return Response(
+                {"success": False, "error_message": f"{', '.join(required)}는 필수 입력값입니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-                if res_card_name:
-                    user_card = UserCard.objects.filter(
-                        user=request.user,
-                        card__card_name__icontains=res_card_name
-                    ).first()
+        # card_no 없으면 UserCard에서 자동 조회
+        if not params['card_no']:
+            params['card_no'] = _stored_card_number(request.user, params['organization'])
 
-                if not user_card:
-                    user_cards = UserCard.objects.filter(user=request.user)
-                    if user_cards.count() == 1:
-                        user_card = user_cards.first()
-                    else:
-                        logger.warning(f"Skipping transaction {res_approval_no}: No matching card for '{res_card_name}'")
-                        continue
-
-                expense_defaults = {
-                    'category': default_category,
-                    'user_card': user_card,
-                    'status': 'PAID',
-                    'spent_at': spent_at,
-                    'amount': amount,
-                    'merchant_name': merchant_name,
-                    'approval_number': res_approval_no
-                }
+        try:
+            job, created = jobs.enqueue(request.user, kind, params)
+        except ValueError as e:
+            # 카드 비밀번호를 암호화할 수 없으면 평문으로 저장하지 않고 거절
+            logger.error(f"Sync job enqueue failed: {e}")
+            return Response(
+                {"success": False, "error_message": "카드 정보를 안전하게 저장할 수 없습니다. 잠시 후 다시 시도해주세요."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if job is None:
+            return Response(
+                {"success": False, "error_message": "진행 중인 동기화 작업이 너무 많습니다. 잠시 후 다시 시도해주세요."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        if created:
+            logger.info(f"Sync job {job.job_id} ({kind}) enqueued for user {request.user.pk}")
+        return Response(
+            {"success": True, "job_id": job.job_id, "status": job.status},
+            status=status.HTTP_202_ACCEPTED
+        )
 
-                if res_approval_no:
-                    obj, created = Expense.objects.update_or_create(
-                        user=request.user,
-                        approval_number=res_approval_no,
-                        defaults=expense_defaults
-                    )
-                else:
-                    obj, created = Expense.objects.get_or_create(
-                        user=request.user,
-                        spent_at=spent_at,
-                        amount=amount,
-                        merchant_name=merchant_name,
-                        defaults=expense_defaults
-                    )
 
-                    if created:
-                        saved_count += 1
+class SyncJobDetailView(APIView):
+    """동기화 작업 상태 조회 (본인 작업만)"""
 
-            return Response({
-                "success": True, 
-                "message": f"Saved {saved_count} transactions.",
-                "data": result.get('data')
-            })
+    permission_classes = [IsAuthenticated]
 
-        except Exception as e:
-            logger.error(f"Error in approval list: {e}")
-            return Response({"success": False, "error_message": str(e)}, status=500)
+    @extend_schema(
+        operation_id="get_sync_job",
+        summary="카드 내역 동기화 작업 상태 조회",
+        description="status가 SUCCEEDED이면 result.saved_count에 저장 건수가, FAILED이면 error_message에 실패 사유가 담깁니다.",
+        responses={200: SyncJobSerializer},
+        tags=["Codef API"]
+    )
+    def get(self, request, job_id):
+        job = SyncJob.objects.filter(job_id=job_id, user=request.user).first()
+        if job is None:
+            return Response(
+                {"success": False, "error_message": "작업을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({"success": True, **SyncJobSerializer(job).data})
@@ -113,6 +113,37 @@ DATABASES = {
     }
 }
 
+# Cache
+# [설명] default: 응답 캐시(expense.response_cache)와 재계산 락에 사용 (프로세스별). Prometheus 백엔드로 히트/미스 메트릭도 수집
+# [설명] shared: 웹/동기화 워커 프로세스가 함께 봐야 하는 값 (사용자 데이터 버전, Codef 토큰과 재발급 락).
+#        DB 테이블에 저장하므로 배포 시 `python manage.py createcachetable` 필요 (테스트 DB는 자동 생성)
+CACHES = {
+    'default': {
+        'BACKEND': 'django_prometheus.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,  # [설명] 사용자×API×파라미터 조합 수를 고려한 최대 항목 수
+        },
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'shared_cache',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,  # [설명] 사용자 수 + 토큰 항목 (초과 시 일부 삭제 → 해당 사용자는 새 버전으로 시작)
+        },
+    },
+}
+
+# Codef HTTP
+# [설명] codef.transport 공유 연결 풀의 호스트별 연결 수와 엔드포인트별 (연결, 읽기) 타임아웃(초) 재정의
+CODEF_HTTP_POOL_MAXSIZE = int(os.getenv('CODEF_HTTP_POOL_MAXSIZE', '10'))
+CODEF_HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv('CODEF_HTTP_ASYNC_MAX_CONNECTIONS', '200'))  # [설명] async 뷰 워커당 Codef 동시 연결 수
+CODEF_HTTP_TIMEOUTS = {
+    # 'approval-list': (3.05, 60),
+}
+# [설명] run_sync_worker 프로세스당 동시에 실행할 Codef 동기화 작업 수 (codef.jobs)
+CODEF_SYNC_WORKER_CONCURRENCY = int(os.getenv('CODEF_SYNC_WORKER_CONCURRENCY', '4'))
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
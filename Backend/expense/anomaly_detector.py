@@ -0,0 +1,188 @@
+"""
+카테고리별 지출 이상 감지
+
+사용자/카테고리마다 결제 금액의 지수가중 이동평균(EWMA)과 이동분산을 CategorySpendingStat
+한 행에 유지하고, 새 결제가 평소보다 크게 벗어나면(표준점수 기준) 이상 지출로 기록합니다.
+
+통계는 새 결제마다 상수 시간에 갱신되고 사용자별 처리 위치는 AnomalyScanState에 저장하므로,
+매 실행마다 마지막 처리 이후의 Expense만 읽습니다. Codef 동기화 직후 호출해도 이력을 다시
+훑지 않습니다. (이미 반영된 지출의 수정/삭제는 통계에 되돌려 반영하지 않음)
+"""
+import logging
+import math
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Expense, CategorySpendingStat, AnomalyScanState
+from . import response_cache
+
+logger = logging.getLogger(__name__)
+
+EWMA_ALPHA = 0.1  # [설명] 새 결제의 가중치 (클수록 최근 결제에 민감)
+WARMUP_OBSERVATIONS = 5  # [설명] 이 건수 이상 반영된 카테고리만 이상 여부 판단
+ZSCORE_THRESHOLD = 3.0  # [설명] 이상 지출로 보는 표준점수
+MIN_STD_RATIO = 0.2  # [설명] 표준편차 하한 (평균 대비 비율). 금액이 거의 일정한 카테고리의 과민 반응 방지
+MIN_EXCESS_AMOUNT = 10000  # [설명] 평소보다 이 금액 이상 많아야 이상 지출로 판단 (원)
+DEFAULT_WINDOW_DAYS = 7  # [설명] "현재" 이상 지출로 보는 기간 (일)
+
+
+def _observe(stat, row):
+    """
+    결제 한 건을 통계에 반영
+
+    Returns:
+        float | None: 이상 지출이면 표준점수, 아니면 None
+    """
+    amount = row['amount']
+    score = None
+    if stat.observations >= WARMUP_OBSERVATIONS:
+        std = max(math.sqrt(stat.ewma_var), stat.ewma_mean * MIN_STD_RATIO, 1.0)
+        z = (amount - stat.ewma_mean) / std
+        if z >= ZSCORE_THRESHOLD and amount - stat.ewma_mean >= MIN_EXCESS_AMOUNT:
+            score = z
+            stat.anomaly_expense_id = row['expense_id']
+            stat.anomaly_baseline = stat.ewma_mean
+            stat.anomaly_score = round(z, 2)
+            stat.anomaly_at = row['spent_at']
+
+    if stat.observations == 0:
+        stat.ewma_mean = float(amount)
+        stat.ewma_var = 0.0
+    else:
+        # 증분 EWMA 평균/분산 (Welford 방식의 지수가중 버전)
+        diff = amount - stat.ewma_mean
+        increment = EWMA_ALPHA * diff
+        stat.ewma_mean += increment
+        stat.ewma_var = (1 - EWMA_ALPHA) * (stat.ewma_var + diff * increment)
+    stat.observations += 1
+    stat.updated_at = timezone.now()  # [설명] bulk_update는 auto_now를 적용하지 않음
+    return score
+
+
+def _process(user_id, rows):
+    """
+    새 결제들을 카테고리별 통계에 반영
+
+    Returns:
+        int: 새로 감지된 이상 지출 수
+    """
+    rows = [row for row in rows if row['status'] == 'PAID' and row['amount'] > 0 and row['category_id']]
+    if not rows:
+        return 0
+
+    stats = {
+        stat.category_id: stat
+        for stat in CategorySpendingStat.objects.filter(
+            user_id=user_id, category_id__in={row['category_id'] for row in rows}
+        )
+    }
+
+    detected = 0
+    for row in rows:
+        stat = stats.get(row['category_id'])
+        if stat is None:
+            stat = stats[row['category_id']] = CategorySpendingStat(user_id=user_id, category_id=row['category_id'])
+        if _observe(stat, row) is not None:
+            detected += 1
+
+    CategorySpendingStat.objects.bulk_create([s for s in stats.values() if s.pk is None])
+    CategorySpendingStat.objects.bulk_update(
+        [s for s in stats.values() if s.pk is not None],
+        ['observations', 'ewma_mean', 'ewma_var', 'anomaly_expense', 'anomaly_baseline',
+         'anomaly_score', 'anomaly_at', 'updated_at'],
+    )
+    return detected
+
+
+def update(user_id):
+    """
+    마지막 처리 이후의 Expense를 사용자의 카테고리별 통계에 반영
+
+    Args:
+        user_id (int): 사용자 PK
+
+    Returns:
+        int: 새로 감지된 이상 지출 수
+    """
+    with transaction.atomic():
+        state, _ = AnomalyScanState.objects.select_for_update().get_or_create(user_id=user_id)
+
+        rows = list(
+            Expense.objects.active()
+            .filter(user_id=user_id, expense_id__gt=state.last_expense_id)
+            .order_by('spent_at', 'expense_id')
+            .values('expense_id', 'amount', 'status', 'spent_at', 'category_id')
+        )
+        if not rows:
+            return 0
+
+        detected = _process(user_id, rows)
+        state.last_expense_id = max(row['expense_id'] for row in rows)
+        state.save()
+
+    if detected:
+        response_cache.bump_version(user_id)
+    return detected
+
+
+def update_safely(user_id):
+    """Codef 동기화 후처리용 (실패해도 동기화 응답에는 영향 없음)"""
+    try:
+        return update(user_id)
+    except Exception as e:
+        logger.error(f"Spending anomaly update failed for user {user_id}: {e}")
+        return 0
+
+
+def current_anomalies(user, days=DEFAULT_WINDOW_DAYS):
+    """
+    최근 days일 안에 감지된 카테고리별 이상 지출 (표준점수 내림차순)
+
+    Returns:
+        List[Dict]: [{"category_id", "category_name", "expense_id", "merchant_name", "amount",
+                      "usual_amount", "score", "spent_at"}, ...]
+    """
+    stats = (
+        CategorySpendingStat.objects
+        .filter(
+            user=user,
+            anomaly_at__gte=timezone.now() - timedelta(days=days),
+            anomaly_expense__deleted_at__isnull=True,
+        )
+        .select_related('category', 'anomaly_expense')
+        .order_by('-anomaly_score')
+    )
+    return [
+        {
+            "category_id": stat.category_id,
+            "category_name": stat.category.category_name or "기타",
+            "expense_id": stat.anomaly_expense_id,
+            "merchant_name": stat.anomaly_expense.merchant_name,
+            "amount": stat.anomaly_expense.amount,
+            "usual_amount": round(stat.anomaly_baseline),
+            "score": stat.anomaly_score,
+            "spent_at": stat.anomaly_at,
+        }
+        for stat in stats
+    ]
+
+
+def reset(user_id=None):
+    """통계 초기화 (다음 실행 시 전체 이력을 다시 처리)"""
+    states = AnomalyScanState.objects.all()
+    stats = CategorySpendingStat.objects.all()
+    if user_id is not None:
+        states = states.filter(user_id=user_id)
+        stats = stats.filter(user_id=user_id)
+    stats.delete()
+    states.delete()
+
+
+def users_with_new_expenses():
+    """처리하지 않은 Expense가 있는 사용자 ID 목록"""
+    scanned = dict(AnomalyScanState.objects.values_list('user_id', 'last_expense_id'))
+    latest = Expense.objects.order_by().values('user_id').annotate(last_id=Max('expense_id'))
+    return [row['user_id'] for row in latest if row['last_id'] > scanned.get(row['user_id'], 0)]
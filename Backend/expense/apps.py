@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ExpenseConfig(AppConfig):
     name = 'expense'
+
+    def ready(self):
+        from . import signals  # noqa: F401  [설명] Expense 변경 시 일별 롤업 갱신 시그널 등록
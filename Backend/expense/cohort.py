@@ -0,0 +1,189 @@
+"""
+월별 코호트(연령대 × 성별) 지출 집계 모듈
+
+소비 패턴 분석에서 "나와 같은 연령대/성별 사용자"와 비교할 수 있도록, 월별로 코호트마다
+사용자별 총지출의 합계/평균/분위수와 카테고리별 합계를 CohortMonthlyAggregate에 저장합니다.
+계산은 일별 롤업을 월 단위로 한 번 훑는 배치 작업(refresh_cohort_stats)에서 하고,
+조회는 (월, 연령대, 성별) 유니크 인덱스로 한 행만 읽습니다.
+
+사용자는 (연령대, 성별), (연령대, 전체), (전체, 성별), (전체, 전체) 네 코호트에 모두 포함되며,
+조회 시 가장 구체적인 코호트부터 MIN_COHORT_SIZE명 이상인 첫 코호트를 사용합니다.
+"""
+from itertools import product
+
+import numpy as np
+from django.db.models import Sum
+from django.utils import timezone
+
+from users.models import User
+from .models import DailySpending, CohortMonthlyAggregate, month_bounds
+
+ALL_AGE_GROUPS = "전체"  # [설명] 연령대 무관 코호트
+ALL_GENDERS = "A"  # [설명] 성별 무관 코호트
+GENDER_LABELS = {"M": "남성", "F": "여성"}
+MIN_COHORT_SIZE = 5  # [설명] 비교에 사용할 최소 코호트 인원 (적으면 더 넓은 코호트로 대체)
+
+
+def _target_month(year, month):
+    return f"{year:04d}-{month:02d}"
+
+
+def age_group_of(user, year):
+    """사용자 연령대 (저장된 age_group 우선, 없으면 생년월일로 계산, 알 수 없으면 None)"""
+    if user['age_group']:
+        return user['age_group']
+    birth_date = user['birth_date'] or ''
+    if len(birth_date) == 8 and birth_date.isdigit():
+        age = year - int(birth_date[:4])
+        if age > 0:
+            return f"{age // 10 * 10}대"
+    return None
+
+
+def gender_of(user):
+    """사용자 성별 코드 (M/F, 알 수 없으면 None)"""
+    if user['gender'] is None:
+        return None
+    return "F" if user['gender'] else "M"
+
+
+def cohort_keys(user, year):
+    """사용자가 속한 코호트 키 목록 (구체적인 코호트부터)"""
+    age_group, gender = age_group_of(user, year), gender_of(user)
+    ages = [age_group, ALL_AGE_GROUPS] if age_group else [ALL_AGE_GROUPS]
+    genders = [gender, ALL_GENDERS] if gender else [ALL_GENDERS]
+    if age_group and gender:
+        # 연령대가 성별보다 지출 패턴 차이가 커서 (연령대, 전체)를 (전체, 성별)보다 먼저 시도
+        return [(age_group, gender), (age_group, ALL_GENDERS), (ALL_AGE_GROUPS, gender), (ALL_AGE_GROUPS, ALL_GENDERS)]
+    return list(product(ages, genders))
+
+
+def _quantiles(values, qs):
+    return [int(round(v)) for v in np.percentile(values, qs)] if len(values) else [0] * len(qs)
+
+
+def compute(year, month):
+    """
+    해당 월의 모든 코호트 집계를 다시 계산하여 교체
+
+    Returns:
+        int: 저장된 코호트 수
+    """
+    start, end = month_bounds(year, month)
+    rows = (
+        DailySpending.objects.filter(day__gte=start, day__lt=end)
+        .values('user_id', 'category__category_name')
+        .annotate(total=Sum('total_amount'))
+        .order_by()
+    )
+
+    user_totals, user_categories = {}, {}
+    for row in rows:
+        user_id, category_name = row['user_id'], row['category__category_name'] or "기타"
+        user_totals[user_id] = user_totals.get(user_id, 0) + row['total']
+        categories = user_categories.setdefault(user_id, {})
+        categories[category_name] = categories.get(category_name, 0) + row['total']
+
+    members = {}
+    users = User.objects.filter(user_id__in=list(user_totals)).values('user_id', 'age_group', 'gender', 'birth_date')
+    for user in users:
+        for key in cohort_keys(user, year):
+            members.setdefault(key, []).append(user['user_id'])
+
+    target_month = _target_month(year, month)
+    now = timezone.now()
+    aggregates = []
+    for (age_group, gender), user_ids in members.items():
+        totals = np.fromiter((user_totals[user_id] for user_id in user_ids), dtype=np.float64, count=len(user_ids))
+        p25, p50, p75, p90 = _quantiles(totals, [25, 50, 75, 90])
+
+        spend_by_category = {}
+        for user_id in user_ids:
+            for category_name, amount in user_categories[user_id].items():
+                spend_by_category.setdefault(category_name, []).append(amount)
+        categories = {}
+        for category_name, amounts in spend_by_category.items():
+            c50, c75 = _quantiles(amounts, [50, 75])
+            categories[category_name] = {"sum": sum(amounts), "count": len(amounts), "p50": c50, "p75": c75}
+
+        aggregates.append(CohortMonthlyAggregate(
+            target_month=target_month, age_group=age_group, gender=gender,
+            user_count=len(user_ids), total_amount=int(totals.sum()), mean=float(totals.mean()),
+            p25=p25, p50=p50, p75=p75, p90=p90, categories=categories, computed_at=now,
+        ))
+
+    CohortMonthlyAggregate.objects.filter(target_month=target_month).delete()
+    CohortMonthlyAggregate.objects.bulk_create(aggregates)
+    return len(aggregates)
+
+
+def get_cohort(user, year, month):
+    """
+    사용자와 비교할 코호트 집계 (MIN_COHORT_SIZE명 이상인 가장 구체적인 코호트)
+
+    Returns:
+        CohortMonthlyAggregate | None: 집계가 없거나 모든 코호트가 작으면 None
+    """
+    profile = {'age_group': user.age_group, 'gender': user.gender, 'birth_date': user.birth_date}
+    keys = cohort_keys(profile, year)
+    candidates = {
+        (aggregate.age_group, aggregate.gender): aggregate
+        for aggregate in CohortMonthlyAggregate.objects.filter(
+            target_month=_target_month(year, month),
+            age_group__in={age_group for age_group, _ in keys},
+            gender__in={gender for _, gender in keys},
+        )
+    }
+    for key in keys:
+        aggregate = candidates.get(key)
+        if aggregate and aggregate.user_count >= MIN_COHORT_SIZE:
+            return aggregate
+    return None
+
+
+def _diff_percent(mine, base):
+    return round(((mine - base) / base) * 100, 1) if base else 0.0
+
+
+def build_comparison(aggregate, my_total, my_categories):
+    """
+    코호트 비교 응답 데이터
+
+    Args:
+        aggregate (CohortMonthlyAggregate): get_cohort 결과
+        my_total (int): 내 월 총지출
+        my_categories (Dict[str, int]): 내 {카테고리명: 금액}
+    """
+    age_label = "" if aggregate.age_group == ALL_AGE_GROUPS else aggregate.age_group
+    gender_label = GENDER_LABELS.get(aggregate.gender, "")
+
+    categories = []
+    for category_name in set(my_categories) | set(aggregate.categories):
+        stats = aggregate.categories.get(category_name, {"sum": 0, "count": 0, "p50": 0})
+        # 평균은 코호트 전체 인원 기준 (해당 카테고리에 쓰지 않은 사용자는 0원)
+        avg_amount = stats["sum"] / aggregate.user_count
+        my_amount = my_categories.get(category_name, 0)
+        categories.append({
+            "name": category_name,
+            "my_amount": my_amount,
+            "avg_amount": round(avg_amount),
+            "median_amount": stats["p50"],
+            "spender_ratio": round(stats["count"] / aggregate.user_count * 100, 1),
+            "diff_percent": _diff_percent(my_amount, avg_amount),
+        })
+    categories.sort(key=lambda x: (x['my_amount'], x['avg_amount']), reverse=True)
+
+    return {
+        "age_group": aggregate.age_group,
+        "gender": None if aggregate.gender == ALL_GENDERS else aggregate.gender,
+        "label": " ".join(filter(None, [age_label, gender_label])) or "전체",
+        "user_count": aggregate.user_count,
+        "my_total_spent": my_total,
+        "avg_spent": round(aggregate.mean),
+        "median_spent": aggregate.p50,
+        "p25_spent": aggregate.p25,
+        "p75_spent": aggregate.p75,
+        "p90_spent": aggregate.p90,
+        "diff_percent": _diff_percent(my_total, aggregate.mean),
+        "categories": categories,
+    }
@@ -0,0 +1,108 @@
+"""
+월별 전체 사용자 지출 분포 관리 모듈
+
+소비 패턴 분석은 "전체 사용자 중 내 위치"와 "그룹 평균"이 필요합니다. 요청마다
+전체 사용자 지출을 그룹핑하는 대신, 월별 사용자별 총지출의 고정 크기 분위수와 평균을
+MonthlySpendDistribution에 저장해 두고 백분위는 분위수 이진 탐색으로 계산합니다.
+
+- 진행 중인 달: STALE_AFTER가 지나면 오래된 값을 그대로 반환하면서,
+  락을 잡은 한 요청만 다시 계산합니다 (stale-while-revalidate).
+- 지난 달: 월이 끝난 뒤 계산된 값은 확정값으로 쓰되, 이후 그 달의 Expense가 바뀌면
+  (Codef 동기화/CSV 가져오기 등 과거 내역 반영) 롤업 갱신 시 mark_changed로 표시되어 다음 조회 때 다시 계산합니다.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from users.models import MonthlyStat
+from .models import Expense, MonthlySpendDistribution, local_day_start, month_bounds
+
+logger = logging.getLogger(__name__)
+
+STALE_AFTER = timedelta(minutes=10)  # [설명] 진행 중인 달의 분포 재계산 주기
+REFRESH_LOCK_TIMEOUT = 60  # [설명] 재계산 락 유지 시간 (초)
+
+
+def _target_month(year, month):
+    return f"{year:04d}-{month:02d}"
+
+
+def compute(year, month):
+    """
+    해당 월의 사용자별 총지출 분포를 계산하여 저장
+
+    Returns:
+        MonthlySpendDistribution: 갱신된 분포
+    """
+    totals = sorted(
+        Expense.objects.for_month(None, year, month)
+        .values('user')
+        .annotate(user_total=Sum('amount'))
+        .order_by()
+        .values_list('user_total', flat=True)
+    )
+    user_count = len(totals)
+
+    distribution, _ = MonthlySpendDistribution.objects.update_or_create(
+        target_month=_target_month(year, month),
+        defaults={
+            'quantiles': MonthlySpendDistribution.quantiles_of(totals),
+            'user_count': user_count,
+            'mean': (sum(totals) / user_count) if user_count else 0,
+            'computed_at': timezone.now(),
+            'changed_at': None,
+        }
+    )
+    # 이미 구체화된 해당 월 MonthlyStat들의 그룹 평균도 함께 맞춤
+    MonthlyStat.objects.filter(target_month=distribution.target_month).update(
+        avg_group_spent=round(distribution.mean)
+    )
+    return distribution
+
+
+def mark_changed(months):
+    """
+    Expense 변경으로 해당 월 분포가 달라졌음을 표시 (롤업 갱신 시 호출, UPDATE 한 번)
+
+    Args:
+        months (Iterable[Tuple[int, int]]): [(year, month), ...]
+    """
+    target_months = {_target_month(year, month) for year, month in months}
+    if target_months:
+        MonthlySpendDistribution.objects.filter(target_month__in=target_months).update(changed_at=timezone.now())
+
+
+def is_stale(distribution, year, month):
+    """분포가 재계산 대상인지 여부"""
+    month_end = local_day_start(month_bounds(year, month)[1])
+    if distribution.computed_at >= month_end:
+        # 월이 끝난 뒤 계산된 분포는 그 뒤로 해당 월 지출이 바뀌었을 때만 재계산
+        return distribution.changed_at is not None and distribution.changed_at >= distribution.computed_at
+    return timezone.now() - distribution.computed_at > STALE_AFTER
+
+
+def get_distribution(year, month):
+    """
+    해당 월의 분포 조회 (오래된 값 허용)
+
+    저장된 분포가 없으면 즉시 계산하고, 오래된 경우 락을 잡은 요청만 재계산하며
+    나머지 요청은 기존 값을 그대로 사용합니다.
+    """
+    distribution = MonthlySpendDistribution.objects.filter(target_month=_target_month(year, month)).first()
+    if distribution is None:
+        return compute(year, month)
+
+    if is_stale(distribution, year, month):
+        lock_key = f"spend_distribution:refresh:{_target_month(year, month)}"
+        if cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+            try:
+                distribution = compute(year, month)
+            except Exception as e:
+                logger.error(f"Spend distribution refresh failed for {year}-{month}: {e}")
+            finally:
+                cache.delete(lock_key)
+
+    return distribution
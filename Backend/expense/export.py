@@ -0,0 +1,107 @@
+"""
+지출 내역 내보내기 (CSV / NDJSON)
+
+values_list 프로젝션을 iterator(chunk_size)로 나눠 읽으면서 한 줄씩 만들어 내보내므로,
+기간이 몇 년이든 메모리 사용량이 일정하고 첫 바이트가 바로 전송됩니다.
+ASGI(uvicorn)에서는 async 제너레이터(aiter_export)를, WSGI/관리 명령에서는 동기 제너레이터(iter_export)를 사용합니다.
+"""
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from .models import Expense, local_day_start
+
+EXPORT_CHUNK_SIZE = 2000  # [설명] DB에서 한 번에 가져오는 행 수
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+# (컬럼명, values_list 필드)
+EXPORT_COLUMNS = [
+    ('expense_id', 'expense_id'),
+    ('spent_at', 'spent_at'),
+    ('merchant_name', 'merchant_name'),
+    ('amount', 'amount'),
+    ('status', 'status'),
+    ('category_name', 'category__category_name'),
+    ('card_name', 'user_card__card__card_name'),
+    ('payment_type', 'payment_type'),
+    ('installment_month', 'installment_month'),
+    ('approval_number', 'approval_number'),
+]
+
+
+def export_queryset(user, start=None, end=None, category_name=None):
+    """
+    내보내기 대상 QuerySet (오래된 순)
+
+    Args:
+        user: User 객체 또는 PK
+        start (date, optional): 시작 날짜 (포함)
+        end (date, optional): 종료 날짜 (미포함)
+        category_name (str, optional): 카테고리명 필터
+    """
+    expenses = Expense.objects.active().filter(user=user)
+    if start is not None:
+        expenses = expenses.filter(spent_at__gte=local_day_start(start))
+    if end is not None:
+        expenses = expenses.filter(spent_at__lt=local_day_start(end))
+    if category_name:
+        expenses = expenses.filter(category__category_name=category_name)
+
+    return expenses.order_by('spent_at', 'expense_id').values_list(*(field for _, field in EXPORT_COLUMNS))
+
+
+def _format(row):
+    row = list(row)
+    row[1] = timezone.localtime(row[1]).isoformat()  # spent_at (Asia/Seoul)
+    return row
+
+
+class _Echo:
+    """csv.writer가 쓴 한 줄을 그대로 돌려주는 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+def _encoder(export_format):
+    """
+    형식별 (헤더 줄, 행 → 줄 변환 함수)
+
+    CSV는 엑셀 호환을 위해 헤더 앞에 BOM을 붙이고, NDJSON은 헤더 없이 행마다 JSON 객체 한 줄입니다.
+    """
+    names = [name for name, _ in EXPORT_COLUMNS]
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        return '\ufeff' + writer.writerow(names), lambda row: writer.writerow(_format(row))
+    return None, lambda row: json.dumps(dict(zip(names, _format(row))), ensure_ascii=False) + '\n'
+
+
+def iter_export(queryset, export_format):
+    """형식에 맞는 줄 단위 제너레이터 (WSGI 응답/관리 명령용)"""
+    header, encode = _encoder(export_format)
+    if header:
+        yield header
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield encode(row)
+
+
+async def aiter_export(queryset, export_format):
+    """
+    iter_export의 async 버전 (ASGI 응답용)
+
+    ASGI에서 StreamingHttpResponse에 동기 이터레이터를 주면 Django가 전부 list로 읽은 뒤에 전송하므로,
+    iterator(chunk_size) 묶음을 sync_to_async로 하나씩 가져와 묶음마다 바로 내보냅니다.
+    """
+    header, encode = _encoder(export_format)
+    if header:
+        yield header
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    next_chunk = sync_to_async(lambda: list(islice(rows, EXPORT_CHUNK_SIZE)))
+    while chunk := await next_chunk():
+        yield ''.join(encode(row) for row in chunk)
@@ -0,0 +1,157 @@
+"""
+홈 화면 위젯 계산 헬퍼
+
+각 위젯 API와 대시보드 API가 같은 계산 로직을 공유하도록, 이미 집계된
+일별/카테고리별 합계를 입력으로 받아 응답 데이터를 만드는 순수 함수들입니다.
+"""
+from calendar import monthrange
+
+from django.utils import timezone
+
+from .rollup import fill_day_series
+from .serializers import CATEGORY_MAPPING
+
+DEFAULT_CATEGORY_STYLE = {
+    'emoji': '🏷️',
+    'color': '#757575',
+    'en_name': 'other'
+}
+
+
+def day_series_from_totals(daily_totals, last_day):
+    """
+    {일: 합계} 딕셔너리를 rollup.day_series와 같은 형식의 시계열로 변환 (대시보드용)
+    """
+    points = {}
+    cumulative = 0
+    for day in sorted(daily_totals):
+        if day > last_day:
+            break
+        cumulative += daily_totals[day]
+        points[day] = (daily_totals[day], cumulative)
+    return fill_day_series(points, last_day)
+
+
+def _curve(series):
+    """시계열의 (최종 누적 합계, [{"day": 일, "amount": 누적금액}, ...])"""
+    total = series[-1]["cumulative"] if series else 0
+    return total, [{"day": point["day"], "amount": float(point["cumulative"])} for point in series]
+
+
+def comparison_day(year, month, today=None):
+    """월간 비교 기준일 (이번 달이면 오늘, 아니면 말일. 오늘은 현지 타임존 기준으로 forecast와 동일)"""
+    today = today or timezone.localdate()
+    return today.day if today.year == year and today.month == month else monthrange(year, month)[1]
+
+
+def build_accumulated(series):
+    """누적 데이터 (AccumulatedDataSerializer 형식, series는 해당 월 전체 일별 시계열)"""
+    total, daily_data = _curve(series)
+    return {"total": total, "dailyData": daily_data}
+
+
+def build_daily_summary(series):
+    """일별 요약 (DailySummarySerializer 형식, 지출 있는 날짜만)"""
+    return {"expenses": {str(point["day"]): point["amount"] for point in series if point["amount"]}}
+
+
+def build_weekly_average(month_total, year, month):
+    """주간 평균 (WeeklyDataSerializer 형식)"""
+    weeks = monthrange(year, month)[1] / 7
+    return {"average": int(month_total / weeks) if weeks > 0 else 0}
+
+
+def month_range(start_year, start_month, end_year, end_month):
+    """시작 월부터 종료 월까지(포함)의 (year, month) 목록"""
+    months = []
+    year, month = start_year, start_month
+    while (year, month) <= (end_year, end_month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def build_trend(rows, months, group):
+    """
+    월별 추이 (TrendSerializer 형식)
+
+    Args:
+        rows (Iterable[Dict]): rollup.monthly_trend 결과
+        months (List[Tuple[int, int]]): 응답에 포함할 (year, month) 목록 (0으로 채움)
+        group (str): 'none' | 'category' | 'card'
+    """
+    index = {key: i for i, key in enumerate(months)}
+    totals = [0] * len(months)
+    series = {}
+
+    for row in rows:
+        position = index.get((row['month'].year, row['month'].month))
+        if position is None:
+            continue
+        totals[position] += row['total']
+
+        if group == 'category':
+            key, name = row['category_id'], row['category__category_name'] or "기타"
+        elif group == 'card':
+            key, name = row['user_card_id'], row['user_card__card__card_name'] or "기타"
+        else:
+            continue
+
+        if key not in series:
+            series[key] = {"id": key, "name": name, "amounts": [0] * len(months), "total": 0}
+        series[key]["amounts"][position] += row['total']
+        series[key]["total"] += row['total']
+
+    return {
+        "group": group,
+        "months": [f"{year:04d}-{month:02d}" for year, month in months],
+        "totals": totals,
+        "series": sorted(series.values(), key=lambda x: x['total'], reverse=True)
+    }
+
+
+def build_monthly_average(monthly_totals):
+    """월간 평균 (MonthlyDataSerializer 형식)"""
+    return {"average": int(sum(monthly_totals) / len(monthly_totals)) if monthly_totals else 0}
+
+
+def build_category_summary(current_totals, prev_totals):
+    """
+    카테고리별 요약
+
+    Args:
+        current_totals (Dict[str, int]): 이번 달 {카테고리명: 금액}
+        prev_totals (Dict[str, int]): 전월 {카테고리명: 금액}
+    """
+    total_spent = sum(current_totals.values()) or 1
+
+    categories = []
+    for category_name, current_amount in current_totals.items():
+        category_name = category_name or "기타"
+        prev_amount = prev_totals.get(category_name, 0)
+        category_info = CATEGORY_MAPPING.get(category_name, DEFAULT_CATEGORY_STYLE)
+
+        categories.append({
+            "name": category_name,
+            "emoji": category_info['emoji'],
+            "amount": current_amount,
+            "change": current_amount - prev_amount,
+            "percent": int((current_amount / total_spent) * 100),
+            "color": category_info['color']
+        })
+
+    # 금액순 정렬
+    categories.sort(key=lambda x: x['amount'], reverse=True)
+    return {"categories": categories}
+
+
+def build_month_comparison(this_series, prev_series):
+    """월간 비교 (MonthComparisonSerializer 형식, 두 시계열 모두 1일~기준일)"""
+    this_month_total, this_month_data = _curve(this_series)
+    last_month_same_day, last_month_data = _curve(prev_series)
+    return {
+        "thisMonthTotal": this_month_total,
+        "lastMonthSameDay": last_month_same_day,
+        "thisMonthData": this_month_data,
+        "lastMonthData": last_month_data
+    }
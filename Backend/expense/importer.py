@@ -0,0 +1,248 @@
+"""
+지출 내역 가져오기 (CSV 명세서 업로드)
+
+Codef가 지원하지 않는 카드의 명세서를 CSV로 받아 Expense로 저장합니다.
+
+- 파일은 한 줄씩 읽어 IMPORT_CHUNK_SIZE 단위로 처리하므로 행 수와 무관하게 메모리 사용량이 일정합니다.
+- 보유 카드/카테고리는 시작할 때 한 번만 조회해 딕셔너리로 찾습니다.
+- 중복은 묶음마다 (사용자, 승인번호) 또는 (사용자, 결제 시각, 가맹점명, 금액)으로 기존 행을 한 번에 조회해 거릅니다.
+- 저장은 하나의 트랜잭션 안에서 묶음별 bulk_create로 하고, 시그널이 발생하지 않으므로
+  일별 롤업 갱신 대상을 직접 표시합니다.
+
+내보내기(export) CSV의 컬럼명을 그대로 받으므로 내보낸 파일을 다시 가져올 수 있습니다.
+"""
+import csv
+import io
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from category.classifier import CategoryResolver
+from users.models import UserCard
+from .models import Expense
+from . import rollup, subscription_detector, anomaly_detector
+
+IMPORT_CHUNK_SIZE = 1000  # [설명] 중복 조회/bulk_create 한 번에 처리하는 행 수
+IMPORT_MAX_FILE_SIZE = 20 * 1024 * 1024  # [설명] 업로드 파일 최대 크기 (바이트)
+IMPORT_ENCODINGS = ('utf-8', 'cp949')  # [설명] 지원하는 파일 인코딩 (카드사 명세서는 cp949인 경우가 많음)
+MAX_REPORTED_ERRORS = 20  # [설명] 응답에 포함할 실패 행 최대 개수
+
+# 헤더 이름 → 필드 (내보내기 컬럼명 + 카드사 명세서에서 흔한 한글 헤더)
+HEADER_ALIASES = {
+    'spent_at': 'spent_at', '이용일시': 'spent_at', '이용일자': 'spent_at', '거래일시': 'spent_at', '승인일시': 'spent_at',
+    'merchant_name': 'merchant_name', '가맹점명': 'merchant_name', '이용가맹점': 'merchant_name', '이용처': 'merchant_name',
+    'amount': 'amount', '이용금액': 'amount', '금액': 'amount', '승인금액': 'amount',
+    'status': 'status', '상태': 'status', '승인구분': 'status',
+    'category_name': 'category_name', '카테고리': 'category_name',
+    'card_name': 'card_name', '카드명': 'card_name',
+    'card_number': 'card_number', '카드번호': 'card_number',
+    'payment_type': 'payment_type', '결제방법': 'payment_type',
+    'installment_month': 'installment_month', '할부개월': 'installment_month', '할부': 'installment_month',
+    'approval_number': 'approval_number', '승인번호': 'approval_number',
+}
+REQUIRED_FIELDS = ('spent_at', 'merchant_name', 'amount')
+
+STATUS_ALIASES = {'PAID': 'PAID', '결제': 'PAID', '승인': 'PAID', 'CANCELLED': 'CANCELLED', '취소': 'CANCELLED', '승인취소': 'CANCELLED'}
+DATETIME_FORMATS = ('%Y%m%d%H%M%S', '%Y%m%d', '%Y.%m.%d %H:%M:%S', '%Y.%m.%d %H:%M', '%Y.%m.%d', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M', '%Y/%m/%d')
+
+
+class ImportFormatError(ValueError):
+    """파일 전체를 처리할 수 없는 형식 오류 (헤더 누락/인코딩 오류 등)"""
+
+
+class RowError(ValueError):
+    """한 행을 처리할 수 없는 오류 (해당 행만 건너뜀)"""
+
+
+def parse_datetime(value):
+    """명세서 날짜/시각 문자열 → aware datetime (시간대가 없으면 현지 시각으로 간주)"""
+    value = (value or '').strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in DATETIME_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise RowError(f"날짜 형식을 알 수 없습니다: {value!r}")
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+def parse_amount(value):
+    """금액 문자열 → 정수 (쉼표/원 표기 제거)"""
+    value = (value or '').replace(',', '').replace('원', '').strip()
+    try:
+        return int(float(value))
+    except ValueError:
+        raise RowError(f"금액 형식을 알 수 없습니다: {value!r}")
+
+
+class CardLookup:
+    """사용자 보유 카드 조회용 딕셔너리 (카드명, 카드번호 끝 4자리)"""
+
+    def __init__(self, user, default_user_card_id=None):
+        user_cards = list(UserCard.objects.filter(user=user, deleted_at__isnull=True).select_related('card'))
+        self.by_id = {uc.user_card_id: uc for uc in user_cards}
+        self.by_name = {uc.card.card_name.lower(): uc for uc in user_cards if uc.card.card_name}
+        self.by_last4 = {}
+        for uc in user_cards:
+            digits = ''.join(ch for ch in (uc.card_number or '') if ch.isdigit())
+            if len(digits) >= 4:
+                self.by_last4.setdefault(digits[-4:], uc)
+
+        if default_user_card_id is not None and default_user_card_id not in self.by_id:
+            raise ImportFormatError("user_card_id에 해당하는 보유 카드가 없습니다.")
+        self.default = self.by_id.get(default_user_card_id) or (user_cards[0] if len(user_cards) == 1 else None)
+
+    def resolve(self, card_name, card_number):
+        digits = ''.join(ch for ch in (card_number or '') if ch.isdigit())
+        user_card = (
+            (self.by_last4.get(digits[-4:]) if len(digits) >= 4 else None)
+            or self.by_name.get((card_name or '').strip().lower())
+            or self.default
+        )
+        if user_card is None:
+            raise RowError(f"보유 카드를 찾을 수 없습니다: {card_name or card_number!r}")
+        return user_card
+
+
+def _read_rows(stream):
+    """(줄 번호, {필드: 값}) 제너레이터"""
+    reader = csv.reader(stream)
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise ImportFormatError("빈 파일입니다.")
+
+    fields = [HEADER_ALIASES.get(name.strip().lstrip('﻿')) for name in header]
+    missing = [name for name in REQUIRED_FIELDS if name not in fields]
+    if missing:
+        raise ImportFormatError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield reader.line_num, {field: value for field, value in zip(fields, values) if field}
+
+
+def _build(user, row, cards, categories):
+    """한 행 → 저장 전 Expense 객체"""
+    merchant_name = (row.get('merchant_name') or '').strip()
+    if not merchant_name:
+        raise RowError("가맹점명이 비어 있습니다.")
+
+    status = STATUS_ALIASES.get((row.get('status') or 'PAID').strip().upper(), 'PAID')
+    category = categories.categories.get((row.get('category_name') or '').strip()) or categories.resolve(merchant_name)
+    installment = (row.get('installment_month') or '').strip()
+
+    return Expense(
+        user=user,
+        spent_at=parse_datetime(row.get('spent_at')),
+        merchant_name=merchant_name[:100],
+        amount=parse_amount(row.get('amount')),
+        status=status,
+        category=category,
+        user_card=cards.resolve(row.get('card_name'), row.get('card_number')),
+        payment_type=(row.get('payment_type') or '').strip()[:10] or None,
+        installment_month=parse_amount(installment) if installment else 0,
+        approval_number=(row.get('approval_number') or '').strip()[:50] or None,
+    )
+
+
+def _dedupe(user, expenses, seen_approvals, seen_keys):
+    """기존 행/파일 내 앞선 행과 중복되지 않는 Expense만 반환 (묶음당 최대 2쿼리)"""
+    approvals = {e.approval_number for e in expenses if e.approval_number}
+    if approvals:
+        seen_approvals.update(
+            Expense.objects.filter(user=user, approval_number__in=approvals).values_list('approval_number', flat=True)
+        )
+    keyless = [e for e in expenses if not e.approval_number]
+    if keyless:
+        seen_keys.update(
+            Expense.objects.filter(user=user, spent_at__in={e.spent_at for e in keyless})
+            .values_list('spent_at', 'merchant_name', 'amount')
+        )
+
+    fresh = []
+    for expense in expenses:
+        if expense.approval_number:
+            if expense.approval_number in seen_approvals:
+                continue
+            seen_approvals.add(expense.approval_number)
+        else:
+            key = (expense.spent_at, expense.merchant_name, expense.amount)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+        fresh.append(expense)
+    return fresh
+
+
+def import_csv(user, stream, default_user_card_id=None, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False):
+    """
+    CSV 명세서를 읽어 사용자의 지출 내역으로 저장
+
+    Args:
+        user: 대상 User
+        stream (TextIO): 텍스트 모드 파일 객체
+        default_user_card_id (int, optional): 카드를 찾지 못한 행에 사용할 보유 카드
+        chunk_size (int): 묶음 크기
+        dry_run (bool): True면 저장하지 않고 결과만 계산
+
+    Returns:
+        Dict: {"imported", "duplicates", "failed", "errors": [{"line", "reason"}, ...]}
+
+    Raises:
+        ImportFormatError: 헤더 누락/인코딩 오류 등으로 파일을 처리할 수 없는 경우 (아무것도 저장하지 않음)
+    """
+    cards = CardLookup(user, default_user_card_id)
+    categories = CategoryResolver()
+    result = {"imported": 0, "duplicates": 0, "failed": 0, "errors": []}
+    seen_approvals, seen_keys = set(), set()
+
+    def flush(batch):
+        fresh = _dedupe(user, batch, seen_approvals, seen_keys)
+        result["duplicates"] += len(batch) - len(fresh)
+        result["imported"] += len(fresh)
+        if fresh and not dry_run:
+            Expense.objects.bulk_create(fresh, batch_size=chunk_size)
+            # bulk_create는 시그널이 발생하지 않으므로 롤업 갱신 대상을 직접 표시
+            rollup.mark_dirty({(user.pk, timezone.localtime(e.spent_at).date()) for e in fresh})
+
+    try:
+        with transaction.atomic(), rollup.deferred():
+            batch = []
+            for line, row in _read_rows(stream):
+                try:
+                    batch.append(_build(user, row, cards, categories))
+                except RowError as e:
+                    result["failed"] += 1
+                    if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                        result["errors"].append({"line": line, "reason": str(e)})
+                    continue
+                if len(batch) >= chunk_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+    except UnicodeDecodeError:
+        raise ImportFormatError("파일 인코딩이 올바르지 않습니다. (utf-8 또는 cp949)")
+    except csv.Error as e:
+        raise ImportFormatError(f"CSV 형식 오류: {e}")
+
+    if result["imported"] and not dry_run:
+        # Codef 동기화와 같은 후처리 (마지막 처리 이후 건만)
+        subscription_detector.detect_safely(user.pk)
+        anomaly_detector.update_safely(user.pk)
+    return result
+
+
+def open_upload(binary_file, encoding='utf-8'):
+    """바이너리 파일 객체 → 줄 단위로 읽는 텍스트 스트림 (utf-8은 BOM 허용)"""
+    if encoding not in IMPORT_ENCODINGS:
+        raise ImportFormatError(f"encoding은 {', '.join(IMPORT_ENCODINGS)} 중 하나여야 합니다.")
+    return io.TextIOWrapper(binary_file, encoding='utf-8-sig' if encoding == 'utf-8' else encoding, newline='')
@@ -0,0 +1,103 @@
+"""
+카드 거래 일괄 저장 (Codef 동기화용 upsert)
+
+거래마다 update_or_create/get_or_create를 호출하면 행당 2~3번 DB를 오가므로,
+한 번의 동기화에서 받은 거래를 묶음 단위로 저장합니다.
+
+- 승인번호가 있는 거래: (사용자, 승인번호) 유니크 제약을 기준으로 bulk_create(update_conflicts=True) 한 번에 삽입/갱신
+- 승인번호가 없는 거래: (결제 시각, 가맹점명, 금액)이 같은 기존 행을 묶음당 한 번 조회해 거른 뒤 bulk_create
+
+bulk_create는 시그널이 발생하지 않으므로 바뀐 (사용자, 날짜) 버킷을 직접 롤업 갱신 대상으로 표시합니다.
+갱신된 거래는 이전 결제일 버킷도 함께 표시합니다.
+"""
+from django.db import connection
+from django.utils import timezone
+
+from .models import Expense
+from . import rollup
+
+INGEST_BATCH_SIZE = 500  # [설명] 한 번의 INSERT ... ON CONFLICT/ON DUPLICATE KEY 문에 넣는 거래 수
+UPSERT_UNIQUE_FIELDS = ['user', 'approval_number']  # [설명] Expense.Meta의 uniq_expense_user_approval과 동일
+
+
+def _unique_fields():
+    # [설명] MySQL은 충돌 대상 컬럼을 지정할 수 없고(ON DUPLICATE KEY UPDATE) 모든 유니크 키에 대해 갱신
+    return UPSERT_UNIQUE_FIELDS if connection.features.supports_update_conflicts_with_target else None
+
+
+def _local_day(spent_at):
+    return timezone.localtime(spent_at).date()
+
+
+def _upsert_approved(user_id, expenses, update_fields):
+    """승인번호가 있는 거래 upsert (조회 1 + INSERT 1)"""
+    # 같은 묶음 안에서 승인번호가 겹치면 마지막 거래만 사용 (한 문장 안의 중복 키는 DB마다 처리가 다름)
+    by_approval = {expense.approval_number: expense for expense in expenses}
+    previous_days = dict(
+        Expense.objects.filter(user_id=user_id, approval_number__in=list(by_approval))
+        .values_list('approval_number', 'spent_at')
+    )
+
+    Expense.objects.bulk_create(
+        list(by_approval.values()),
+        update_conflicts=True,
+        unique_fields=_unique_fields(),
+        update_fields=update_fields,
+    )
+
+    dirty = {(user_id, _local_day(expense.spent_at)) for expense in by_approval.values()}
+    dirty.update((user_id, _local_day(spent_at)) for spent_at in previous_days.values())
+    return len(by_approval) - len(previous_days), len(previous_days), dirty
+
+
+def _insert_unapproved(user_id, expenses):
+    """승인번호가 없는 거래 중 기존 행과 겹치지 않는 것만 삽입 (조회 1 + INSERT 1)"""
+    existing = set(
+        Expense.objects.filter(user_id=user_id, spent_at__in={expense.spent_at for expense in expenses})
+        .values_list('spent_at', 'merchant_name', 'amount')
+    )
+    fresh = []
+    for expense in expenses:
+        key = (expense.spent_at, expense.merchant_name, expense.amount)
+        if key not in existing:
+            existing.add(key)
+            fresh.append(expense)
+
+    Expense.objects.bulk_create(fresh)
+    return len(fresh), {(user_id, _local_day(expense.spent_at)) for expense in fresh}
+
+
+def upsert_expenses(user_id, expenses, update_fields, batch_size=INGEST_BATCH_SIZE):
+    """
+    거래 목록을 묶음 단위로 삽입/갱신
+
+    Args:
+        user_id (int): 사용자 PK (모든 expenses의 user와 같아야 함)
+        expenses (List[Expense]): 저장 전 Expense 객체 (approval_number가 빈 문자열이면 None으로 저장)
+        update_fields (List[str]): 승인번호가 같은 기존 거래에서 갱신할 필드
+        batch_size (int): 묶음 크기
+
+    Returns:
+        Tuple[int, int]: (새로 저장된 거래 수, 갱신된 거래 수)
+    """
+    created = updated = 0
+    dirty = set()
+    for start in range(0, len(expenses), batch_size):
+        batch = expenses[start:start + batch_size]
+        for expense in batch:
+            expense.approval_number = expense.approval_number or None
+
+        approved = [expense for expense in batch if expense.approval_number]
+        if approved:
+            batch_created, batch_updated, batch_dirty = _upsert_approved(user_id, approved, update_fields)
+            created, updated = created + batch_created, updated + batch_updated
+            dirty |= batch_dirty
+
+        unapproved = [expense for expense in batch if not expense.approval_number]
+        if unapproved:
+            batch_created, batch_dirty = _insert_unapproved(user_id, unapproved)
+            created += batch_created
+            dirty |= batch_dirty
+
+    rollup.mark_dirty(dirty)
+    return created, updated
@@ -0,0 +1,62 @@
+import base64
+import os
+import time
+
+from Crypto.Cipher import PKCS1_v1_5 as PKCS1
+from Crypto.PublicKey import RSA
+from django.core.management.base import BaseCommand, CommandError
+from codef import crypto
+
+# Connected ID 발급 요청 한 건에서 암호화하는 필드 (ID/PW + 카드 정보)
+SAMPLE_FIELDS = {
+    "password": "password1234!",
+    "identity": "9001011",
+    "phoneNo": "01012345678",
+    "cardNo": "1234567890123456",
+    "cardPassword": "12",
+}
+
+
+def _encrypt_uncached(public_key, value):
+    """매 필드마다 공개키를 디코드/파싱하던 기존 방식"""
+    cipher = PKCS1.new(RSA.importKey(base64.b64decode(public_key)))
+    return base64.b64encode(cipher.encrypt(value.encode())).decode('utf-8')
+
+
+class Command(BaseCommand):
+    help = 'Codef 요청 필드 암호화 비용을 측정합니다. (필드마다 공개키 파싱 vs 캐시된 cipher 일괄 암호화)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='측정할 요청 수 (요청당 5개 필드)')
+        parser.add_argument('--key-bits', type=int, default=2048, help='CODEF_CLIENT_PUBLIC이 없을 때 생성할 테스트 키 크기')
+
+    def handle(self, *args, **options):
+        public_key = os.getenv('CODEF_CLIENT_PUBLIC')
+        if not public_key:
+            # 실제 키가 없으면 같은 크기의 임시 키로 측정 (공개키만 사용)
+            key = RSA.generate(options['key_bits'])
+            public_key = base64.b64encode(key.publickey().export_key('DER')).decode('utf-8')
+
+        count = options['requests']
+        crypto.get_cipher.cache_clear()
+
+        started = time.perf_counter()
+        for _ in range(count):
+            for value in SAMPLE_FIELDS.values():
+                _encrypt_uncached(public_key, value)
+        uncached = (time.perf_counter() - started) / count
+
+        started = time.perf_counter()
+        for _ in range(count):
+            crypto.get_cipher(public_key).encrypt_fields(SAMPLE_FIELDS)
+        cached = (time.perf_counter() - started) / count
+
+        # 암호문 형식 확인 (PKCS#1 v1.5 암호문 길이 = 키 크기)
+        cipher = crypto.get_cipher(public_key)
+        if any(len(base64.b64decode(value)) != cipher.key.size_in_bytes() for value in cipher.encrypt_fields(SAMPLE_FIELDS).values()):
+            raise CommandError("암호문 길이가 키 크기와 다릅니다.")
+
+        self.stdout.write(f"요청 {count}건 × 필드 {len(SAMPLE_FIELDS)}개")
+        self.stdout.write(f"  필드마다 공개키 파싱: {uncached * 1000:.3f} ms/요청")
+        self.stdout.write(f"  캐시된 cipher 일괄 암호화: {cached * 1000:.3f} ms/요청")
+        self.stdout.write(self.style.SUCCESS(f"✅ 요청당 암호화 비용 {uncached / cached:.1f}배 감소"))
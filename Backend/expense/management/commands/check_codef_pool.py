@@ -0,0 +1,58 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+from codef import transport
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Codef 조회 API 대체 응답 (keep-alive 유지)"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = json.dumps({"result": {"code": "CF-00000"}, "data": []}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = '로컬 대체 HTTP 서버로 Codef 공유 연결 풀의 연결 재사용 여부를 확인합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=30, help='보낼 요청 수')
+        parser.add_argument('--threads', type=int, default=4, help='동시에 요청하는 스레드 수')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+        url = f"http://{host}:{port}/v1/kr/card/p/account/approval-list"
+
+        try:
+            with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+                statuses = list(executor.map(
+                    lambda _: transport.post(url, 'approval-list', json={}).status_code,
+                    range(options['requests']),
+                ))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        stats = transport.pool_stats().get(f"{host}:{port}")
+        if stats is None or any(code != 200 for code in statuses):
+            raise CommandError("대체 서버 요청에 실패했습니다.")
+
+        created, sent = stats['connections'], stats['requests']
+        self.stdout.write(f"요청 {sent}건 / 새 연결 {created}개 / 재사용 {sent - created}건 / 대기 연결 {stats['idle']}개")
+        if created > options['threads']:
+            raise CommandError(f"연결이 재사용되지 않았습니다. (스레드 {options['threads']}개, 새 연결 {created}개)")
+        self.stdout.write(self.style.SUCCESS('✅ 연결 풀 재사용 확인'))
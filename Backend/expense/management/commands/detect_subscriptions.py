@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from expense import subscription_detector
+
+
+class Command(BaseCommand):
+    help = '지출 내역에서 반복 결제를 찾아 구독(subscriptions)을 자동 생성/갱신합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help='대상 사용자 ID (여러 번 지정 가능, 생략 시 새 지출 내역이 있는 전체 사용자)')
+        parser.add_argument('--reset', action='store_true', help='감지 상태를 초기화하고 전체 이력을 다시 처리')
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+
+        if options['reset']:
+            for user_id in user_ids or [None]:
+                subscription_detector.reset(user_id)
+
+        if not user_ids:
+            user_ids = subscription_detector.users_with_new_expenses()
+
+        detected = 0
+        for user_id in user_ids:
+            detected += subscription_detector.detect(user_id)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 사용자 {len(user_ids)}명 처리, 구독 {detected}건 생성/갱신'))
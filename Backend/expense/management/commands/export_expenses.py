@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from expense import export as export_service
+
+
+class Command(BaseCommand):
+    help = '사용자의 지출 내역을 CSV/NDJSON으로 내보냅니다. (고객 지원용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, required=True, dest='user_id', help='대상 사용자 ID')
+        parser.add_argument('--type', choices=sorted(export_service.EXPORT_FORMATS), default='csv', help='파일 형식 (기본 csv)')
+        parser.add_argument('--from', dest='start', help='시작 날짜 YYYY-MM-DD (포함)')
+        parser.add_argument('--to', dest='end', help='종료 날짜 YYYY-MM-DD (포함)')
+        parser.add_argument('--category', help='카테고리명 필터')
+        parser.add_argument('--output', help='저장할 파일 경로 (생략 시 표준 출력)')
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.strptime(options['start'], '%Y-%m-%d').date() if options['start'] else None
+            end = datetime.strptime(options['end'], '%Y-%m-%d').date() + timedelta(days=1) if options['end'] else None
+        except ValueError:
+            raise CommandError('날짜는 YYYY-MM-DD 형식이어야 합니다.')
+
+        queryset = export_service.export_queryset(options['user_id'], start, end, options['category'])
+        lines = export_service.iter_export(queryset, options['type'])
+
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for line in lines:
+                f.write(line)
+        self.stderr.write(self.style.SUCCESS(f"✅ 지출 내역 내보내기 완료: {options['output']}"))
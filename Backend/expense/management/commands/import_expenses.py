@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from expense import importer as import_service
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'CSV 명세서를 사용자의 지출 내역으로 가져옵니다. (고객 지원용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, required=True, dest='user_id', help='대상 사용자 ID')
+        parser.add_argument('--input', help='CSV 파일 경로 (생략 시 표준 입력)')
+        parser.add_argument('--card', type=int, dest='user_card_id', help='카드를 찾지 못한 행에 사용할 보유 카드 ID')
+        parser.add_argument('--encoding', choices=import_service.IMPORT_ENCODINGS, default='utf-8', help='파일 인코딩 (기본 utf-8)')
+        parser.add_argument('--batch-size', type=int, default=import_service.IMPORT_CHUNK_SIZE, help='한 번에 처리하는 행 수')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 결과만 출력')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(pk=options['user_id'])
+        except User.DoesNotExist:
+            raise CommandError(f"사용자를 찾을 수 없습니다: {options['user_id']}")
+
+        binary = open(options['input'], 'rb') if options['input'] else sys.stdin.buffer
+        try:
+            result = import_service.import_csv(
+                user,
+                import_service.open_upload(binary, options['encoding']),
+                options['user_card_id'],
+                chunk_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+        except import_service.ImportFormatError as e:
+            raise CommandError(str(e))
+        finally:
+            if options['input']:
+                binary.close()
+
+        for error in result['errors']:
+            self.stderr.write(f"  {error['line']}행: {error['reason']}")
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {prefix}저장 {result['imported']}건, 중복 {result['duplicates']}건, 실패 {result['failed']}건"
+        ))
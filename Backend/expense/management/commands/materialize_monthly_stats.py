@@ -0,0 +1,41 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import TruncMonth
+from expense.models import Expense
+from expense import monthly_stats
+
+
+class Command(BaseCommand):
+    help = '지출 내역으로부터 월별 통계(monthly_stats)를 백필/재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help='대상 사용자 ID (여러 번 지정 가능, 생략 시 전체)')
+        parser.add_argument('--month', action='append', dest='months', help='대상 월 YYYY-MM (여러 번 지정 가능, 생략 시 지출이 있는 모든 월)')
+
+    def handle(self, *args, **options):
+        try:
+            months = [
+                (parsed.year, parsed.month)
+                for parsed in (datetime.strptime(m, '%Y-%m') for m in options['months'] or [])
+            ]
+        except ValueError:
+            raise CommandError('월은 YYYY-MM 형식이어야 합니다.')
+
+        # 지출이 있는 (사용자, 월) 조합 수집
+        expenses = Expense.objects.active()
+        if options['user_ids']:
+            expenses = expenses.filter(user_id__in=options['user_ids'])
+        pairs = expenses.annotate(month=TruncMonth('spent_at')).values_list('user_id', 'month').distinct().order_by()
+
+        targets = {}
+        for user_id, month_start in pairs:
+            key = (month_start.year, month_start.month)
+            if not months or key in months:
+                targets.setdefault(user_id, set()).add(key)
+
+        count = 0
+        for user_id, user_months in targets.items():
+            monthly_stats.refresh_months(user_id, user_months)
+            count += len(user_months)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 월별 통계 {count}건 구체화 완료'))
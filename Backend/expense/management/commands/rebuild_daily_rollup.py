@@ -0,0 +1,28 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from expense import rollup
+
+
+class Command(BaseCommand):
+    help = '원본 지출 내역(expenses)으로부터 일별 지출 롤업(daily_spendings)을 백필/재구축합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help='대상 사용자 ID (여러 번 지정 가능, 생략 시 전체)')
+        parser.add_argument('--start', help='시작 날짜 YYYY-MM-DD (포함)')
+        parser.add_argument('--end', help='종료 날짜 YYYY-MM-DD (미포함)')
+        parser.add_argument('--batch-size', type=int, default=rollup.REBUILD_BATCH_SIZE, help='bulk_create 배치 크기')
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.strptime(options['start'], '%Y-%m-%d').date() if options['start'] else None
+            end = datetime.strptime(options['end'], '%Y-%m-%d').date() if options['end'] else None
+        except ValueError:
+            raise CommandError('날짜는 YYYY-MM-DD 형식이어야 합니다.')
+
+        created = rollup.rebuild(
+            user_ids=options['user_ids'],
+            start=start,
+            end=end,
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ 일별 롤업 재구축 완료: {created}행 생성'))
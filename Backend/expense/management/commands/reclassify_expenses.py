@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from category.classifier import CategoryResolver, classify
+from expense import rollup
+from expense.models import Expense
+
+
+class Command(BaseCommand):
+    help = '카테고리가 "기타"인 지출 내역을 가맹점명 분류기로 다시 분류합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help='대상 사용자 ID (여러 번 지정 가능, 생략 시 전체)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='한 번에 읽고 갱신할 지출 건수')
+        parser.add_argument('--dry-run', action='store_true', help='변경하지 않고 재분류 건수만 출력')
+
+    def handle(self, *args, **options):
+        resolver = CategoryResolver()
+        batch_size = options['batch_size']
+
+        rows = Expense.objects.active().filter(
+            Q(category=resolver.default) | Q(category__isnull=True)
+        )
+        if options['user_ids']:
+            rows = rows.filter(user_id__in=options['user_ids'])
+        rows = rows.order_by().values_list('expense_id', 'user_id', 'spent_at', 'merchant_name')
+
+        reclassified = 0
+        # .update()는 시그널을 발생시키지 않으므로 바뀐 (사용자, 날짜) 버킷을 직접 롤업 갱신 대상으로 표시
+        with rollup.deferred():
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    reclassified += self._apply(resolver, batch, options['dry_run'])
+                    batch = []
+            if batch:
+                reclassified += self._apply(resolver, batch, options['dry_run'])
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(f'✅ {prefix}지출 {reclassified}건 재분류'))
+
+    def _apply(self, resolver, batch, dry_run):
+        by_category = {}
+        dirty = set()
+        for expense_id, user_id, spent_at, merchant_name in batch:
+            category = resolver.categories.get(classify(merchant_name))
+            if category is None or category.pk == resolver.default.pk:
+                continue
+            by_category.setdefault(category.pk, []).append(expense_id)
+            dirty.add((user_id, timezone.localtime(spent_at).date()))
+
+        if not dry_run:
+            for category_id, expense_ids in by_category.items():
+                Expense.objects.filter(expense_id__in=expense_ids).update(category_id=category_id)
+            rollup.mark_dirty(dirty)
+        return sum(len(ids) for ids in by_category.values())
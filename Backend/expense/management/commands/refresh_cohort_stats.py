@@ -0,0 +1,27 @@
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from expense import cohort
+
+
+class Command(BaseCommand):
+    help = '월별 코호트(연령대 × 성별) 지출 집계(cohort_monthly_aggregates)를 다시 계산합니다. (cron 등으로 주기 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', action='append', dest='months', help='대상 월 YYYY-MM (여러 번 지정 가능, 생략 시 이번 달과 지난 달)')
+
+    def handle(self, *args, **options):
+        months = options['months']
+        if not months:
+            now = timezone.localtime()
+            months = [now.strftime('%Y-%m'), (now - relativedelta(months=1)).strftime('%Y-%m')]
+
+        for target_month in months:
+            try:
+                parsed = datetime.strptime(target_month, '%Y-%m')
+            except ValueError:
+                raise CommandError(f'월은 YYYY-MM 형식이어야 합니다: {target_month}')
+
+            count = cohort.compute(parsed.year, parsed.month)
+            self.stdout.write(self.style.SUCCESS(f'✅ {target_month}: 코호트 {count}개 집계'))
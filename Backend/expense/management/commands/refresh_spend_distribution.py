@@ -0,0 +1,29 @@
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from expense import distribution
+
+
+class Command(BaseCommand):
+    help = '월별 전체 사용자 지출 분포(monthly_spend_distributions)를 다시 계산합니다. (cron 등으로 주기 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', action='append', dest='months', help='대상 월 YYYY-MM (여러 번 지정 가능, 생략 시 이번 달과 지난 달)')
+
+    def handle(self, *args, **options):
+        months = options['months']
+        if not months:
+            now = timezone.localtime()
+            months = [now.strftime('%Y-%m'), (now - relativedelta(months=1)).strftime('%Y-%m')]
+
+        for target_month in months:
+            try:
+                parsed = datetime.strptime(target_month, '%Y-%m')
+            except ValueError:
+                raise CommandError(f'월은 YYYY-MM 형식이어야 합니다: {target_month}')
+
+            result = distribution.compute(parsed.year, parsed.month)
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {result.target_month}: 사용자 {result.user_count}명, 평균 {round(result.mean)}원'
+            ))
@@ -0,0 +1,83 @@
+import logging
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from prometheus_client import start_http_server
+
+from codef import jobs
+
+logger = logging.getLogger(__name__)
+
+
+def _run(job):
+    # [설명] 스레드마다 DB 연결을 따로 쓰므로 작업 전후로 정리
+    close_old_connections()
+    try:
+        return jobs.run(job)
+    except Exception:
+        # 결과 기록 실패 (DB 오류 등): RUNNING으로 남은 작업은 LEASE_TIMEOUT 후 다시 대기열로
+        logger.exception(f"Sync job {job.job_id} result could not be recorded")
+        return 'error'
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Codef 동기화 작업(sync_jobs)을 가져와 실행하는 워커를 실행합니다. (SIGTERM/SIGINT 시 실행 중 작업을 마치고 종료)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=getattr(settings, 'CODEF_SYNC_WORKER_CONCURRENCY', 4),
+            help='동시에 실행할 작업 수 (워커 프로세스당)',
+        )
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='대기 작업이 없을 때 다시 조회하는 간격 (초)')
+        parser.add_argument('--once', action='store_true', help='지금 실행 가능한 작업을 모두 처리하면 종료')
+        parser.add_argument('--metrics-port', type=int, help='Prometheus 메트릭 포트 (codef_sync_jobs_total 등)')
+
+    def handle(self, *args, **options):
+        concurrency = max(options['concurrency'], 1)
+        poll_interval = options['poll_interval']
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        if options['metrics_port']:
+            start_http_server(options['metrics_port'])
+
+        stop = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stop.set())
+
+        self.stdout.write(f"Sync worker {worker_id} started (concurrency={concurrency})")
+        outcomes = {}
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='sync-job') as pool:
+            while not stop.is_set():
+                close_old_connections()
+                jobs.requeue_stale()
+                claimed = jobs.claim(worker_id, concurrency - len(running))
+                running.update(pool.submit(_run, job) for job in claimed)
+
+                if options['once'] and not running:
+                    break
+                if not claimed and not options['once'] and len(running) < concurrency:
+                    stop.wait(poll_interval)
+                # 실행 슬롯이 없으면(또는 --once에서 남은 작업만 기다릴 때) 하나가 끝날 때까지 대기
+                block = len(running) >= concurrency or (options['once'] and not claimed)
+                done, running = wait(running, timeout=poll_interval if block else 0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+            if stop.is_set():
+                self.stdout.write(f"Stopping: waiting for {len(running)} running job(s)")
+            for future in wait(running).done:
+                outcome = future.result()
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        close_old_connections()
+        summary = ', '.join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items())) or 'no jobs'
+        self.stdout.write(self.style.SUCCESS(f"✅ Sync worker {worker_id} stopped ({summary})"))
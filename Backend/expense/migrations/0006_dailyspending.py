@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 16:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('expense', '0005_expense_approval_number'),
+        ('users', '0009_user_birth_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySpending',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('total_amount', models.BigIntegerField(default=0)),
+                ('tx_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(db_column='category_id', on_delete=django.db.models.deletion.CASCADE, to='category.category')),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('user_card', models.ForeignKey(db_column='user_card_id', on_delete=django.db.models.deletion.CASCADE, to='users.usercard')),
+            ],
+            options={
+                'db_table': 'daily_spendings',
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'category', 'user_card'), name='uniq_daily_spending_bucket')],
+            },
+        ),
+    ]
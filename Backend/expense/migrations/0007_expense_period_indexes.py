@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 16:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('expense', '0006_dailyspending'),
+        ('users', '0009_user_birth_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'deleted_at', 'status', 'spent_at', 'category', 'amount'], name='expenses_user_paid_cover'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['deleted_at', 'status', 'spent_at', 'user', 'amount'], name='expenses_paid_period_cover'),
+        ),
+    ]
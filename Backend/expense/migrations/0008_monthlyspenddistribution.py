@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 16:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0007_expense_period_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlySpendDistribution',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('target_month', models.CharField(max_length=7, unique=True)),
+                ('quantiles', models.JSONField(default=list)),
+                ('user_count', models.IntegerField(default=0)),
+                ('mean', models.FloatField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('changed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'monthly_spend_distributions',
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 16:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('expense', '0008_monthlyspenddistribution'),
+        ('users', '0010_monthlystat_unique_user_month'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionScanState',
+            fields=[
+                ('user', models.OneToOneField(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_expense_id', models.BigIntegerField(default=0)),
+                ('scanned_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'subscription_scan_states',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecurringCharge',
+            fields=[
+                ('recurring_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('merchant_key', models.CharField(max_length=100)),
+                ('merchant_name', models.CharField(max_length=100)),
+                ('last_amount', models.IntegerField()),
+                ('first_charged_on', models.DateField()),
+                ('last_charged_on', models.DateField()),
+                ('streak', models.IntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(db_column='category_id', on_delete=django.db.models.deletion.CASCADE, to='category.category')),
+                ('subscription', models.ForeignKey(blank=True, db_column='subs_id', null=True, on_delete=django.db.models.deletion.SET_NULL, to='expense.subscription')),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('user_card', models.ForeignKey(db_column='user_card_id', on_delete=django.db.models.deletion.CASCADE, to='users.usercard')),
+            ],
+            options={
+                'db_table': 'recurring_charges',
+                'indexes': [models.Index(fields=['user', 'merchant_key'], name='recurring_user_merchant')],
+            },
+        ),
+    ]
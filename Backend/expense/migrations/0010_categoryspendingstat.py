@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 16:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('expense', '0009_recurringcharge'),
+        ('users', '0010_monthlystat_unique_user_month'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnomalyScanState',
+            fields=[
+                ('user', models.OneToOneField(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_expense_id', models.BigIntegerField(default=0)),
+                ('scanned_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'anomaly_scan_states',
+            },
+        ),
+        migrations.CreateModel(
+            name='CategorySpendingStat',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('observations', models.IntegerField(default=0)),
+                ('ewma_mean', models.FloatField(default=0)),
+                ('ewma_var', models.FloatField(default=0)),
+                ('anomaly_baseline', models.FloatField(blank=True, null=True)),
+                ('anomaly_score', models.FloatField(blank=True, null=True)),
+                ('anomaly_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('anomaly_expense', models.ForeignKey(blank=True, db_column='anomaly_expense_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='expense.expense')),
+                ('category', models.ForeignKey(db_column='category_id', on_delete=django.db.models.deletion.CASCADE, to='category.category')),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'category_spending_stats',
+                'indexes': [models.Index(fields=['user', 'anomaly_at'], name='spending_stat_anomaly')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'category'), name='uniq_spending_stat_user_category')],
+            },
+        ),
+    ]
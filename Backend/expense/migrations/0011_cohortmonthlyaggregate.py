@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0010_categoryspendingstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortMonthlyAggregate',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('target_month', models.CharField(max_length=7)),
+                ('age_group', models.CharField(max_length=10)),
+                ('gender', models.CharField(max_length=1)),
+                ('user_count', models.IntegerField(default=0)),
+                ('total_amount', models.BigIntegerField(default=0)),
+                ('mean', models.FloatField(default=0)),
+                ('p25', models.BigIntegerField(default=0)),
+                ('p50', models.BigIntegerField(default=0)),
+                ('p75', models.BigIntegerField(default=0)),
+                ('p90', models.BigIntegerField(default=0)),
+                ('categories', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'cohort_monthly_aggregates',
+                'constraints': [models.UniqueConstraint(fields=('target_month', 'age_group', 'gender'), name='uniq_cohort_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 16:36
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def normalize_approval_numbers(apps, schema_editor):
+    """유니크 제약 추가 전 정리: 빈 승인번호는 NULL로, 중복 승인번호는 한 행만 남기고 소프트 삭제"""
+    Expense = apps.get_model('expense', 'Expense')
+    Expense.objects.filter(approval_number='').update(approval_number=None)
+
+    duplicates = (
+        Expense.objects.filter(approval_number__isnull=False)
+        .values('user_id', 'approval_number')
+        .annotate(
+            rows=Count('expense_id'),
+            # [설명] 남길 행은 삭제되지 않은 최신 행, 모두 삭제된 경우에만 전체 최신 행
+            keep_id=Coalesce(Max('expense_id', filter=Q(deleted_at__isnull=True)), Max('expense_id')),
+        )
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates.iterator():
+        stale = Expense.objects.filter(
+            user_id=duplicate['user_id'], approval_number=duplicate['approval_number'],
+        ).exclude(expense_id=duplicate['keep_id'])
+        stale.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        stale.update(approval_number=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('expense', '0011_cohortmonthlyaggregate'),
+        ('users', '0010_monthlystat_unique_user_month'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # [설명] 중복 행을 소프트 삭제한 경우 배포 후 rebuild_daily_rollup으로 롤업을 다시 계산
+        migrations.RunPython(normalize_approval_numbers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='expense',
+            constraint=models.UniqueConstraint(fields=('user', 'approval_number'), name='uniq_expense_user_approval'),
+        ),
+    ]
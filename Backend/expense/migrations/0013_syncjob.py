@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 16:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0012_expense_unique_approval'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncJob',
+            fields=[
+                ('job_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('billing', '청구 내역'), ('approval', '승인 내역')], max_length=20)),
+                ('params', models.JSONField(default=dict)),
+                ('params_digest', models.CharField(blank=True, default='', max_length=64)),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('RUNNING', '실행 중'), ('SUCCEEDED', '완료'), ('FAILED', '실패')], default='PENDING', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('max_attempts', models.IntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_by', models.CharField(blank=True, max_length=100, null=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('running_user', models.BigIntegerField(blank=True, null=True, unique=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'sync_jobs',
+                'indexes': [models.Index(fields=['status', 'run_after'], name='sync_job_claim'), models.Index(fields=['user', 'status'], name='sync_job_user_status')],
+            },
+        ),
+    ]
@@ -1,4 +1,56 @@
+from bisect import bisect_left
+from datetime import date, datetime, time
 from django.db import models
+from django.utils import timezone
+
+
+def local_day_start(day):
+    # [설명] 현지 타임존(Asia/Seoul) 기준 해당 날짜 00:00의 aware datetime
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def month_bounds(year, month):
+    # [설명] 해당 월의 [1일, 다음 달 1일) 날짜 구간
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+# 지출 조회용 QuerySet
+# spent_at__year/__month 같은 함수 기반 조건은 타임존 변환 때문에 인덱스를 쓰지 못하므로,
+# 모든 기간 조회는 아래 헬퍼가 만드는 반열린 범위 조건(spent_at >= 시작 AND spent_at < 끝)을 사용합니다.
+# 취소(CANCELLED)된 결제는 지출이 아니므로 기간 조회 헬퍼와 일별 롤업 모두 paid() 기준으로 집계합니다.
+class ExpenseQuerySet(models.QuerySet):
+    def active(self):
+        # [설명] 소프트 삭제되지 않은 지출
+        return self.filter(deleted_at__isnull=True)
+
+    def paid(self):
+        # [설명] 지출 합계 대상 (소프트 삭제되지 않은 결제 건, 취소 제외)
+        return self.active().filter(status='PAID')
+
+    def for_range(self, user, start, end=None):
+        # [설명] [start, end) 구간의 결제 건. date는 현지 자정으로 변환, user=None이면 전체 사용자
+        if isinstance(start, date) and not isinstance(start, datetime):
+            start = local_day_start(start)
+        if isinstance(end, date) and not isinstance(end, datetime):
+            end = local_day_start(end)
+
+        queryset = self.paid().filter(spent_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(spent_at__lt=end)
+        if user is not None:
+            queryset = queryset.filter(user=user)
+        return queryset
+
+    def for_month(self, user, year, month):
+        # [설명] 해당 월의 지출
+        return self.for_range(user, *month_bounds(year, month))
+
+    def for_day(self, user, year, month, day):
+        # [설명] 해당 날짜의 지출
+        start = date(year, month, day)
+        return self.for_range(user, start, date.fromordinal(start.toordinal() + 1))
 
 
 # 소비 내역
@@ -45,14 +97,88 @@ class Expense(models.Model):
     updated_at = models.DateTimeField(auto_now=True)  # [설명] 레코드 수정 시각
     deleted_at = models.DateTimeField(null=True, blank=True)  # [설명] 소프트 삭제용
 
+    objects = ExpenseQuerySet.as_manager()  # [설명] for_month/for_day/for_range 기간 조회 헬퍼 제공
+
     class Meta:
         db_table = 'expenses'  # [설명] 실제 DB 테이블명
+        indexes = [
+            # [설명] 사용자별 기간 조회 + 카테고리 집계를 인덱스만으로 처리 (for_month/for_day/for_range)
+            # 동등 조건(user, deleted_at, status) 뒤에 범위 조건(spent_at)을 두어야 범위 스캔이 됨
+            models.Index(
+                fields=['user', 'deleted_at', 'status', 'spent_at', 'category', 'amount'],
+                name='expenses_user_paid_cover',
+            ),
+            # [설명] 전체 사용자 월별 합계(그룹 평균/백분위) 조회용
+            models.Index(
+                fields=['deleted_at', 'status', 'spent_at', 'user', 'amount'],
+                name='expenses_paid_period_cover',
+            ),
+        ]
+        constraints = [
+            # [설명] 같은 승인번호의 거래는 사용자당 한 행 (동시 동기화 중복 방지 + Codef 동기화 upsert 기준).
+            # 승인번호가 없는 거래는 NULL로 저장하며, NULL끼리는 충돌하지 않음
+            models.UniqueConstraint(fields=['user', 'approval_number'], name='uniq_expense_user_approval'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # [설명] 로드 시점의 (user, 날짜)를 기억해 두었다가 수정/삭제 시 이전 롤업 버킷도 갱신
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rollup_key = instance.rollup_key()
+        return instance
+
+    def rollup_key(self):
+        # [설명] 일별 롤업 버킷 식별자 (user_id, 현지 날짜). 날짜 정보가 없으면 None
+        if self.user_id is None or not self.spent_at:
+            return None
+        spent_at = self.spent_at
+        if timezone.is_aware(spent_at):
+            spent_at = timezone.localtime(spent_at)
+        return (self.user_id, spent_at.date())
 
     def __str__(self):
         # [설명] admin 등에서 표시될 문자열
         return f'Expense({self.expense_id}, {self.merchant_name}, {self.amount})'
 
 
+# 일별 지출 롤업 (홈 화면 집계용, Expense 변경 시 자동 갱신)
+class DailySpending(models.Model):
+    id = models.BigAutoField(primary_key=True)  # [설명] PK
+    user = models.ForeignKey(  # [설명] 지출 사용자
+        'users.User',
+        on_delete=models.CASCADE,
+        db_column='user_id',
+    )
+    day = models.DateField()  # [설명] 지출 날짜 (Asia/Seoul 기준)
+    category = models.ForeignKey(  # [설명] 지출 카테고리
+        'category.Category',
+        on_delete=models.CASCADE,
+        db_column='category_id',
+    )
+    user_card = models.ForeignKey(  # [설명] 사용한 카드
+        'users.UserCard',
+        on_delete=models.CASCADE,
+        db_column='user_card_id',
+    )
+    total_amount = models.BigIntegerField(default=0)  # [설명] 해당 버킷의 결제 금액 합계
+    tx_count = models.IntegerField(default=0)  # [설명] 해당 버킷의 결제 건수
+    updated_at = models.DateTimeField(auto_now=True)  # [설명] 마지막 갱신 시각
+
+    class Meta:
+        db_table = 'daily_spendings'  # [설명] 실제 DB 테이블명
+        constraints = [
+            # [설명] (user, day, ...) 접두 인덱스로 월 단위 범위 조회도 함께 처리
+            models.UniqueConstraint(
+                fields=['user', 'day', 'category', 'user_card'],
+                name='uniq_daily_spending_bucket',
+            ),
+        ]
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'DailySpending({self.user_id}, {self.day}, {self.total_amount})'
+
+
 # 구독 내역
 class Subscription(models.Model):
     subs_id = models.BigAutoField(primary_key=True)  # [설명] PK
@@ -85,4 +211,240 @@ class Subscription(models.Model):
 
     def __str__(self):
         # [설명] admin 등에서 표시될 문자열
-        return f'Subscription({self.subs_id}, {self.service_name}, {self.status})'
\ No newline at end of file
+        return f'Subscription({self.subs_id}, {self.service_name}, {self.status})'
+
+# 월별 전체 사용자 지출 분포 (소비 패턴 분석의 그룹 평균/백분위 계산용)
+class MonthlySpendDistribution(models.Model):
+    QUANTILE_POINTS = 1000  # [설명] 저장하는 분위수 개수 상한 (사용자 수와 무관하게 행 크기 고정)
+
+    id = models.BigAutoField(primary_key=True)  # [설명] PK
+    target_month = models.CharField(max_length=7, unique=True)  # [설명] 대상 월 (YYYY-MM)
+    quantiles = models.JSONField(default=list)  # [설명] 사용자별 월 총지출의 등간격 분위수 (오름차순, 사용자 수가 QUANTILE_POINTS 이하면 전체 값)
+    user_count = models.IntegerField(default=0)  # [설명] 지출 내역이 있는 사용자 수
+    mean = models.FloatField(default=0)  # [설명] 사용자별 월 총지출 평균
+    computed_at = models.DateTimeField()  # [설명] 마지막 계산 시각
+    changed_at = models.DateTimeField(null=True, blank=True)  # [설명] 계산 이후 해당 월 Expense가 마지막으로 바뀐 시각
+
+    class Meta:
+        db_table = 'monthly_spend_distributions'  # [설명] 실제 DB 테이블명
+
+    @classmethod
+    def quantiles_of(cls, totals):
+        # [설명] 정렬된 사용자별 총지출 → 최대 QUANTILE_POINTS개의 등간격 표본 (i번째 = 하위 i/k 지점의 값)
+        count = len(totals)
+        if count <= cls.QUANTILE_POINTS:
+            return list(totals)
+        return [totals[i * count // cls.QUANTILE_POINTS] for i in range(cls.QUANTILE_POINTS)]
+
+    def rank_of(self, amount):
+        # [설명] amount보다 적게 쓴 사용자 수 (분위수 이진 탐색, O(log k). 오차는 user_count / QUANTILE_POINTS 이내)
+        if not self.quantiles:
+            return 0
+        return round(bisect_left(self.quantiles, amount) * self.user_count / len(self.quantiles))
+
+    def percentile_of(self, amount):
+        # [설명] 백분위 (0~100, 낮을수록 적게 씀)
+        if not self.user_count:
+            return 0
+        return round((self.rank_of(amount) / self.user_count) * 100)
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'MonthlySpendDistribution({self.target_month}, {self.user_count})'
+
+
+# 월별 코호트(연령대 × 성별) 지출 집계 (소비 패턴 분석의 코호트 비교용)
+class CohortMonthlyAggregate(models.Model):
+    id = models.BigAutoField(primary_key=True)  # [설명] PK
+    target_month = models.CharField(max_length=7)  # [설명] 대상 월 (YYYY-MM)
+    age_group = models.CharField(max_length=10)  # [설명] 연령대 (예: "20대", 전체는 "전체")
+    gender = models.CharField(max_length=1)  # [설명] 성별 (M: 남성, F: 여성, A: 전체)
+    user_count = models.IntegerField(default=0)  # [설명] 지출 내역이 있는 코호트 사용자 수
+    total_amount = models.BigIntegerField(default=0)  # [설명] 코호트 월 총지출 합계
+    mean = models.FloatField(default=0)  # [설명] 사용자별 월 총지출 평균
+    p25 = models.BigIntegerField(default=0)  # [설명] 사용자별 월 총지출 25백분위
+    p50 = models.BigIntegerField(default=0)  # [설명] 사용자별 월 총지출 중앙값
+    p75 = models.BigIntegerField(default=0)  # [설명] 사용자별 월 총지출 75백분위
+    p90 = models.BigIntegerField(default=0)  # [설명] 사용자별 월 총지출 90백분위
+    categories = models.JSONField(default=dict)  # [설명] {카테고리명: {"sum", "count", "p50", "p75"}} (count/분위수는 해당 카테고리 지출자 기준)
+    computed_at = models.DateTimeField()  # [설명] 마지막 계산 시각
+
+    class Meta:
+        db_table = 'cohort_monthly_aggregates'  # [설명] 실제 DB 테이블명
+        constraints = [
+            # [설명] 코호트 조회는 이 유니크 인덱스로 한 행만 읽음
+            models.UniqueConstraint(fields=['target_month', 'age_group', 'gender'], name='uniq_cohort_month'),
+        ]
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'CohortMonthlyAggregate({self.target_month}, {self.age_group}, {self.gender}, {self.user_count})'
+
+
+# 반복 결제 후보 (구독 자동 감지 상태)
+class RecurringCharge(models.Model):
+    recurring_id = models.BigAutoField(primary_key=True)  # [설명] PK
+    user = models.ForeignKey(  # [설명] 결제를 한 사용자
+        'users.User',
+        on_delete=models.CASCADE,
+        db_column='user_id',
+    )
+    merchant_key = models.CharField(max_length=100)  # [설명] 정규화된 가맹점명 (같은 서비스 묶음 기준)
+    merchant_name = models.CharField(max_length=100)  # [설명] 최근 원본 가맹점명 (구독 서비스명으로 사용)
+    last_amount = models.IntegerField()  # [설명] 최근 결제 금액 (금액 대역 비교 기준)
+    first_charged_on = models.DateField()  # [설명] 현재 연속 주기의 첫 결제일
+    last_charged_on = models.DateField()  # [설명] 최근 결제일
+    streak = models.IntegerField(default=1)  # [설명] 월 간격으로 연속된 결제 횟수
+    category = models.ForeignKey(  # [설명] 최근 결제의 카테고리
+        'category.Category',
+        on_delete=models.CASCADE,
+        db_column='category_id',
+    )
+    user_card = models.ForeignKey(  # [설명] 최근 결제에 사용된 카드
+        'users.UserCard',
+        on_delete=models.CASCADE,
+        db_column='user_card_id',
+    )
+    subscription = models.ForeignKey(  # [설명] 감지되어 생성/갱신된 구독 (감지 전이면 NULL)
+        Subscription,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='subs_id',
+    )
+    updated_at = models.DateTimeField(auto_now=True)  # [설명] 레코드 수정 시각
+
+    class Meta:
+        db_table = 'recurring_charges'  # [설명] 실제 DB 테이블명
+        indexes = [
+            models.Index(fields=['user', 'merchant_key'], name='recurring_user_merchant'),
+        ]
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'RecurringCharge({self.merchant_key}, {self.last_amount}, x{self.streak})'
+
+
+# 구독 감지 진행 위치 (사용자별 마지막으로 처리한 Expense)
+class SubscriptionScanState(models.Model):
+    user = models.OneToOneField(  # [설명] 대상 사용자 (PK)
+        'users.User',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column='user_id',
+    )
+    last_expense_id = models.BigIntegerField(default=0)  # [설명] 마지막으로 처리한 expense_id (이후 건만 처리)
+    scanned_at = models.DateTimeField(auto_now=True)  # [설명] 마지막 처리 시각
+
+    class Meta:
+        db_table = 'subscription_scan_states'  # [설명] 실제 DB 테이블명
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'SubscriptionScanState({self.user_id}, {self.last_expense_id})'
+
+
+# 사용자/카테고리별 결제 금액 이동 통계 (지출 이상 감지 상태)
+class CategorySpendingStat(models.Model):
+    id = models.BigAutoField(primary_key=True)  # [설명] PK
+    user = models.ForeignKey(  # [설명] 대상 사용자
+        'users.User',
+        on_delete=models.CASCADE,
+        db_column='user_id',
+    )
+    category = models.ForeignKey(  # [설명] 대상 카테고리
+        'category.Category',
+        on_delete=models.CASCADE,
+        db_column='category_id',
+    )
+    observations = models.IntegerField(default=0)  # [설명] 반영된 결제 건수
+    ewma_mean = models.FloatField(default=0)  # [설명] 결제 금액 지수가중 이동평균
+    ewma_var = models.FloatField(default=0)  # [설명] 결제 금액 지수가중 이동분산
+    anomaly_expense = models.ForeignKey(  # [설명] 최근 이상 지출로 판단된 결제 (없으면 NULL)
+        Expense,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='anomaly_expense_id',
+        related_name='+',
+    )
+    anomaly_baseline = models.FloatField(null=True, blank=True)  # [설명] 이상 판단 당시 평소 결제 금액 (이동평균)
+    anomaly_score = models.FloatField(null=True, blank=True)  # [설명] 이상 판단 당시 표준점수
+    anomaly_at = models.DateTimeField(null=True, blank=True)  # [설명] 이상 지출 결제 시각
+    updated_at = models.DateTimeField(auto_now=True)  # [설명] 레코드 수정 시각
+
+    class Meta:
+        db_table = 'category_spending_stats'  # [설명] 실제 DB 테이블명
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='uniq_spending_stat_user_category'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'anomaly_at'], name='spending_stat_anomaly'),
+        ]
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'CategorySpendingStat({self.user_id}, {self.category_id}, n={self.observations})'
+
+
+# 지출 이상 감지 진행 위치 (사용자별 마지막으로 처리한 Expense)
+class AnomalyScanState(models.Model):
+    user = models.OneToOneField(  # [설명] 대상 사용자 (PK)
+        'users.User',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column='user_id',
+    )
+    last_expense_id = models.BigIntegerField(default=0)  # [설명] 마지막으로 처리한 expense_id (이후 건만 처리)
+    scanned_at = models.DateTimeField(auto_now=True)  # [설명] 마지막 처리 시각
+
+    class Meta:
+        db_table = 'anomaly_scan_states'  # [설명] 실제 DB 테이블명
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'AnomalyScanState({self.user_id}, {self.last_expense_id})'
+
+
+# Codef 동기화 백그라운드 작업 (codef.jobs 참고, run_sync_worker 커맨드가 처리)
+class SyncJob(models.Model):
+    job_id = models.BigAutoField(primary_key=True)  # [설명] PK (enqueue 응답으로 반환하는 작업 ID)
+    user = models.ForeignKey(  # [설명] 요청한 사용자
+        'users.User',
+        on_delete=models.CASCADE,
+        db_column='user_id',
+    )
+    kind = models.CharField(  # [설명] 동기화 종류 (청구 내역/승인 내역)
+        max_length=20,
+        choices=[('billing', '청구 내역'), ('approval', '승인 내역')],
+    )
+    params = models.JSONField(default=dict)  # [설명] Codef 조회 파라미터 (카드번호/생년월일은 AES 암호화, 카드 비밀번호는 Codef RSA 암호문만. 종료 시 모두 삭제)
+    params_digest = models.CharField(max_length=64, blank=True, default='')  # [설명] 평문 파라미터의 HMAC (같은 조건의 대기 작업 중복 확인용)
+    status = models.CharField(  # [설명] 작업 상태
+        max_length=20,
+        choices=[('PENDING', '대기'), ('RUNNING', '실행 중'), ('SUCCEEDED', '완료'), ('FAILED', '실패')],
+        default='PENDING',
+    )
+    attempts = models.IntegerField(default=0)  # [설명] 실행 횟수 (재시도 포함)
+    max_attempts = models.IntegerField(default=3)  # [설명] 최대 실행 횟수
+    run_after = models.DateTimeField(default=timezone.now)  # [설명] 이 시각 이후 실행 (재시도 대기)
+    locked_by = models.CharField(max_length=100, null=True, blank=True)  # [설명] 실행 중인 워커 (호스트:PID)
+    locked_at = models.DateTimeField(null=True, blank=True)  # [설명] 워커가 작업을 가져간 시각
+    running_user = models.BigIntegerField(null=True, blank=True, unique=True)  # [설명] 실행 중일 때만 user_id (유니크 → 사용자당 실행 중 작업 하나를 DB가 보장, 그 외 NULL)
+    result = models.JSONField(null=True, blank=True)  # [설명] 완료 결과 (저장 건수 등)
+    error_message = models.TextField(null=True, blank=True)  # [설명] 마지막 실패 사유
+    created_at = models.DateTimeField(auto_now_add=True)  # [설명] 요청 시각
+    updated_at = models.DateTimeField(auto_now=True)  # [설명] 레코드 수정 시각
+    finished_at = models.DateTimeField(null=True, blank=True)  # [설명] 완료/최종 실패 시각
+
+    class Meta:
+        db_table = 'sync_jobs'  # [설명] 실제 DB 테이블명
+        indexes = [
+            # [설명] 워커가 실행할 작업을 고르는 조건 (status='PENDING' AND run_after <= now)
+            models.Index(fields=['status', 'run_after'], name='sync_job_claim'),
+            models.Index(fields=['user', 'status'], name='sync_job_user_status'),
+        ]
+
+    def __str__(self):
+        # [설명] admin 등에서 표시될 문자열
+        return f'SyncJob({self.job_id}, {self.kind}, {self.status})'
@@ -0,0 +1,102 @@
+"""
+월별 통계(MonthlyStat) 구체화 모듈
+
+사용자별·월별 총지출, 예상 혜택을 users.MonthlyStat에 저장합니다.
+Expense가 바뀌면 해당 (사용자, 월)만 다시 계산하고, 보유 카드/카드 혜택이 바뀌면 예상 혜택이 달라지므로
+그 사용자의 구체화된 모든 달을 다시 계산합니다. (refresh_user, expense.signals)
+분석 API와 챗봇 컨텍스트는 이 값을 읽으므로 마감된 달은 expenses 테이블을 다시 조회하지 않습니다.
+그룹 평균(avg_group_spent)은 전체 사용자 집계라서 여기서 계산하지 않고,
+distribution.compute가 분포를 다시 계산할 때 해당 월 행들에 함께 채웁니다.
+"""
+import logging
+
+from django.db.models import Sum
+
+from cards.benefits import BenefitCalculator
+from users.models import MonthlyStat, UserCard
+from .models import Expense
+
+logger = logging.getLogger(__name__)
+
+
+def target_month_key(year, month):
+    """MonthlyStat.target_month 형식 (YYYY-MM)"""
+    return f"{year:04d}-{month:02d}"
+
+
+def estimate_benefit(user_id, expenses):
+    """
+    보유 카드 혜택 기준 예상 혜택 금액
+
+    Args:
+        user_id (int): 사용자 PK
+        expenses (QuerySet): 대상 기간의 Expense QuerySet
+    """
+    owned_card_ids = UserCard.objects.filter(user_id=user_id).values_list('card_id', flat=True)
+    return BenefitCalculator(expenses).total(owned_card_ids)
+
+
+def materialize(user_id, year, month):
+    """
+    (사용자, 월) 통계를 원본 Expense(결제 건, 취소 제외)로부터 계산하여 저장 (해당 사용자 행만 조회)
+
+    Returns:
+        MonthlyStat: 갱신된 월별 통계
+    """
+    expenses = Expense.objects.for_month(user_id, year, month)
+    total_spent = expenses.aggregate(total=Sum('amount'))['total'] or 0
+    total_benefit = estimate_benefit(user_id, expenses)
+
+    stat, _ = MonthlyStat.objects.update_or_create(
+        user_id=user_id,
+        target_month=target_month_key(year, month),
+        defaults={
+            'total_spent': total_spent,
+            'total_benefit': round(total_benefit),
+            'deleted_at': None,
+        }
+    )
+    return stat
+
+
+def refresh_months(user_id, months):
+    """Expense 변경으로 영향을 받은 (year, month) 통계들을 다시 계산"""
+    for year, month in sorted(set(months)):
+        try:
+            materialize(user_id, year, month)
+        except Exception as e:
+            logger.error(f"MonthlyStat refresh failed for user {user_id} {year}-{month}: {e}")
+
+
+def refresh_user(user_id):
+    """이미 구체화된 사용자의 모든 달 통계를 다시 계산 (보유 카드/카드 혜택 변경 시)"""
+    target_months = MonthlyStat.objects.filter(user_id=user_id, deleted_at__isnull=True).values_list('target_month', flat=True)
+    refresh_months(user_id, [tuple(map(int, target_month.split('-'))) for target_month in target_months])
+
+
+def get_stats(user, months):
+    """
+    여러 달의 통계를 한 번에 조회 (없는 달은 즉시 계산하여 저장)
+
+    Args:
+        user: User 객체 또는 PK
+        months (List[Tuple[int, int]]): [(year, month), ...]
+
+    Returns:
+        Dict[Tuple[int, int], MonthlyStat]
+    """
+    user_id = getattr(user, 'pk', user)
+    keys = {target_month_key(year, month): (year, month) for year, month in months}
+    stats = {
+        keys[stat.target_month]: stat
+        for stat in MonthlyStat.objects.filter(user_id=user_id, target_month__in=keys, deleted_at__isnull=True)
+    }
+    for year, month in months:
+        if (year, month) not in stats:
+            stats[(year, month)] = materialize(user_id, year, month)
+    return stats
+
+
+def get_stat(user, year, month):
+    """단일 월 통계 조회"""
+    return get_stats(user, [(year, month)])[(year, month)]
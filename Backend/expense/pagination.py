@@ -0,0 +1,77 @@
+"""
+지출 내역 커서(keyset) 페이지네이션
+
+(spent_at, expense_id) 내림차순을 기준으로 마지막으로 내려준 행 다음부터 조회합니다.
+OFFSET 없이 인덱스 범위 조회만 하므로 몇 번째 페이지든 비용이 같습니다.
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50  # [설명] page_size 미지정 시 기본 건수
+MAX_PAGE_SIZE = 200  # [설명] 한 페이지 최대 건수
+
+
+def encode_cursor(spent_at, expense_id):
+    """마지막 행의 (spent_at, expense_id)를 불투명한 커서 문자열로 변환"""
+    raw = f"{spent_at.isoformat()}|{expense_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    커서 문자열 해석
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        spent_at, expense_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(spent_at), int(expense_id)
+    except Exception:
+        raise ValueError("잘못된 cursor 값입니다.")
+
+
+def parse_page_size(value):
+    """
+    page_size 파라미터 해석 (MAX_PAGE_SIZE로 제한)
+
+    Raises:
+        ValueError: 정수가 아니거나 1 미만인 값
+    """
+    if value in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    page_size = int(value)
+    if page_size < 1:
+        raise ValueError("page_size는 1 이상이어야 합니다.")
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+def paginate(queryset, fields, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    최신순 keyset 페이지 조회
+
+    Args:
+        queryset (QuerySet): 필터가 적용된 Expense QuerySet
+        fields (Iterable[str]): values()로 가져올 필드 (spent_at, expense_id는 자동 포함)
+        cursor (str, optional): 이전 응답의 next_cursor
+        page_size (int): 페이지 크기
+
+    Returns:
+        Tuple[List[Dict], Optional[str]]: (행 목록, 다음 페이지 커서 또는 None)
+    """
+    if cursor:
+        spent_at, expense_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(spent_at__lt=spent_at) | Q(spent_at=spent_at, expense_id__lt=expense_id)
+        )
+
+    fields = list(dict.fromkeys(['expense_id', 'spent_at', *fields]))
+    rows = list(queryset.order_by('-spent_at', '-expense_id').values(*fields)[:page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1]['spent_at'], rows[-1]['expense_id'])
+    return rows, next_cursor
@@ -0,0 +1,130 @@
+"""
+사용자별 버전 기반 응답 캐시 / 조건부 GET (ETag)
+
+분석/홈 API 응답은 사용자의 지출·구독·카드가 바뀌기 전까지 동일하므로, 사용자별 버전 번호를
+캐시 키에 포함해 저장합니다. 데이터가 바뀌면 버전만 올리면 되고(bump_version), 이전 버전의
+응답은 더 이상 조회되지 않다가 TTL이 지나면 사라집니다.
+
+- 지출: 일별 롤업 갱신이 끝난 시점(rollup._flush)에 사용자별로 한 번 올림 (Codef 일괄 동기화 포함)
+- 구독/보유 카드: 저장/삭제 시그널에서 올림
+
+응답은 프로세스별 캐시(default)에 두지만, 버전은 웹/동기화 워커가 함께 보는 공유 캐시(shared)에 둡니다.
+워커가 저장한 지출도 웹 프로세스의 다음 요청부터 새 버전으로 조회되어 이전 응답/ETag가 쓰이지 않습니다.
+
+ETag는 캐시 키(버전 + 쿼리 파라미터 + 오늘 날짜)로 만들어 응답 본문 없이도 계산됩니다. 클라이언트가
+If-None-Match로 같은 값을 보내면 프로세스 캐시가 비어 있어도(다른 워커, 재시작, 축출) 뷰를 실행하지 않고 304를 반환합니다.
+"""
+import functools
+import hashlib
+import logging
+import uuid
+
+from django.core.cache import cache, caches
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from prometheus_client import Counter
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TIMEOUT = 60 * 10  # [설명] 응답 캐시 유지 시간 (초). "오늘" 기준 값이 있는 응답도 있어 길게 두지 않음
+
+response_cache_requests = Counter(
+    'response_cache_requests_total',
+    '사용자별 응답 캐시 조회 결과',
+    ['view', 'result'],  # result: hit | miss | not_modified
+)
+
+
+def _version_key(user_id):
+    return f"user_data_version:{user_id}"
+
+
+def _new_version():
+    # [설명] 증가 대신 매번 겹치지 않는 값으로 교체 (공유 캐시의 incr은 원자적이지 않아 동시 변경 시 같은 번호가 나올 수 있음)
+    return uuid.uuid4().hex
+
+
+def get_version(user_id):
+    """사용자 데이터 버전 (공유 캐시)"""
+    shared = caches['shared']
+    key = _version_key(user_id)
+    version = shared.get(key)
+    if version is None:
+        shared.add(key, _new_version(), timeout=None)
+        version = shared.get(key)
+    return version
+
+
+def bump_version(user_id):
+    """사용자 데이터가 바뀌었음을 표시 (이전 버전의 캐시 응답은 모든 프로세스에서 무효)"""
+    try:
+        caches['shared'].set(_version_key(user_id), _new_version(), timeout=None)
+    except Exception as e:
+        logger.error(f"Response cache version bump failed for user {user_id}: {e}")
+
+
+def cache_key(view_name, request):
+    """(뷰, 사용자, 버전, 오늘 날짜, 쿼리 파라미터) 기준 캐시 키"""
+    params = sorted((key, tuple(request.query_params.getlist(key))) for key in request.query_params)
+    digest = hashlib.md5(repr(params).encode()).hexdigest()
+    # [설명] "오늘" 기준 값(비교 기준일, 예측, 구독 D-day)이 있으므로 날짜가 바뀌면 다른 키/ETag
+    today = timezone.localdate().isoformat()
+    return f"response:{view_name}:{request.user.pk}:v{get_version(request.user.pk)}:{today}:{digest}"
+
+
+def make_etag(key):
+    """캐시 키 기준 ETag (같은 버전/파라미터/날짜면 모든 프로세스에서 같은 값)"""
+    return f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+
+def _not_modified(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    # [설명] If-None-Match는 약한 비교 (nginx gzip 시 ETag 앞에 W/가 붙음)
+    etags = {value.removeprefix('W/') for value in parse_etags(if_none_match)}
+    return '*' in etags or etag in etags
+
+
+def _finalize(response, etag):
+    response['ETag'] = etag
+    # [설명] 사용자별 응답이므로 공유 캐시 저장 금지, 클라이언트는 매번 ETag로 재검증
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def cached_response(view_name, timeout=RESPONSE_CACHE_TIMEOUT):
+    """
+    APIView.get 응답 캐시 + 조건부 GET 데코레이터 (200 응답만 저장)
+
+    If-None-Match가 캐시 키로 만든 ETag와 같으면 공유 캐시의 버전 조회 한 번으로 304를 반환하므로,
+    프로세스 캐시에 응답이 없어도 집계 쿼리를 실행하지 않습니다.
+
+    Args:
+        view_name (str): 캐시 키/메트릭 라벨에 사용할 뷰 이름
+        timeout (int): 캐시 유지 시간 (초)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = cache_key(view_name, request)
+            etag = make_etag(key)
+            if _not_modified(request, etag):
+                response_cache_requests.labels(view=view_name, result='not_modified').inc()
+                return _finalize(Response(status=304), etag)
+
+            data = cache.get(key)
+            if data is not None:
+                response_cache_requests.labels(view=view_name, result='hit').inc()
+                return _finalize(Response(data, status=200), etag)
+
+            response_cache_requests.labels(view=view_name, result='miss').inc()
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, timeout=timeout)
+            return _finalize(response, etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,298 @@
+"""
+일별 지출 롤업(DailySpending) 관리 모듈
+
+Expense가 추가/수정/소프트 삭제/취소될 때마다 영향을 받은 (user, 날짜) 버킷만
+원본 테이블에서 다시 집계해 교체합니다. 홈 화면 API는 원본 Expense 대신
+이 롤업을 읽으므로 한 달 조회 비용이 거래 건수와 무관하게 최대 31×k 행으로 고정됩니다.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from calendar import monthrange
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Sum, Count, Q, F, Window
+from django.db.models.functions import TruncDate, TruncMonth
+
+from .models import Expense, DailySpending, local_day_start, month_bounds
+from . import distribution, monthly_stats, response_cache
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 1000  # [설명] 재구축 시 bulk_create 배치 크기
+
+_state = threading.local()
+
+
+def _day_runs(days):
+    """정렬된 날짜 목록을 연속 구간 [(start, end_exclusive), ...] 으로 묶습니다."""
+    runs = []
+    for day in days:
+        if runs and runs[-1][1] == day:
+            runs[-1][1] = day + timedelta(days=1)
+        else:
+            runs.append([day, day + timedelta(days=1)])
+    return runs
+
+
+def _aggregate(user_id, runs):
+    """주어진 날짜 구간들에 대해 원본 Expense를 (날짜, 카테고리, 카드) 단위로 집계"""
+    window = Q()
+    for start, end in runs:
+        window |= Q(spent_at__gte=local_day_start(start), spent_at__lt=local_day_start(end))
+
+    return (
+        Expense.objects.paid().filter(window, user_id=user_id)
+        .annotate(day=TruncDate('spent_at'))
+        .values('day', 'category_id', 'user_card_id')
+        .annotate(total_amount=Sum('amount'), tx_count=Count('expense_id'))
+        .order_by()
+    )
+
+
+def refresh_days(user_id, days):
+    """
+    특정 사용자의 날짜 버킷들을 원본 Expense 기준으로 다시 계산하여 교체
+
+    Args:
+        user_id (int): 사용자 PK
+        days (Iterable[date]): 갱신할 날짜 목록 (Asia/Seoul 기준)
+    """
+    days = sorted(set(days))
+    if not days:
+        return
+
+    rows = list(_aggregate(user_id, _day_runs(days)))
+    with transaction.atomic():
+        DailySpending.objects.filter(user_id=user_id, day__in=days).delete()
+        DailySpending.objects.bulk_create([DailySpending(user_id=user_id, **row) for row in rows])
+
+
+def _flush(pending):
+    changed_months = set()
+    for user_id, days in pending.items():
+        try:
+            refresh_days(user_id, days)
+        except Exception as e:
+            logger.error(f"Daily rollup refresh failed for user {user_id}: {e}")
+        # 같은 변경으로 영향을 받은 월별 통계(MonthlyStat)도 함께 갱신
+        months = {(day.year, day.month) for day in days}
+        monthly_stats.refresh_months(user_id, months)
+        changed_months |= months
+        # 집계가 모두 끝난 뒤 응답 캐시 무효화 (deferred 블록이면 사용자당 한 번)
+        response_cache.bump_version(user_id)
+    # 전체 사용자 분포는 여기서 다시 계산하지 않고 표시만 (다음 조회 때 재계산)
+    try:
+        distribution.mark_changed(changed_months)
+    except Exception as e:
+        logger.error(f"Spend distribution invalidation failed for {sorted(changed_months)}: {e}")
+
+
+def mark_dirty(keys):
+    """
+    (user_id, date) 버킷을 갱신 대상으로 표시
+
+    deferred() 블록 안이면 모아 두었다가 블록 종료 시 한 번에 처리하고,
+    그 밖에서는 즉시 갱신합니다.
+    """
+    pending = {}
+    for user_id, day in keys:
+        pending.setdefault(user_id, set()).add(day)
+
+    batch = getattr(_state, 'pending', None)
+    if batch is not None:
+        for user_id, days in pending.items():
+            batch.setdefault(user_id, set()).update(days)
+        return
+    _flush(pending)
+
+
+@contextmanager
+def deferred():
+    """
+    블록 안에서 발생한 롤업 갱신을 모았다가 블록이 끝날 때 사용자/날짜별로 한 번만 수행
+
+    Codef 동기화처럼 한 요청에서 수백 건의 Expense를 저장할 때 사용합니다.
+    """
+    if getattr(_state, 'pending', None) is not None:
+        # 중첩 호출 시 바깥 블록에서 일괄 처리
+        yield
+        return
+
+    _state.pending = {}
+    try:
+        yield
+    finally:
+        pending, _state.pending = _state.pending, None
+        _flush(pending)
+
+
+def rebuild(user_ids=None, start=None, end=None, batch_size=REBUILD_BATCH_SIZE):
+    """
+    원본 Expense로부터 롤업을 재구축 (백필/복구용)
+
+    Args:
+        user_ids (Iterable[int], optional): 대상 사용자 (없으면 지출 내역이 있는 전체 사용자)
+        start (date, optional): 시작 날짜 (포함)
+        end (date, optional): 종료 날짜 (미포함)
+        batch_size (int): bulk_create 배치 크기
+
+    Returns:
+        int: 생성된 롤업 행 수
+    """
+    if user_ids is None:
+        user_ids = Expense.objects.order_by().values_list('user_id', flat=True).distinct()
+
+    created = 0
+    for user_id in user_ids:
+        expenses = Expense.objects.paid().filter(user_id=user_id)
+        rollups = DailySpending.objects.filter(user_id=user_id)
+        if start:
+            expenses = expenses.filter(spent_at__gte=local_day_start(start))
+            rollups = rollups.filter(day__gte=start)
+        if end:
+            expenses = expenses.filter(spent_at__lt=local_day_start(end))
+            rollups = rollups.filter(day__lt=end)
+
+        rows = (
+            expenses.annotate(day=TruncDate('spent_at'))
+            .values('day', 'category_id', 'user_card_id')
+            .annotate(total_amount=Sum('amount'), tx_count=Count('expense_id'))
+            .order_by()
+        )
+        with transaction.atomic():
+            rollups.delete()
+            objs = [DailySpending(user_id=user_id, **row) for row in rows]
+            DailySpending.objects.bulk_create(objs, batch_size=batch_size)
+        created += len(objs)
+
+    return created
+
+
+# ==================== 조회 헬퍼 ====================
+
+def month_rollups(user, year, month):
+    """해당 월의 롤업 QuerySet (user, day 접두 인덱스 범위 조회)"""
+    start, end = month_bounds(year, month)
+    return DailySpending.objects.filter(user=user, day__gte=start, day__lt=end)
+
+
+def running_totals(user, year, month, last_day=None):
+    """
+    해당 월 1일~last_day의 일별 합계와 누적 합계 (DB 윈도 함수로 계산)
+
+    롤업은 (날짜, 카테고리, 카드)별 행이므로 날짜 파티션 합계와 날짜 순 누적 합계
+    (같은 날짜 행은 RANGE 프레임의 동료 행으로 함께 포함)를 구한 뒤 DISTINCT로 날짜당 한 행만 받습니다.
+
+    Returns:
+        QuerySet: [{"day": date, "daily": int, "running": int}, ...] (지출 있는 날짜만, 최대 31행)
+    """
+    rollups = month_rollups(user, year, month)
+    if last_day is not None:
+        start, _ = month_bounds(year, month)
+        rollups = rollups.filter(day__lt=start + timedelta(days=last_day))
+
+    return (
+        rollups.annotate(
+            daily=Window(Sum('total_amount'), partition_by=F('day')),
+            running=Window(Sum('total_amount'), order_by=F('day').asc()),
+        )
+        .values('day', 'daily', 'running')
+        .distinct()
+        .order_by('day')
+    )
+
+
+def fill_day_series(points, last_day):
+    """
+    지출 있는 날짜의 (합계, 누적)을 1일~last_day의 조밀한 시계열로 변환
+
+    Args:
+        points (Dict[int, Tuple[int, int]]): {일: (일별 합계, 누적 합계)}
+        last_day (int): 마지막 일 (말일보다 크면 말일 이후는 누적 유지)
+
+    Returns:
+        List[Dict]: [{"day": 일, "amount": 일별 합계, "cumulative": 누적 합계}, ...] (지출 없는 날은 0)
+    """
+    series = []
+    cumulative = 0
+    for day in range(1, last_day + 1):
+        amount, cumulative = points.get(day, (0, cumulative))
+        series.append({"day": day, "amount": amount, "cumulative": cumulative})
+    return series
+
+
+def day_series(user, year, month, last_day=None):
+    """
+    해당 월의 조밀한 일별 시계열 (홈 화면 차트 공통)
+
+    Args:
+        last_day (int, optional): 마지막 일 (기본 말일)
+    """
+    last_day = last_day or monthrange(year, month)[1]
+    points = {row['day'].day: (row['daily'], row['running']) for row in running_totals(user, year, month, last_day)}
+    return fill_day_series(points, last_day)
+
+
+def month_total(user, year, month):
+    """해당 월의 총 지출"""
+    return month_rollups(user, year, month).aggregate(total=Sum('total_amount'))['total'] or 0
+
+
+def month_category_totals(user, year, month):
+    """
+    해당 월의 카테고리별 지출 합계 (카테고리 요약 위젯용)
+
+    Returns:
+        Dict[str, int]: {카테고리명: 합계}
+    """
+    rows = month_rollups(user, year, month).values('category__category_name').annotate(total=Sum('total_amount'))
+    return {row['category__category_name']: row['total'] for row in rows.order_by()}
+
+
+def daily_category_totals(user, start, end):
+    """
+    기간 내 일별·카테고리별 지출 합계 (대시보드용 단일 쿼리)
+
+    Args:
+        start (date): 시작 날짜 (포함)
+        end (date): 종료 날짜 (포함)
+
+    Returns:
+        QuerySet: [{"day": date, "category__category_name": str, "total": int}, ...]
+    """
+    return (
+        DailySpending.objects.filter(user=user, day__gte=start, day__lte=end)
+        .values('day', 'category__category_name')
+        .annotate(total=Sum('total_amount'))
+        .order_by()
+    )
+
+
+TREND_GROUP_FIELDS = {
+    'none': (),
+    'category': ('category_id', 'category__category_name'),
+    'card': ('user_card_id', 'user_card__card__card_name'),
+}
+
+
+def monthly_trend(user, start, end, group='none'):
+    """
+    기간 내 월별 지출 합계 (단일 GROUP BY 쿼리)
+
+    Args:
+        start (date): 시작 월의 1일 (포함)
+        end (date): 종료 월 다음 달의 1일 (미포함)
+        group (str): 'none' | 'category' | 'card'
+
+    Returns:
+        QuerySet: [{"month": date, (그룹 키/이름), "total": int}, ...]
+    """
+    return (
+        DailySpending.objects.filter(user=user, day__gte=start, day__lt=end)
+        .annotate(month=TruncMonth('day'))
+        .values('month', *TREND_GROUP_FIELDS[group])
+        .annotate(total=Sum('total_amount'))
+        .order_by('month')
+    )
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from .models import SyncJob
+
 
 # 카테고리 매핑 (이모지, 색상, 영문명)
 CATEGORY_MAPPING = {
@@ -65,6 +67,11 @@ class CategoryDataSerializer(serializers.Serializer):
     color = serializers.CharField()
 
 
+class CategorySummarySerializer(serializers.Serializer):
+    """카테고리별 요약 목록"""
+    categories = CategoryDataSerializer(many=True)
+
+
 class MonthComparisonSerializer(serializers.Serializer):
     """월간 비교 데이터"""
     thisMonthTotal = serializers.IntegerField()
@@ -73,6 +80,40 @@ class MonthComparisonSerializer(serializers.Serializer):
     lastMonthData = DailyAccumulatedSerializer(many=True)
 
 
+class TrendSeriesSerializer(serializers.Serializer):
+    """월별 추이 그룹별 시계열"""
+    id = serializers.IntegerField(allow_null=True)  # 카테고리 ID 또는 사용자 카드 ID
+    name = serializers.CharField()
+    amounts = serializers.ListField(child=serializers.IntegerField())  # months 순서와 동일
+    total = serializers.IntegerField()
+
+
+class TrendSerializer(serializers.Serializer):
+    """월별 지출 추이"""
+    group = serializers.CharField()  # none | category | card
+    months = serializers.ListField(child=serializers.CharField())  # YYYY-MM
+    totals = serializers.ListField(child=serializers.IntegerField())  # 월별 전체 합계
+    series = TrendSeriesSerializer(many=True)
+
+
+class SpendingAnomalySerializer(serializers.Serializer):
+    """카테고리별 이상 지출"""
+    category_id = serializers.IntegerField()
+    category_name = serializers.CharField()
+    expense_id = serializers.IntegerField()
+    merchant_name = serializers.CharField()
+    amount = serializers.IntegerField()
+    usual_amount = serializers.IntegerField()  # 평소 결제 금액 (이동평균)
+    score = serializers.FloatField()  # 표준점수
+    spent_at = serializers.DateTimeField()
+
+
+class SpendingAnomalyListSerializer(serializers.Serializer):
+    """이상 지출 목록"""
+    days = serializers.IntegerField()  # 조회 기간 (일)
+    anomalies = SpendingAnomalySerializer(many=True)
+
+
 class CategoryDetailTransactionSerializer(serializers.Serializer):
     """카테고리별 개별 거래 내역"""
     expense_id = serializers.IntegerField()
@@ -88,5 +129,53 @@ class CategoryDetailSerializer(serializers.Serializer):
     emoji = serializers.CharField()
     color = serializers.CharField()
     total_amount = serializers.IntegerField()
-    transaction_count = serializers.IntegerField()
-    transactions = CategoryDetailTransactionSerializer(many=True)
+    transaction_count = serializers.IntegerField()  # 월 전체 건수
+    transactions = CategoryDetailTransactionSerializer(many=True)  # 현재 페이지
+    next_cursor = serializers.CharField(allow_null=True)  # 다음 페이지 커서 (마지막 페이지면 null)
+
+
+class ForecastAmountSerializer(serializers.Serializer):
+    """월말 예측 금액"""
+    spent = serializers.IntegerField()  # 기준일까지 실제 지출
+    forecast = serializers.IntegerField()  # 월말 예상 지출
+    lower = serializers.IntegerField()  # 신뢰 구간 하한
+    upper = serializers.IntegerField()  # 신뢰 구간 상한
+
+
+class CategoryForecastSerializer(ForecastAmountSerializer):
+    """카테고리별 월말 예측"""
+    name = serializers.CharField()
+    emoji = serializers.CharField()
+    color = serializers.CharField()
+
+
+class ForecastSerializer(serializers.Serializer):
+    """월말 지출 예측"""
+    asOf = serializers.CharField()  # 기준일 (YYYY-MM-DD)
+    daysInMonth = serializers.IntegerField()
+    remainingDays = serializers.IntegerField()  # 예측 대상 남은 일수
+    confidence = serializers.FloatField()  # 신뢰 구간 수준
+    total = ForecastAmountSerializer()
+    categories = CategoryForecastSerializer(many=True)
+
+
+class DashboardSerializer(serializers.Serializer):
+    """홈 대시보드 (모든 위젯 통합)"""
+    accumulated = AccumulatedDataSerializer()
+    dailySummary = DailySummarySerializer()
+    weeklyAverage = WeeklyDataSerializer()
+    monthlyAverage = MonthlyDataSerializer()
+    categorySummary = CategorySummarySerializer()
+    monthComparison = MonthComparisonSerializer()
+    forecast = ForecastSerializer()
+
+
+class SyncJobSerializer(serializers.ModelSerializer):
+    """Codef 동기화 작업 상태 (조회 파라미터는 카드 정보가 있어 제외)"""
+
+    class Meta:
+        model = SyncJob
+        fields = [
+            'job_id', 'kind', 'status', 'attempts', 'max_attempts', 'run_after',
+            'result', 'error_message', 'created_at', 'finished_at',
+        ]
@@ -0,0 +1,55 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from cards.models import CardBenefit
+from users.models import UserCard
+from . import monthly_stats, rollup, response_cache
+from .models import Expense, Subscription
+
+
+# Expense 저장 시 일별 롤업·월별 통계 갱신 (추가/수정/소프트 삭제/취소 모두 save()를 거침)
+@receiver(post_save, sender=Expense)
+def refresh_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:  # [설명] loaddata 등 fixture 적재 시에는 rebuild_daily_rollup 명령으로 별도 처리
+        return
+    keys = {instance.rollup_key(), getattr(instance, '_loaded_rollup_key', None)} - {None}
+    rollup.mark_dirty(keys)
+    instance._loaded_rollup_key = instance.rollup_key()
+
+
+# Expense 하드 삭제 시 일별 롤업·월별 통계 갱신
+@receiver(post_delete, sender=Expense)
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    keys = {instance.rollup_key(), getattr(instance, '_loaded_rollup_key', None)} - {None}
+    rollup.mark_dirty(keys)
+
+
+# 구독 변경 시 해당 사용자의 응답 캐시 무효화
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_response_cache(sender, instance, raw=False, **kwargs):
+    if raw or instance.user_id is None:
+        return
+    response_cache.bump_version(instance.user_id)
+
+
+# 보유 카드 변경 시 월별 통계의 예상 혜택(보유 카드 기준)을 다시 계산한 뒤 응답 캐시 무효화
+@receiver(post_save, sender=UserCard)
+@receiver(post_delete, sender=UserCard)
+def refresh_benefit_on_user_card_change(sender, instance, raw=False, **kwargs):
+    if raw or instance.user_id is None:
+        return
+    monthly_stats.refresh_user(instance.user_id)
+    response_cache.bump_version(instance.user_id)
+
+
+# 카드 혜택 변경 시 그 카드를 보유한 사용자들의 예상 혜택 재계산 (관리자 작업이라 드묾)
+@receiver(post_save, sender=CardBenefit)
+@receiver(post_delete, sender=CardBenefit)
+def refresh_benefit_on_card_benefit_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    user_ids = UserCard.objects.filter(card_id=instance.card_id).values_list('user_id', flat=True).distinct()
+    for user_id in user_ids:
+        monthly_stats.refresh_user(user_id)
+        response_cache.bump_version(user_id)
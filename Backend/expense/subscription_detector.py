@@ -0,0 +1,225 @@
+"""
+지출 내역 기반 구독 자동 감지
+
+사용자의 결제를 (정규화된 가맹점명, 금액 대역)으로 묶고, 약 한 달 간격으로 연속된 결제가
+MIN_STREAK번 이상이면 구독으로 보고 Subscription을 생성/갱신합니다.
+
+묶음별 상태(최근 결제일/금액/연속 횟수)는 RecurringCharge에, 사용자별 처리 위치는
+SubscriptionScanState에 저장하므로 매 실행마다 마지막 처리 이후의 Expense만 읽습니다.
+Codef 동기화 직후 호출해도 사용자당 쿼리 수가 일정합니다.
+"""
+import logging
+import re
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Expense, Subscription, RecurringCharge, SubscriptionScanState
+from . import response_cache
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL_DAYS = 25  # [설명] 월 결제로 인정하는 최소 간격 (일)
+MAX_INTERVAL_DAYS = 35  # [설명] 월 결제로 인정하는 최대 간격 (일)
+MIN_STREAK = 3  # [설명] 구독으로 판단하는 최소 연속 결제 횟수
+AMOUNT_TOLERANCE = 0.15  # [설명] 같은 금액 대역으로 보는 최근 금액 대비 차이 비율 (통신비 등 변동 고려)
+STALE_AFTER_DAYS = 45  # [설명] 마지막 결제 후 이 기간 동안 결제가 없으면 구독 해지로 표시
+
+_CORPORATE_MARKS = re.compile(r'\(주\)|㈜|주식회사|\(유\)|유한회사')
+_NON_WORD = re.compile(r'[^0-9a-z가-힣]')
+_TRAILING_DIGITS = re.compile(r'\d+$')
+
+
+def normalize_merchant(name):
+    """
+    가맹점명 정규화 (법인 표기/공백/기호/끝 숫자 제거, 소문자)
+
+    예: "NETFLIX.COM", "넷플릭스(주)", "Netflix 1234" -> "netflixcom", "넷플릭스", "netflix"
+    """
+    name = _CORPORATE_MARKS.sub('', (name or '').lower())
+    name = _NON_WORD.sub('', name)
+    return _TRAILING_DIGITS.sub('', name) or name
+
+
+def _in_band(candidate, amount):
+    return abs(amount - candidate.last_amount) <= candidate.last_amount * AMOUNT_TOLERANCE
+
+
+def _advance(candidate, row, day):
+    """후보에 새 결제를 반영 (월 간격이면 연속 횟수 증가, 아니면 새 주기 시작)"""
+    gap = (day - candidate.last_charged_on).days
+    if MIN_INTERVAL_DAYS <= gap <= MAX_INTERVAL_DAYS:
+        candidate.streak += 1
+    else:
+        candidate.streak = 1
+        candidate.first_charged_on = day
+
+    candidate.last_charged_on = day
+    candidate.last_amount = row['amount']
+    candidate.merchant_name = row['merchant_name'][:100]
+    candidate.category_id = row['category_id']
+    candidate.user_card_id = row['user_card_id']
+    candidate.updated_at = timezone.now()  # [설명] bulk_update는 auto_now를 적용하지 않음
+
+
+def _sync_subscription(candidate):
+    """
+    감지된 후보를 Subscription에 반영
+
+    Returns:
+        bool: 기존 구독을 update()로 갱신했는지 여부 (시그널이 발생하지 않으므로 캐시 무효화 필요)
+    """
+    next_billing = candidate.last_charged_on + relativedelta(months=1)
+    if not candidate.subscription_id:
+        # 같은 이름의 기존 구독(수동 등록/상태 초기화 이전 감지분)이 있으면 새로 만들지 않고 연결
+        candidate.subscription = (
+            Subscription.objects.filter(user_id=candidate.user_id, service_name=candidate.merchant_name)
+            .order_by('-subs_id').first()
+        )
+
+    if candidate.subscription_id:
+        # 사용자가 삭제한 구독은 되살리지 않음
+        Subscription.objects.filter(subs_id=candidate.subscription_id, deleted_at__isnull=True).update(
+            monthly_fee=candidate.last_amount,
+            next_billing=next_billing,
+            user_card_id=candidate.user_card_id,
+            status='ACTIVE',
+            updated_at=timezone.now(),
+        )
+        return True
+
+    candidate.subscription = Subscription.objects.create(
+        user_id=candidate.user_id,
+        service_name=candidate.merchant_name,
+        monthly_fee=candidate.last_amount,
+        next_billing=next_billing,
+        user_card_id=candidate.user_card_id,
+        category_id=candidate.category_id,
+    )
+    return False
+
+
+def _process(user_id, rows):
+    """
+    새 결제들을 후보에 반영하고 연속 횟수를 넘은 후보를 구독으로 저장
+
+    Returns:
+        Tuple[int, bool]: (감지된 구독 수, 기존 구독을 update()로 갱신했는지 여부)
+    """
+    if not rows:
+        return 0, False
+
+    keyed = [(normalize_merchant(row['merchant_name']), row) for row in rows]
+    candidates = {}
+    for candidate in RecurringCharge.objects.filter(
+        user_id=user_id, merchant_key__in={key for key, _ in keyed if key}
+    ):
+        candidates.setdefault(candidate.merchant_key, []).append(candidate)
+
+    touched = {}
+    for key, row in keyed:
+        if not key or row['status'] != 'PAID' or row['amount'] <= 0:
+            continue
+        day = timezone.localtime(row['spent_at']).date()
+
+        candidate = next((c for c in candidates.get(key, []) if _in_band(c, row['amount'])), None)
+        if candidate is None:
+            candidate = RecurringCharge(
+                user_id=user_id, merchant_key=key, merchant_name=row['merchant_name'][:100],
+                last_amount=row['amount'], first_charged_on=day, last_charged_on=day,
+                category_id=row['category_id'], user_card_id=row['user_card_id'],
+            )
+            candidates.setdefault(key, []).append(candidate)
+        elif day < candidate.last_charged_on:
+            # 이미 반영된 결제보다 과거 결제 (이력 보충분)는 주기 판단에 쓰지 않음
+            continue
+        else:
+            _advance(candidate, row, day)
+        touched[id(candidate)] = candidate
+
+    detected = 0
+    updated_existing = False
+    for candidate in touched.values():
+        # 이미 구독으로 확정된 후보는 한 달을 건너뛰어도 계속 갱신
+        if candidate.streak >= MIN_STREAK or candidate.subscription_id:
+            updated_existing |= _sync_subscription(candidate)
+            detected += 1
+
+    RecurringCharge.objects.bulk_create([c for c in touched.values() if c.pk is None])
+    RecurringCharge.objects.bulk_update(
+        [c for c in touched.values() if c.pk is not None],
+        ['merchant_name', 'last_amount', 'first_charged_on', 'last_charged_on', 'streak',
+         'category', 'user_card', 'subscription', 'updated_at'],
+    )
+    return detected, updated_existing
+
+
+def detect(user_id):
+    """
+    마지막 처리 이후의 Expense로 사용자의 구독을 감지/갱신
+
+    Args:
+        user_id (int): 사용자 PK
+
+    Returns:
+        int: 새로 생성되거나 갱신된 구독 수
+    """
+    with transaction.atomic():
+        state, _ = SubscriptionScanState.objects.select_for_update().get_or_create(user_id=user_id)
+
+        rows = list(
+            Expense.objects.active()
+            .filter(user_id=user_id, expense_id__gt=state.last_expense_id)
+            .order_by('spent_at', 'expense_id')
+            .values('expense_id', 'merchant_name', 'amount', 'status', 'spent_at', 'category_id', 'user_card_id')
+        )
+        detected, updated_existing = _process(user_id, rows)
+
+        # 한동안 결제가 없는 감지 구독은 해지로 표시
+        stale_ids = RecurringCharge.objects.filter(
+            user_id=user_id,
+            subscription__isnull=False,
+            last_charged_on__lt=timezone.localdate() - timedelta(days=STALE_AFTER_DAYS),
+        ).values('subscription_id')
+        updated_existing |= bool(
+            Subscription.objects.filter(subs_id__in=stale_ids, status='ACTIVE', deleted_at__isnull=True)
+            .update(status='CANCELED', updated_at=timezone.now())
+        )
+
+        if rows:
+            state.last_expense_id = max(row['expense_id'] for row in rows)
+            state.save()
+
+    if updated_existing:
+        response_cache.bump_version(user_id)
+    return detected
+
+
+def detect_safely(user_id):
+    """Codef 동기화 후처리용 (실패해도 동기화 응답에는 영향 없음)"""
+    try:
+        return detect(user_id)
+    except Exception as e:
+        logger.error(f"Subscription detection failed for user {user_id}: {e}")
+        return 0
+
+
+def reset(user_id=None):
+    """감지 상태 초기화 (다음 실행 시 전체 이력을 다시 처리)"""
+    states = SubscriptionScanState.objects.all()
+    charges = RecurringCharge.objects.all()
+    if user_id is not None:
+        states = states.filter(user_id=user_id)
+        charges = charges.filter(user_id=user_id)
+    charges.delete()
+    states.delete()
+
+
+def users_with_new_expenses():
+    """처리하지 않은 Expense가 있는 사용자 ID 목록"""
+    scanned = dict(SubscriptionScanState.objects.values_list('user_id', 'last_expense_id'))
+    latest = Expense.objects.order_by().values('user_id').annotate(last_id=Max('expense_id'))
+    return [row['user_id'] for row in latest if row['last_id'] > scanned.get(row['user_id'], 0)]
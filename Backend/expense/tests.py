@@ -1,3 +1,1412 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import io
+import json
+import os
+import threading
+import time
+import urllib.parse
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Sum
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cards.models import Card, CardBenefit
+from category.models import Category
+from users.models import MonthlyStat, User, UserCard
+from Crypto.Cipher import PKCS1_v1_5
+from Crypto.PublicKey import RSA
+import httpx
+
+from codef import crypto, jobs, token_provider, transport
+from codef.async_service import AsyncCodefAPIService
+from codef.card_matcher import UserCardMatcher
+from codef.views import _save_approval_list
+from codef.service import CodefAPIService
+from . import (
+    anomaly_detector, cohort, distribution as distribution_service, export, forecast, home, importer, ingest,
+    monthly_stats, response_cache, rollup, subscription_detector,
+)
+from .models import (
+    CategorySpendingStat, DailySpending, Expense, MonthlySpendDistribution, RecurringCharge, Subscription,
+    SubscriptionScanState, SyncJob,
+)
+
+
+def aware(*args):
+    # [설명] 현지 타임존(Asia/Seoul) 기준 aware datetime
+    return timezone.make_aware(datetime(*args))
+
+
+class ExpenseTestCase(TestCase):
+    """사용자 1명 + 보유 카드 1장 + 카테고리 2개 공통 준비"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone='01000000000', name='테스트', password='pw')
+        self.food = Category.objects.create(category_name='식비')
+        self.cafe = Category.objects.create(category_name='카페/디저트')
+        self.card = Card.objects.create(card_name='굿데이', company='국민카드')
+        self.user_card = UserCard.objects.create(user=self.user, card=self.card, card_number='1234-5678-9012-3456')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_expense(self, amount, spent_at, category=None, user=None, **fields):
+        return Expense.objects.create(
+            user=user or self.user,
+            user_card=self.user_card,
+            category=category or self.food,
+            merchant_name=fields.pop('merchant_name', '가게'),
+            amount=amount,
+            spent_at=spent_at,
+            **fields,
+        )
+
+
+class DailyRollupTests(ExpenseTestCase):
+    """일별 롤업과 원본 기간 조회가 같은 기준(paid)으로 집계되는지 확인"""
+
+    def rollup_total(self):
+        return rollup.month_total(self.user, 2026, 9)
+
+    def query_total(self):
+        return Expense.objects.for_month(self.user, 2026, 9).aggregate(total=Sum('amount'))['total'] or 0
+
+    def test_rollup_follows_insert_update_and_soft_delete(self):
+        expense = self.add_expense(10000, aware(2026, 9, 1, 12))
+        self.add_expense(5000, aware(2026, 9, 1, 18), category=self.cafe)
+        self.assertEqual(self.rollup_total(), 15000)
+
+        # 날짜를 옮기면 이전/새 버킷 모두 갱신
+        expense.spent_at = aware(2026, 9, 2, 9)
+        expense.save()
+        days = dict(DailySpending.objects.filter(user=self.user).values('day').annotate(t=Sum('total_amount')).values_list('day', 't'))
+        self.assertEqual(days, {date(2026, 9, 1): 5000, date(2026, 9, 2): 10000})
+
+        expense.deleted_at = timezone.now()
+        expense.save()
+        self.assertEqual(self.rollup_total(), 5000)
+        self.assertEqual(self.query_total(), 5000)
+
+    def test_cancelled_row_changes_rollup_and_queries_the_same_way(self):
+        self.add_expense(30000, aware(2026, 9, 3, 12))
+        cancelled = self.add_expense(7000, aware(2026, 9, 4, 12))
+        self.assertEqual((self.rollup_total(), self.query_total()), (37000, 37000))
+
+        cancelled.status = 'CANCELLED'
+        cancelled.save()
+        self.assertEqual((self.rollup_total(), self.query_total()), (30000, 30000))
+
+        # API 응답도 같은 합계 (월간 내역 합계 = 누적 곡선 마지막 값)
+        expense_total = self.client.get('/api/v1/expenses/', {'month': '2026-09'}).data['result']['total_spent']
+        accumulated = self.client.get('/api/v1/transactions/accumulated', {'year': 2026, 'month': 9}).data
+        self.assertEqual(expense_total, 30000)
+        self.assertEqual(accumulated['total'], 30000)
+
+    def test_deferred_block_refreshes_once_per_user(self):
+        with rollup.deferred():
+            for day in range(1, 11):
+                self.add_expense(1000, aware(2026, 9, day, 12))
+            # 블록 안에서는 아직 롤업 미반영
+            self.assertEqual(self.rollup_total(), 0)
+        self.assertEqual(self.rollup_total(), 10000)
+
+    def test_rebuild_matches_incremental_rollup(self):
+        for day in range(1, 6):
+            self.add_expense(1000 * day, aware(2026, 9, day, 12), status='PAID' if day % 2 else 'CANCELLED')
+        incremental = list(DailySpending.objects.order_by('day', 'category_id').values_list('day', 'category_id', 'total_amount'))
+        rollup.rebuild([self.user.pk])
+        rebuilt = list(DailySpending.objects.order_by('day', 'category_id').values_list('day', 'category_id', 'total_amount'))
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(self.rollup_total(), 1000 + 3000 + 5000)
+
+
+class CategorySummaryTests(ExpenseTestCase):
+    """대시보드 categorySummary와 단독 카테고리 요약 API가 같은 값을 내는지 확인"""
+
+    def summary(self, data):
+        return {row['name']: (row['amount'], row['change'], row['percent']) for row in data['categories']}
+
+    def test_dashboard_and_standalone_summary_agree(self):
+        self.add_expense(20000, aware(2026, 8, 10, 12), category=self.cafe)
+        self.add_expense(50000, aware(2026, 9, 2, 12))
+        self.add_expense(12000, aware(2026, 9, 3, 12), category=self.cafe)
+        self.add_expense(19000, aware(2026, 9, 4, 12), category=self.cafe, status='CANCELLED')
+        params = {'year': 2026, 'month': 9}
+
+        standalone = self.client.get('/api/v1/transactions/category-summary', params).data
+        dashboard = self.client.get('/api/v1/transactions/dashboard', params).data['categorySummary']
+
+        self.assertEqual(self.summary(standalone), self.summary(dashboard))
+        self.assertEqual(self.summary(standalone)['카페/디저트'][:2], (12000, -8000))
+
+
+class PeriodQueryIndexTests(ExpenseTestCase):
+    """기간 조회 헬퍼가 커버링 인덱스 범위 스캔을 쓰는지 EXPLAIN으로 확인"""
+
+    def setUp(self):
+        super().setUp()
+        if connection.vendor not in ('mysql', 'sqlite'):
+            self.skipTest(f"EXPLAIN 형식 미지원 DB: {connection.vendor}")
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        with rollup.deferred():
+            for i in range(120):
+                self.add_expense(1000 + i, aware(2026, 1 + i % 12, 1 + i % 28, 12), user=(self.user, other)[i % 2])
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE TABLE expenses')
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor == 'mysql':
+            # [설명] 전통 형식은 possible_keys에도 이름이 나오므로 실제 선택된 key만 확인
+            plan = queryset.explain(format='json')
+            self.assertIn(f'"key": "{index_name}"', plan, plan)
+        else:
+            # SQLite: "SEARCH expenses USING COVERING INDEX <이름> (...)"
+            plan = queryset.explain()
+            self.assertIn(f'INDEX {index_name}', plan, plan)
+
+    def test_user_month_category_totals(self):
+        queryset = Expense.objects.for_month(self.user, 2026, 9).values('category_id').annotate(total=Sum('amount'))
+        self.assertUsesIndex(queryset, 'expenses_user_paid_cover')
+
+    def test_user_day_and_open_range(self):
+        self.assertUsesIndex(Expense.objects.for_day(self.user, 2026, 9, 1).values('amount'), 'expenses_user_paid_cover')
+        self.assertUsesIndex(Expense.objects.for_range(self.user, date(2026, 6, 1)).values('amount'), 'expenses_user_paid_cover')
+
+    def test_cross_user_month_totals(self):
+        queryset = Expense.objects.for_month(None, 2026, 9).values('user_id').annotate(total=Sum('amount'))
+        self.assertUsesIndex(queryset, 'expenses_paid_period_cover')
+
+
+class SpendDistributionTests(ExpenseTestCase):
+    """월별 지출 분포의 백분위와 재계산 시점 확인"""
+
+    def test_percentile_from_quantiles(self):
+        distribution = MonthlySpendDistribution(user_count=5, quantiles=[100, 200, 300, 400, 500])
+        self.assertEqual(distribution.percentile_of(50), 0)
+        self.assertEqual(distribution.percentile_of(300), 40)
+        self.assertEqual(distribution.percentile_of(1000), 100)
+
+    def test_quantiles_are_bounded_and_close_to_exact_rank(self):
+        totals = list(range(0, 50000, 2))  # 25,000명
+        distribution = MonthlySpendDistribution(
+            user_count=len(totals), quantiles=MonthlySpendDistribution.quantiles_of(totals),
+        )
+        self.assertEqual(len(distribution.quantiles), MonthlySpendDistribution.QUANTILE_POINTS)
+        for amount in (0, 777, 12345, 30001, 49998, 60000):
+            exact = sum(1 for total in totals if total < amount)
+            self.assertLessEqual(abs(distribution.rank_of(amount) - exact), len(totals) / MonthlySpendDistribution.QUANTILE_POINTS)
+
+    def test_backfill_after_month_end_recomputes_closed_month(self):
+        self.add_expense(37000, aware(2026, 8, 5, 12))
+        # 8월이 끝난 뒤 계산 → 확정값
+        with mock.patch('django.utils.timezone.now', return_value=aware(2026, 9, 2, 12)):
+            distribution_service.compute(2026, 8)
+        distribution = distribution_service.get_distribution(2026, 8)
+        self.assertFalse(distribution_service.is_stale(distribution, 2026, 8))
+
+        # 과거 내역 대량 반영 (Codef 동기화/CSV 가져오기)
+        with rollup.deferred():
+            for day in range(1, 21):
+                self.add_expense(120000, aware(2026, 8, day, 12))
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        self.add_expense(10000, aware(2026, 8, 1, 12), user=other)
+
+        distribution = distribution_service.get_distribution(2026, 8)
+        self.assertEqual((distribution.user_count, distribution.mean), (2, (37000 + 2400000 + 10000) / 2))
+        self.assertEqual(distribution.percentile_of(2437000), 50)
+        self.assertIsNone(distribution.changed_at)
+
+    def test_current_month_refreshes_after_stale_window(self):
+        self.add_expense(10000, aware(2026, 10, 1, 12))
+        with mock.patch('django.utils.timezone.now', return_value=aware(2026, 10, 5, 12)):
+            distribution = distribution_service.compute(2026, 10)
+        self.add_expense(5000, aware(2026, 10, 2, 12))
+
+        with mock.patch('django.utils.timezone.now', return_value=aware(2026, 10, 5, 12) + timedelta(minutes=5)):
+            self.assertFalse(distribution_service.is_stale(distribution, 2026, 10))
+        with mock.patch('django.utils.timezone.now', return_value=aware(2026, 10, 5, 12) + distribution_service.STALE_AFTER * 2):
+            self.assertEqual(distribution_service.get_distribution(2026, 10).mean, 15000)
+
+
+class MonthlyStatTests(ExpenseTestCase):
+    """MonthlyStat 구체화가 사용자 단위로만 동작하고 롤업과 같은 합계를 내는지 확인"""
+
+    def test_materialize_matches_rollup_and_skips_cancelled(self):
+        self.add_expense(42000, aware(2026, 9, 1, 12))
+        cancelled = self.add_expense(8000, aware(2026, 9, 2, 12))
+        cancelled.status = 'CANCELLED'
+        cancelled.save()
+
+        stat = monthly_stats.get_stat(self.user, 2026, 9)
+        self.assertEqual(stat.total_spent, 42000)
+        self.assertEqual(stat.total_spent, rollup.month_total(self.user, 2026, 9))
+
+    def test_writes_do_not_compute_distribution(self):
+        with mock.patch.object(distribution_service, 'compute') as compute:
+            self.add_expense(42000, aware(2026, 9, 1, 12))
+            monthly_stats.materialize(self.user.pk, 2026, 9)
+        compute.assert_not_called()
+        self.assertFalse(MonthlySpendDistribution.objects.exists())
+
+    def test_group_average_filled_by_distribution(self):
+        self.add_expense(42000, aware(2026, 9, 1, 12))
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        self.add_expense(18000, aware(2026, 9, 1, 12), user=other)
+        self.assertIsNone(monthly_stats.get_stat(self.user, 2026, 9).avg_group_spent)
+
+        distribution_service.compute(2026, 9)
+        self.assertEqual(monthly_stats.get_stat(self.user, 2026, 9).avg_group_spent, 30000)
+
+
+    def benefits(self):
+        return dict(MonthlyStat.objects.filter(user=self.user).values_list('target_month', 'total_benefit'))
+
+    def analysis_benefit(self):
+        return self.client.get('/api/v1/analysis/', {'month': '2026-08'}).data['result']['benefit_status']['total_benefit_received']
+
+    def test_card_changes_refresh_stored_benefit(self):
+        self.add_expense(42000, aware(2026, 8, 1, 12))
+        self.add_expense(10000, aware(2026, 9, 1, 12))
+        monthly_stats.get_stats(self.user, [(2026, 8), (2026, 9)])
+        self.assertEqual(self.analysis_benefit(), 0)
+
+        card = Card.objects.create(card_name='딥드림', company='신한카드')
+        benefit = CardBenefit.objects.create(card=card, category=self.food, benefit_rate=10)
+        user_card = UserCard.objects.create(user=self.user, card=card)
+        self.assertEqual(self.benefits(), {'2026-08': 4200, '2026-09': 1000})
+        self.assertEqual(self.analysis_benefit(), 4200)  # 마감된 달도 응답 캐시 무효화 후 새 값
+
+        benefit.benefit_rate = 5
+        benefit.save()
+        self.assertEqual(self.benefits(), {'2026-08': 2100, '2026-09': 500})
+
+        user_card.delete()
+        self.assertEqual(self.benefits(), {'2026-08': 0, '2026-09': 0})
+        self.assertEqual(self.analysis_benefit(), 0)
+
+class ResponseCacheTests(ExpenseTestCase):
+    """사용자별 응답 캐시와 조건부 GET(ETag/304) 확인"""
+
+    url = '/api/v1/transactions/accumulated'
+    params = {'year': 2026, 'month': 9}
+
+    def get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(self.url, self.params, **headers)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        self.add_expense(10000, aware(2026, 9, 1, 12))
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertIn('private', first['Cache-Control'])
+
+        with self.assertNumQueries(1):  # 공유 캐시의 사용자 데이터 버전 조회만
+            self.assertEqual(self.get(etag).status_code, 304)
+        # nginx gzip이 붙이는 약한 ETag도 같은 값으로 비교
+        self.assertEqual(self.get(f'W/{etag}').status_code, 304)
+        self.assertEqual(self.get('"other"').status_code, 200)
+
+    def test_expense_write_invalidates_cached_response(self):
+        self.add_expense(10000, aware(2026, 9, 1, 12))
+        etag = self.get()['ETag']
+
+        self.add_expense(5000, aware(2026, 9, 2, 12))
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 15000)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_empty_process_cache_still_returns_304_without_queries(self):
+        self.add_expense(10000, aware(2026, 9, 1, 12))
+        etag = self.get()['ETag']
+
+        # 다른 워커/재시작/축출로 프로세스 캐시가 비어도 집계 쿼리 없이 304
+        cache.clear()
+        with self.assertNumQueries(1):  # 공유 캐시의 사용자 데이터 버전 조회만
+            self.assertEqual(self.get(etag).status_code, 304)
+
+    def test_etag_follows_version_and_date(self):
+        self.add_expense(10000, aware(2026, 9, 1, 12))
+        etag = self.get()['ETag']
+
+        # 다른 사용자의 지출은 이 사용자의 ETag에 영향 없음
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        self.add_expense(99000, aware(2026, 9, 1, 12), user=other)
+        self.assertEqual(self.get(etag).status_code, 304)
+
+        # 날짜가 바뀌면 "오늘" 기준 값이 달라질 수 있으므로 다시 계산
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch('django.utils.timezone.localdate', return_value=tomorrow):
+            self.assertEqual(self.get(etag).status_code, 200)
+
+        # 버전이 올라가면(보유 카드 저장) 새 ETag
+        self.user_card.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ComparisonDayTests(SimpleTestCase):
+    """월간 비교 기준일과 예측 기준일이 같은 '오늘'(현지 날짜)을 쓰는지 확인"""
+
+    def test_uses_local_date_around_utc_midnight(self):
+        # UTC 2026-09-30 16:30 = 서울 2026-10-01 01:30
+        utc_now = datetime(2026, 9, 30, 16, 30, tzinfo=dt_timezone.utc)
+        with mock.patch('django.utils.timezone.now', return_value=utc_now):
+            self.assertEqual(home.comparison_day(2026, 10), 1)
+            self.assertEqual(home.comparison_day(2026, 9), 30)
+            self.assertEqual(forecast._as_of(2026, 10), date(2026, 10, home.comparison_day(2026, 10)))
+
+
+class IngestUpsertTests(ExpenseTestCase):
+    """Codef 동기화 일괄 저장 (승인번호 기준 upsert / 승인번호 없는 거래 중복 제외)"""
+
+    def expense(self, amount, spent_at, approval_number=None, merchant_name='가게'):
+        return Expense(
+            user=self.user, user_card=self.user_card, category=self.food, status='PAID',
+            merchant_name=merchant_name, amount=amount, spent_at=spent_at, approval_number=approval_number,
+        )
+
+    def upsert(self, expenses, **kwargs):
+        return ingest.upsert_expenses(self.user.pk, expenses, ['spent_at', 'amount', 'merchant_name', 'updated_at'], **kwargs)
+
+    def test_repeated_sync_updates_instead_of_duplicating(self):
+        batch = [self.expense(1000 * i, aware(2026, 9, i, 12), approval_number=f'A{i}') for i in range(1, 4)]
+        self.assertEqual(self.upsert(batch), (3, 0))
+
+        # 사용자가 바꾼 카테고리는 다시 동기화해도 유지
+        Expense.objects.filter(approval_number='A1').update(category=self.cafe)
+        again = [self.expense(1000 * i, aware(2026, 9, i, 12), approval_number=f'A{i}') for i in range(1, 4)]
+        again[0].amount = 1500
+        again[0].spent_at = aware(2026, 9, 10, 12)
+        self.assertEqual(self.upsert(again), (0, 3))
+
+        self.assertEqual(Expense.objects.count(), 3)
+        updated = Expense.objects.get(approval_number='A1')
+        self.assertEqual((updated.amount, updated.category), (1500, self.cafe))
+        # 결제일이 바뀐 거래는 이전/새 날짜 롤업 모두 갱신
+        self.assertFalse(DailySpending.objects.filter(day=date(2026, 9, 1)).exists())
+        self.assertEqual(rollup.month_total(self.user, 2026, 9), 1500 + 2000 + 3000)
+
+    def test_duplicate_approval_in_one_batch_keeps_last(self):
+        batch = [self.expense(1000, aware(2026, 9, 1, 12), 'A1'), self.expense(1200, aware(2026, 9, 1, 12), 'A1')]
+        self.assertEqual(self.upsert(batch), (1, 0))
+        self.assertEqual(Expense.objects.get(approval_number='A1').amount, 1200)
+
+    def test_unapproved_rows_deduped_by_time_merchant_amount(self):
+        spent_at = aware(2026, 9, 1, 12)
+        self.assertEqual(self.upsert([self.expense(1000, spent_at, ''), self.expense(1000, spent_at)]), (1, 0))
+        self.assertEqual(self.upsert([self.expense(1000, spent_at), self.expense(2000, spent_at)]), (1, 0))
+        self.assertEqual(Expense.objects.filter(approval_number__isnull=True).count(), 2)
+
+    def test_statements_per_batch_do_not_grow_with_rows(self):
+        batch = [self.expense(100, aware(2026, 9, 1 + i % 28, 12), approval_number=f'B{i}') for i in range(40)]
+        with mock.patch.object(rollup, 'mark_dirty'):
+            # 묶음당 기존 행 조회 1 + INSERT ... ON CONFLICT 1
+            with self.assertNumQueries(4):
+                self.upsert(batch, batch_size=20)
+        self.assertEqual(Expense.objects.count(), 40)
+
+    def test_unique_constraint_on_user_and_approval_number(self):
+        self.add_expense(1000, aware(2026, 9, 1, 12), approval_number='A1')
+        # 승인번호 없는 거래(NULL)끼리는 충돌하지 않음
+        self.add_expense(1000, aware(2026, 9, 1, 12))
+        self.add_expense(1000, aware(2026, 9, 1, 12))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.add_expense(2000, aware(2026, 9, 2, 12), approval_number='A1')
+
+
+class UniqueApprovalMigrationTests(TransactionTestCase):
+    """0012 승인번호 유니크 제약 전 정리 (중복 중 삭제되지 않은 행을 남기는지)"""
+
+    before = [('expense', '0011_cohortmonthlyaggregate')]
+    after = [('expense', '0012_expense_unique_approval')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        self.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_keeps_active_row_when_newest_duplicate_is_deleted(self):
+        old_apps = self.migrate(self.before)
+        user = User.objects.create_user(phone='01000000000', name='테스트', password='pw')
+        category = Category.objects.create(category_name='식비')
+        user_card = UserCard.objects.create(user=user, card=Card.objects.create(card_name='굿데이', company='국민카드'))
+        OldExpense = old_apps.get_model('expense', 'Expense')
+
+        def expense(approval_number, deleted_at=None):
+            return OldExpense.objects.create(
+                user_id=user.pk, user_card_id=user_card.pk, category_id=category.pk, merchant_name='가게',
+                amount=1000, spent_at=aware(2026, 9, 1, 12), approval_number=approval_number, deleted_at=deleted_at,
+            ).expense_id
+
+        active = expense('A1')
+        deleted = expense('A1', deleted_at=aware(2026, 9, 2, 12))  # 최신 행이지만 이미 삭제됨
+        all_deleted = [expense('B1', deleted_at=aware(2026, 9, 2, 12)) for _ in range(2)]
+
+        self.migrate(self.after)
+        kept = Expense.objects.get(expense_id=active)
+        self.assertEqual((kept.approval_number, kept.deleted_at), ('A1', None))
+        self.assertIsNone(Expense.objects.get(expense_id=deleted).approval_number)
+        # 모두 삭제된 중복은 최신 행의 승인번호만 유지
+        self.assertEqual(
+            list(Expense.objects.filter(expense_id__in=all_deleted).order_by('expense_id').values_list('approval_number', flat=True)),
+            [None, 'B1'],
+        )
+
+
+def process_caches(name):
+    # [설명] 프로세스마다 따로인 로컬 캐시 + 모든 프로세스가 함께 보는 공유 캐시 (운영 설정과 같은 구성)
+    return {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': name},
+        'shared': settings.CACHES['shared'],
+    }
+
+
+def approval(approval_no, day, amount, merchant='스타벅스'):
+    # [설명] Codef 승인 내역 응답 항목
+    return {
+        'resUsedDate': f'202609{day:02d}', 'resUsedTime': '120000', 'resApprovalNo': approval_no,
+        'resMemberStoreName': merchant, 'resUsedAmount': f'{amount:,}', 'resCardName': '굿데이',
+    }
+
+
+@override_settings(CACHES=process_caches('web'))
+class CrossProcessCacheTests(ExpenseTestCase):
+    """동기화 워커 프로세스에서 저장한 지출이 웹 프로세스의 캐시 응답에 반영되는지 확인"""
+
+    def test_worker_sync_invalidates_web_responses(self):
+        self.add_expense(10000, aware(2026, 9, 1, 12))
+        url, params = '/api/v1/transactions/accumulated', {'year': 2026, 'month': 9}
+        etag = self.client.get(url, params)['ETag']
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        SyncJob.objects.create(user=self.user, kind='approval', params={
+            'organization': '0301', 'connected_id': 'conn', 'start_date': '20260901', 'end_date': '20260930',
+        })
+        with override_settings(CACHES=process_caches('worker')), mock.patch.object(jobs, 'CodefAPIService') as service:
+            service.return_value.get_approval_list.return_value = {'success': True, 'data': [approval('A1', 5, 5000)]}
+            [job] = jobs.claim('worker-1', 1)
+            self.assertEqual(jobs.run(job), 'succeeded')
+
+        # 웹 프로세스 로컬 캐시에는 이전 응답이 남아 있지만 공유 버전이 바뀌어 다시 계산
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 15000)
+
+    def test_codef_token_issued_once_across_processes(self):
+        token_response = mock.Mock(**{'json.return_value': {'access_token': 'tok-1', 'expires_in': 3600}})
+        with mock.patch.object(token_provider.transport, 'post', return_value=token_response) as post:
+            with override_settings(CACHES=process_caches('worker')):
+                self.assertEqual(token_provider.get_token('client', 'secret'), 'tok-1')
+            self.assertEqual(token_provider.get_token('client', 'secret'), 'tok-1')
+        post.assert_called_once()
+
+
+class SyncJobSecretTests(ExpenseTestCase):
+    """동기화 작업에 카드 정보를 평문으로 저장하지 않고, 종료 시 모두 지우는지 확인"""
+
+    url = '/api/v1/codef/sync-jobs/'
+    secrets = {'card_no': '9410123456781234', 'birth_date': '19900101', 'card_password': '37'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = RSA.generate(2048)
+        public_key = base64.b64encode(cls.private_key.publickey().export_key('DER')).decode()
+        cls.env = mock.patch.dict(os.environ, {'CODEF_CLIENT_PUBLIC': public_key})
+        cls.env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.stop()
+        super().tearDownClass()
+
+    def enqueue(self, **extra):
+        body = {'kind': 'approval', 'organization': '0301', 'connected_id': 'conn',
+                'start_date': '20260901', 'end_date': '20260930', **self.secrets, **extra}
+        return self.client.post(self.url, body, format='json')
+
+    def assertNoPlaintext(self, job):
+        self.assertNotIn('card_password', job.params)
+        stored = json.dumps(job.params)
+        for name in ('card_no', 'birth_date'):
+            self.assertNotIn(self.secrets[name], stored)
+
+    def test_only_encrypted_values_are_stored(self):
+        response = self.enqueue()
+        self.assertEqual(response.status_code, 202)
+        job = SyncJob.objects.get(job_id=response.data['job_id'])
+        self.assertNoPlaintext(job)
+
+        # 카드 비밀번호는 Codef 공개키 암호문 → Codef(개인키)만 복호화 가능
+        ciphertext = base64.b64decode(job.params['encrypted_card_password'])
+        self.assertEqual(PKCS1_v1_5.new(self.private_key).decrypt(ciphertext, None), b'37')
+
+        # 암호문은 매번 다르지만 같은 조건의 대기 작업은 재사용
+        self.assertEqual(self.enqueue().data['job_id'], job.job_id)
+        self.assertNotEqual(self.enqueue(card_password='38').data['job_id'], job.job_id)
+
+    def test_worker_sends_decrypted_values_and_scrubs_on_finish(self):
+        job_id = self.enqueue().data['job_id']
+        with mock.patch.object(CodefAPIService, 'get_approval_list', return_value={'success': True, 'data': []}) as call:
+            [job] = jobs.claim('worker-1', 1)
+            self.assertEqual(jobs.run(job), 'succeeded')
+
+        kwargs = call.call_args.kwargs
+        self.assertEqual((kwargs['card_no'], kwargs['birth_date']), ('9410123456781234', '19900101'))
+        self.assertEqual(kwargs['encrypted_card_password'], job.params['encrypted_card_password'])
+        self.assertFalse(set(jobs.SECRET_PARAMS) & set(SyncJob.objects.get(job_id=job_id).params))
+
+    def test_final_failure_scrubs_secrets(self):
+        job_id = self.enqueue().data['job_id']
+        SyncJob.objects.filter(job_id=job_id).update(max_attempts=1)
+        failure = {'success': False, 'error_message': 'CF-12345'}
+        with mock.patch.object(CodefAPIService, 'get_approval_list', return_value=failure):
+            [job] = jobs.claim('worker-1', 1)
+            self.assertEqual(jobs.run(job), 'failed')
+
+        job = SyncJob.objects.get(job_id=job_id)
+        self.assertEqual((job.status, job.error_message), ('FAILED', 'CF-12345'))
+        self.assertFalse(set(jobs.SECRET_PARAMS) & set(job.params))
+
+    def test_refuses_to_store_password_without_public_key(self):
+        with mock.patch.dict(os.environ, {'CODEF_CLIENT_PUBLIC': ''}):
+            response = self.enqueue()
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(SyncJob.objects.exists())
+
+
+class SyncJobQueueTests(ExpenseTestCase):
+    """동기화 작업 큐의 가져가기(claim)/재시도/시간 초과 처리 확인"""
+
+    def job(self, user=None, **fields):
+        return SyncJob.objects.create(user=user or self.user, kind='billing', params={'organization': '0301'}, **fields)
+
+    def test_claims_one_job_per_user(self):
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        first, _, third = self.job(), self.job(), self.job(user=other)
+        self.job(run_after=timezone.now() + timedelta(minutes=1))  # 아직 실행 시각 전
+
+        claimed = jobs.claim('worker-1', 10)
+        self.assertEqual([job.job_id for job in claimed], [first.job_id, third.job_id])
+        self.assertEqual({job.running_user for job in claimed}, {self.user.pk, other.pk})
+        # 실행 중인 작업이 있는 사용자의 작업은 다른 워커도 가져가지 않음
+        self.assertEqual(jobs.claim('worker-2', 10), [])
+
+    def test_database_rejects_second_running_job_for_user(self):
+        # 다른 워커가 방금 가져가 아직 상태 조회에는 보이지 않는 경우: 유니크 제약이 막음
+        self.job(status='SUCCEEDED', running_user=self.user.pk)
+        pending = self.job()
+        self.assertEqual(jobs.claim('worker-1', 1), [])
+        self.assertEqual(SyncJob.objects.get(job_id=pending.job_id).status, 'PENDING')
+
+    def test_failures_back_off_then_fail(self):
+        job_id = self.job().job_id
+        delays = []
+        with mock.patch.object(jobs, '_execute', side_effect=jobs.SyncJobError('timeout')):
+            for expected in ('retry', 'retry', 'failed'):
+                SyncJob.objects.filter(job_id=job_id).update(run_after=timezone.now())
+                [job] = jobs.claim('worker-1', 1)
+                started = timezone.now()
+                self.assertEqual(jobs.run(job), expected)
+                job = SyncJob.objects.get(job_id=job_id)
+                delays.append(round((job.run_after - started).total_seconds()))
+                self.assertIsNone(job.running_user)
+
+        self.assertEqual(delays[:2], [jobs.RETRY_BACKOFF, jobs.RETRY_BACKOFF * 2])
+        self.assertEqual((job.status, job.attempts, job.error_message), ('FAILED', 3, 'timeout'))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_stale_lease_is_requeued_and_late_result_discarded(self):
+        job_id = self.job().job_id
+        [stale] = jobs.claim('worker-1', 1)
+        SyncJob.objects.filter(job_id=job_id).update(locked_at=timezone.now() - jobs.LEASE_TIMEOUT * 2)
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertIsNone(SyncJob.objects.get(job_id=job_id).running_user)
+
+        SyncJob.objects.filter(job_id=job_id).update(run_after=timezone.now())
+        [fresh] = jobs.claim('worker-2', 1)
+        # 되돌려진 뒤 끝난 worker-1의 결과는 worker-2가 실행 중인 작업을 덮어쓰지 않음
+        with mock.patch.object(jobs, '_execute', return_value={'saved_count': 1}):
+            jobs.run(stale)
+        job = SyncJob.objects.get(job_id=job_id)
+        self.assertEqual((job.status, job.locked_by, job.running_user), ('RUNNING', 'worker-2', self.user.pk))
+
+    def test_enqueue_limits_active_jobs(self):
+        for day in range(jobs.MAX_ACTIVE_JOBS_PER_USER):
+            _, created = jobs.enqueue(self.user, 'approval', {'organization': '0301', 'start_date': f'202609{day + 1:02d}'})
+            self.assertTrue(created)
+        self.assertEqual(jobs.enqueue(self.user, 'approval', {'organization': '0301', 'start_date': '20261001'}), (None, False))
+
+
+class TrendTests(ExpenseTestCase):
+    """월별 지출 추이 API (빈 달 0 채움, 그룹별 시계열, 파라미터 검증)"""
+
+    url = '/api/v1/transactions/trend'
+
+    def setUp(self):
+        super().setUp()
+        self.add_expense(10000, aware(2026, 6, 5, 12))
+        self.add_expense(4000, aware(2026, 6, 30, 23, 30), category=self.cafe)  # 현지 기준 6월
+        self.add_expense(8000, aware(2026, 8, 1, 0, 10), category=self.cafe)
+        self.add_expense(3000, aware(2026, 8, 2, 12), status='CANCELLED')
+
+    def test_fills_empty_months_and_groups_by_category(self):
+        with self.assertNumQueries(2):  # 공유 캐시 버전 조회 + 추이 GROUP BY 한 번
+            response = self.client.get(self.url, {'from': '2026-05', 'to': '2026-08', 'group': 'category'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['months'], ['2026-05', '2026-06', '2026-07', '2026-08'])
+        self.assertEqual(response.data['totals'], [0, 14000, 0, 8000])
+        series = {row['name']: (row['amounts'], row['total']) for row in response.data['series']}
+        self.assertEqual(series, {
+            '카페/디저트': ([0, 4000, 0, 8000], 12000),
+            '식비': ([0, 10000, 0, 0], 10000),
+        })
+        self.assertEqual(response.data['series'][0]['name'], '카페/디저트')  # 합계 내림차순
+
+    def test_monthly_average_uses_same_totals(self):
+        trend = self.client.get(self.url, {'from': '2026-03', 'to': '2026-08'}).data
+        self.assertEqual(trend['series'], [])
+        average = self.client.get('/api/v1/transactions/monthly-average', {'year': 2026, 'month': 8}).data
+        self.assertEqual(average['average'], int(sum(trend['totals']) / 6))
+
+    def test_rejects_bad_params(self):
+        for params in (
+            {'from': '2026-08'},
+            {'from': '2026-08', 'to': '2026-06'},
+            {'from': '2023-01', 'to': '2026-01'},
+            {'from': '2026-01', 'to': '2026-02', 'group': 'merchant'},
+        ):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+
+class KeysetPaginationTests(ExpenseTestCase):
+    """지출 내역 커서 페이지네이션 (같은 시각 결제도 빠짐/중복 없이)"""
+
+    def setUp(self):
+        super().setUp()
+        same_time = aware(2026, 9, 3, 12)
+        self.expenses = [
+            self.add_expense(1000, aware(2026, 9, 1, 12)),
+            self.add_expense(2000, same_time),
+            self.add_expense(3000, same_time),
+            self.add_expense(4000, same_time, category=self.cafe),
+            self.add_expense(5000, aware(2026, 9, 5, 12), category=self.cafe),
+        ]
+
+    def walk(self, url, params):
+        pages, cursor = [], None
+        while True:
+            result = self.client.get(url, {**params, 'page_size': 2, **({'cursor': cursor} if cursor else {})}).data
+            result = result.get('result', result)
+            pages.append(result)
+            cursor = result['next_cursor']
+            if cursor is None:
+                return pages
+
+    def test_show_expense_pages_cover_month_once(self):
+        pages = self.walk('/api/v1/expenses/', {'month': '2026-09'})
+        ids = [row['expense_id'] for page in pages for row in page['expense_list']]
+        expected = sorted(self.expenses, key=lambda e: (e.spent_at, e.expense_id), reverse=True)
+        self.assertEqual(ids, [e.expense_id for e in expected])
+        self.assertEqual([len(page['expense_list']) for page in pages], [2, 2, 1])
+        # 합계/건수는 페이지와 관계없이 월 전체 기준
+        self.assertEqual({(page['total_spent'], page['total_count']) for page in pages}, {(15000, 5)})
+
+    def test_category_detail_pages_within_category(self):
+        pages = self.walk('/api/v1/transactions/category-detail', {'year': 2026, 'month': 9, 'category_name': '식비'})
+        amounts = [row['amount'] for page in pages for row in page['transactions']]
+        self.assertEqual(amounts, [3000, 2000, 1000])
+        self.assertEqual(pages[0]['total_amount'], 6000)
+
+    def test_rejects_bad_cursor_and_page_size(self):
+        self.assertEqual(self.client.get('/api/v1/expenses/', {'month': '2026-09', 'cursor': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/expenses/', {'month': '2026-09', 'page_size': 0}).status_code, 400)
+        detail = {'year': 2026, 'month': 9, 'category_name': '식비'}
+        self.assertEqual(self.client.get('/api/v1/transactions/category-detail', {**detail, 'cursor': 'nope'}).status_code, 400)
+
+
+class ExportTests(ExpenseTestCase):
+    """지출 내역 스트리밍 내보내기 (CSV/NDJSON, 현지 날짜 기준 필터)"""
+
+    url = '/api/v1/expenses/export/'
+
+    def setUp(self):
+        super().setUp()
+        self.add_expense(1000, aware(2026, 8, 31, 23, 59), merchant_name='전날')
+        self.add_expense(2000, aware(2026, 9, 1, 0, 0), merchant_name='스타벅스, 강남점', category=self.cafe)
+        self.add_expense(3000, aware(2026, 9, 2, 23, 59), status='CANCELLED')
+        self.add_expense(4000, aware(2026, 9, 3, 0, 0), merchant_name='다음날')
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_stream_filters_by_local_days(self):
+        response = self.client.get(self.url, {'from': '2026-09-01', 'to': '2026-09-02'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment;', response['Content-Disposition'])
+
+        text = self.content(response)
+        self.assertTrue(text.startswith('\ufeff'))
+        rows = list(csv.DictReader(io.StringIO(text[1:])))
+        self.assertEqual([row['merchant_name'] for row in rows], ['스타벅스, 강남점', '가게'])
+        self.assertEqual(rows[0]['spent_at'], '2026-09-01T00:00:00+09:00')
+        self.assertEqual((rows[0]['category_name'], rows[1]['status']), ('카페/디저트', 'CANCELLED'))
+
+    def test_ndjson_stream_and_category_filter(self):
+        response = self.client.get(self.url, {'type': 'ndjson', 'category_name': '식비'})
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([line['amount'] for line in lines], [1000, 3000, 4000])
+        self.assertEqual(lines[0]['card_name'], '굿데이')
+
+    def test_rejects_bad_params(self):
+        self.assertEqual(self.client.get(self.url, {'type': 'xlsx'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'from': '2026/09/01'}).status_code, 400)
+
+    async def test_asgi_streams_chunks_without_buffering(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        with mock.patch.object(export, 'EXPORT_CHUNK_SIZE', 2):
+            response = await self.async_client.get(self.url, {'type': 'ndjson'}, headers={'Authorization': f'Bearer {token}'})
+            self.assertEqual(response.status_code, 200)
+            # 동기 이터레이터면 Django가 ASGI에서 전부 list로 읽은 뒤 전송함
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual([len(chunk.decode('utf-8').splitlines()) for chunk in chunks], [2, 2])
+        self.assertEqual([json.loads(line)['amount'] for chunk in chunks for line in chunk.decode('utf-8').splitlines()], [1000, 2000, 3000, 4000])
+
+    def test_management_command_writes_same_rows(self):
+        out = io.StringIO()
+        call_command('export_expenses', user_id=self.user.pk, type='ndjson', start='2026-09-03', stdout=out)
+        self.assertEqual([json.loads(line)['merchant_name'] for line in out.getvalue().splitlines()], ['다음날'])
+
+
+class VersionedResponseCacheTests(ExpenseTestCase):
+    """사용자별 버전 캐시 (구독/보유 카드 변경 시 무효화, 사용자 간 분리)"""
+
+    def test_subscription_and_card_changes_bump_version(self):
+        version = response_cache.get_version(self.user.pk)
+        subscription = Subscription.objects.create(
+            service_name='넷플릭스', monthly_fee=13500, next_billing=date(2026, 10, 1),
+            user=self.user, user_card=self.user_card, category=self.cafe,
+        )
+        self.assertNotEqual(response_cache.get_version(self.user.pk), version)
+
+        version = response_cache.get_version(self.user.pk)
+        subscription.delete()
+        self.assertNotEqual(response_cache.get_version(self.user.pk), version)
+
+        version = response_cache.get_version(self.user.pk)
+        UserCard.objects.create(user=self.user, card=Card.objects.create(card_name='딥드림', company='신한카드'))
+        self.assertNotEqual(response_cache.get_version(self.user.pk), version)
+
+    def test_cached_list_follows_subscription_changes(self):
+        url = '/api/v1/subscriptions/'
+        self.assertEqual(self.client.get(url).data['result'], [])
+        Subscription.objects.create(
+            service_name='넷플릭스', monthly_fee=13500, next_billing=date(2026, 10, 1),
+            user=self.user, user_card=self.user_card, category=self.cafe,
+        )
+        self.assertEqual([row['service_name'] for row in self.client.get(url).data['result']], ['넷플릭스'])
+
+    def test_cache_is_per_user(self):
+        url = '/api/v1/cards/'
+        self.assertEqual(len(self.client.get(url).data['cards']), 1)
+
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        client = APIClient()
+        client.force_authenticate(other)
+        self.assertEqual(client.get(url).data['cards'], [])
+        self.assertEqual(len(self.client.get(url).data['cards']), 1)
+
+    def test_error_responses_are_not_cached(self):
+        url = '/api/v1/transactions/accumulated'
+        with mock.patch.object(response_cache, 'cache') as view_cache:
+            view_cache.get.return_value = None
+            self.assertEqual(self.client.get(url).status_code, 400)
+            view_cache.set.assert_not_called()
+            self.assertEqual(self.client.get(url, {'year': 2026, 'month': 9}).status_code, 200)
+            view_cache.set.assert_called_once()
+
+
+class DaySeriesTests(ExpenseTestCase):
+    """윈도 함수로 계산한 일별/누적 시계열 (같은 날 여러 롤업 행, 기준일 자르기)"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_expense(10000, aware(2026, 9, 2, 12))
+        self.add_expense(3000, aware(2026, 9, 2, 18), category=self.cafe)  # 같은 날 다른 롤업 행
+        self.add_expense(7000, aware(2026, 9, 5, 9))
+        self.add_expense(1000, aware(2026, 8, 30, 12))
+
+    def test_day_series_sums_rows_per_day_and_accumulates(self):
+        series = rollup.day_series(self.user, 2026, 9)
+        self.assertEqual(len(series), 30)
+        self.assertEqual(series[0], {"day": 1, "amount": 0, "cumulative": 0})
+        self.assertEqual(series[1], {"day": 2, "amount": 13000, "cumulative": 13000})
+        self.assertEqual(series[3], {"day": 4, "amount": 0, "cumulative": 13000})
+        self.assertEqual(series[-1], {"day": 30, "amount": 0, "cumulative": 20000})
+
+        with self.assertNumQueries(1):
+            cut = rollup.day_series(self.user, 2026, 9, last_day=4)
+        self.assertEqual([point["cumulative"] for point in cut], [0, 13000, 13000, 13000])
+
+    def test_matches_dashboard_series(self):
+        daily_totals = {2: 13000, 5: 7000}
+        self.assertEqual(home.day_series_from_totals(daily_totals, 30), rollup.day_series(self.user, 2026, 9))
+        self.assertEqual(home.day_series_from_totals(daily_totals, 3), rollup.day_series(self.user, 2026, 9, 3))
+
+    def test_month_comparison_for_past_month(self):
+        data = self.client.get('/api/v1/transactions/month-comparison', {'year': 2026, 'month': 9}).data
+        self.assertEqual((data['thisMonthTotal'], data['lastMonthSameDay']), (20000, 1000))
+        self.assertEqual(len(data['thisMonthData']), 30)
+        self.assertEqual(data['thisMonthData'][4], {"day": 5, "amount": 20000.0})
+
+
+@mock.patch('django.utils.timezone.localdate', return_value=date(2026, 9, 10))
+class SubscriptionDetectorTests(ExpenseTestCase):
+    """반복 결제 → 구독 자동 감지 (증분 처리, 사용자 삭제 구독 유지, 해지 표시)"""
+
+    def charge(self, month, day=5, amount=13500, merchant_name='NETFLIX.COM', **fields):
+        return self.add_expense(amount, aware(2026, month, day, 9), category=self.cafe, merchant_name=merchant_name, **fields)
+
+    def test_normalize_merchant(self, _):
+        self.assertEqual(subscription_detector.normalize_merchant('NETFLIX.COM'), 'netflixcom')
+        self.assertEqual(subscription_detector.normalize_merchant('넷플릭스(주)'), '넷플릭스')
+        self.assertEqual(subscription_detector.normalize_merchant('Netflix 1234'), 'netflix')
+
+    def test_three_monthly_charges_create_subscription(self, _):
+        self.charge(6)
+        self.charge(7, day=6, merchant_name='NETFLIX.COM 0706')
+        self.assertEqual(subscription_detector.detect(self.user.pk), 0)
+        self.assertFalse(Subscription.objects.exists())
+
+        self.charge(8, amount=14500)  # 금액 대역 안의 인상
+        self.assertEqual(subscription_detector.detect(self.user.pk), 1)
+        subscription = Subscription.objects.get()
+        self.assertEqual(
+            (subscription.service_name, subscription.monthly_fee, subscription.next_billing, subscription.status),
+            ('NETFLIX.COM', 14500, date(2026, 9, 5), 'ACTIVE'),
+        )
+
+    def test_incremental_run_updates_existing_subscription(self, _):
+        for month in (5, 6, 7):
+            self.charge(month)
+        subscription_detector.detect(self.user.pk)
+        self.charge(6, day=20, amount=3000, merchant_name='편의점')  # 무관한 결제
+        self.charge(8, status='CANCELLED')
+
+        latest = self.charge(9, day=4)
+        self.assertEqual(subscription_detector.users_with_new_expenses(), [self.user.pk])
+        self.assertEqual(subscription_detector.detect(self.user.pk), 1)
+        self.assertEqual(SubscriptionScanState.objects.get(user_id=self.user.pk).last_expense_id, latest.expense_id)
+        self.assertEqual(subscription_detector.users_with_new_expenses(), [])
+        subscription = Subscription.objects.get()
+        self.assertEqual(subscription.next_billing, date(2026, 10, 4))
+        self.assertEqual(RecurringCharge.objects.get(merchant_key='netflixcom').streak, 1)  # 8월 취소로 새 주기
+        self.assertEqual(subscription_detector.detect(self.user.pk), 0)  # 새 결제 없음
+
+    def test_user_deleted_subscription_is_not_revived(self, _):
+        for month in (5, 6, 7):
+            self.charge(month)
+        subscription_detector.detect(self.user.pk)
+        Subscription.objects.update(deleted_at=timezone.now())
+
+        self.charge(8)
+        subscription_detector.detect(self.user.pk)
+        self.assertEqual(Subscription.objects.count(), 1)
+        self.assertIsNotNone(Subscription.objects.get().deleted_at)
+
+    def test_marks_stale_subscription_cancelled(self, _):
+        for month in (4, 5, 6):
+            self.charge(month)
+        subscription_detector.detect(self.user.pk)
+        # 6/5 마지막 결제 후 45일 넘게 결제 없음 (오늘 9/10)
+        self.assertEqual(Subscription.objects.get().status, 'CANCELED')
+
+
+class SpendingAnomalyTests(ExpenseTestCase):
+    """카테고리별 EWMA 이상 지출 감지 (증분 갱신 = 전체 재계산, 최근 기간 조회)"""
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        for days_ago, amount in enumerate((9000, 11000, 10000, 12000, 8000, 10000), start=10):
+            self.add_expense(amount, self.now - timedelta(days=days_ago))
+
+    def stat_values(self):
+        return list(
+            CategorySpendingStat.objects.order_by('category_id')
+            .values_list('category_id', 'observations', 'ewma_mean', 'ewma_var', 'anomaly_expense_id')
+        )
+
+    def test_detects_spike_after_warmup(self):
+        self.assertEqual(anomaly_detector.update(self.user.pk), 0)
+        self.add_expense(15000, self.now - timedelta(days=3))  # 평소보다 크지만 초과 금액이 작음
+        spike = self.add_expense(60000, self.now - timedelta(days=2), merchant_name='오마카세')
+        self.add_expense(90000, self.now - timedelta(days=1), status='CANCELLED')
+
+        self.assertEqual(anomaly_detector.update(self.user.pk), 1)
+        response = self.client.get('/api/v1/transactions/anomalies')
+        self.assertEqual(response.status_code, 200)
+        [anomaly] = response.data['anomalies']
+        self.assertEqual((anomaly['expense_id'], anomaly['merchant_name'], anomaly['amount']), (spike.expense_id, '오마카세', 60000))
+        self.assertLess(anomaly['usual_amount'], 15000)
+
+        self.assertEqual(self.client.get('/api/v1/transactions/anomalies', {'days': 1}).data['anomalies'], [])
+        self.assertEqual(self.client.get('/api/v1/transactions/anomalies', {'days': 91}).status_code, 400)
+
+        spike.deleted_at = timezone.now()
+        spike.save()
+        self.assertEqual(anomaly_detector.current_anomalies(self.user), [])
+
+    def test_incremental_updates_match_full_recompute(self):
+        anomaly_detector.update(self.user.pk)
+        self.add_expense(4000, self.now - timedelta(days=2), category=self.cafe)
+        self.add_expense(70000, self.now - timedelta(days=1))
+        anomaly_detector.update(self.user.pk)
+        self.assertEqual(anomaly_detector.update(self.user.pk), 0)  # 새 결제 없음
+        incremental = self.stat_values()
+
+        anomaly_detector.reset(self.user.pk)
+        self.assertEqual(anomaly_detector.users_with_new_expenses(), [self.user.pk])
+        anomaly_detector.update(self.user.pk)
+        self.assertEqual(self.stat_values(), incremental)
+
+
+class ForecastTests(SimpleTestCase):
+    """월말 지출 예측 (요일 지수, 최근 평균, 신뢰 구간)"""
+
+    today = date(2026, 9, 10)  # 목요일
+
+    def rows(self, amount_for_day, name='식비'):
+        start, end = forecast.query_range(2026, 9, self.today)
+        days = (start + timedelta(days=offset) for offset in range((self.today - start).days + 1))
+        return [
+            {'day': day, 'category__category_name': name, 'total': amount_for_day(day)}
+            for day in days if amount_for_day(day)
+        ]
+
+    def test_constant_spending_projects_remaining_days(self):
+        result = forecast.build_forecast(self.rows(lambda day: 10000), 2026, 9, self.today)
+        self.assertEqual((result['asOf'], result['remainingDays'], result['daysInMonth']), ('2026-09-10', 20, 30))
+        # 일정한 지출은 잔차가 없어 구간 폭 0
+        self.assertEqual(result['total'], {'spent': 100000, 'forecast': 300000, 'lower': 300000, 'upper': 300000})
+        self.assertEqual([category['name'] for category in result['categories']], ['식비'])
+
+    def test_weekday_pattern_only_counts_matching_days(self):
+        # 주말에만 30,000원 → 9/11~9/30 중 주말 6일
+        weekend = self.rows(lambda day: 30000 if day.weekday() >= 5 else 0, name='카페/디저트')
+        result = forecast.build_forecast(weekend, 2026, 9, self.today)
+        spent = result['total']['spent']
+        self.assertEqual(spent, 30000 * 2)
+        self.assertAlmostEqual(result['total']['forecast'], spent + 30000 * 6, delta=30000)
+        self.assertGreaterEqual(result['total']['lower'], spent)
+        self.assertGreater(result['total']['upper'], result['total']['forecast'])
+
+    def test_past_month_has_no_projection(self):
+        result = forecast.build_forecast(self.rows(lambda day: 10000), 2026, 8, self.today)
+        self.assertEqual(result['remainingDays'], 0)
+        self.assertEqual(result['total']['forecast'], result['total']['spent'])
+        self.assertEqual(result['total']['spent'], 310000)
+
+
+class CohortComparisonTests(ExpenseTestCase):
+    """연령대 × 성별 코호트 집계와 비교 대상 선택 (작은 코호트는 더 넓은 코호트로 대체)"""
+
+    def setUp(self):
+        super().setUp()
+        User.objects.filter(pk=self.user.pk).update(age_group='20대', gender=True)
+        self.user.refresh_from_db()
+        self.add_expense(40000, aware(2026, 9, 2, 12))
+        self.add_expense(20000, aware(2026, 9, 3, 12), category=self.cafe)
+        for i in range(1, 6):
+            self.add_expense(10000 * i, aware(2026, 9, 4, 12), user=self.make_user(i, age_group='20대', gender=True))
+        self.men = [self.make_user(i, birth_date='19960101', gender=False) for i in (6, 7)]
+        for man in self.men:
+            self.add_expense(100000, aware(2026, 9, 5, 12), user=man)
+
+    def make_user(self, i, **fields):
+        user = User.objects.create_user(phone=f'0100000000{i}', name=f'사용자{i}', password='pw')
+        User.objects.filter(pk=user.pk).update(**fields)
+        user.refresh_from_db()
+        return user
+
+    def test_cohort_keys(self):
+        profile = {'age_group': None, 'gender': False, 'birth_date': '19960101'}
+        self.assertEqual(cohort.cohort_keys(profile, 2026), [('30대', 'M'), ('30대', 'A'), ('전체', 'M'), ('전체', 'A')])
+        self.assertEqual(cohort.cohort_keys({'age_group': None, 'gender': None, 'birth_date': ''}, 2026), [('전체', 'A')])
+
+    def test_compute_and_pick_most_specific_large_cohort(self):
+        self.assertEqual(cohort.compute(2026, 9), 7)
+
+        with self.assertNumQueries(1):
+            mine = cohort.get_cohort(self.user, 2026, 9)
+        self.assertEqual((mine.age_group, mine.gender, mine.user_count), ('20대', 'F', 6))
+        self.assertEqual((mine.total_amount, mine.mean, mine.p50), (210000, 35000.0, 35000))
+        self.assertEqual(mine.categories['카페/디저트'], {'sum': 20000, 'count': 1, 'p50': 20000, 'p75': 20000})
+
+        # (30대, 남성) 2명 → 연령대/성별 코호트 모두 작아 전체 코호트로 대체
+        wider = cohort.get_cohort(self.men[0], 2026, 9)
+        self.assertEqual((wider.age_group, wider.gender, wider.user_count), ('전체', 'A', 8))
+        self.assertIsNone(cohort.get_cohort(self.user, 2026, 8))
+
+    def test_analysis_includes_cohort_comparison(self):
+        self.assertIsNone(self.client.get('/api/v1/analysis/', {'month': '2026-09'}).data['result']['cohort_comparison'])
+
+        cohort.compute(2026, 9)
+        cache.clear()  # 배치 작업은 응답 캐시 버전을 올리지 않음
+        comparison = self.client.get('/api/v1/analysis/', {'month': '2026-09'}).data['result']['cohort_comparison']
+        self.assertEqual((comparison['label'], comparison['user_count']), ('20대 여성', 6))
+        self.assertEqual((comparison['my_total_spent'], comparison['avg_spent'], comparison['diff_percent']), (60000, 35000, 71.4))
+        cafe = next(row for row in comparison['categories'] if row['name'] == '카페/디저트')
+        # 평균은 코호트 전체 인원 기준 (쓰지 않은 사용자는 0원)
+        self.assertEqual((cafe['my_amount'], cafe['avg_amount'], cafe['spender_ratio']), (20000, 3333, 16.7))
+
+
+class CsvImportTests(ExpenseTestCase):
+    """CSV 명세서 가져오기 (한글 헤더/cp949, 행 오류, 중복 제외, 롤업 반영)"""
+
+    url = '/api/v1/expenses/import/'
+
+    def upload(self, text, encoding='utf-8', **data):
+        file = SimpleUploadedFile('statement.csv', text.encode(encoding), content_type='text/csv')
+        return self.client.post(self.url, {'file': file, 'encoding': encoding, **data}, format='multipart')
+
+    def test_imports_card_statement_with_korean_headers(self):
+        self.add_expense(5000, aware(2026, 9, 1, 8, 30), merchant_name='김밥천국')
+        statement = '\n'.join([
+            '이용일시,이용가맹점,이용금액,승인구분,카드번호,승인번호',
+            '2026.09.01 08:30,김밥천국,"5,000",승인,****3456,',  # 기존 내역과 중복
+            '2026.09.02 12:00,스타벅스 강남점,"6,500원",승인,****3456,11110001',
+            '2026.09.02 12:00,스타벅스 강남점,"6,500원",승인,****3456,11110001',  # 파일 내 중복
+            '2026.09.03 19:00,오마카세,120000,승인취소,****3456,11110002',
+            '2026-13-01,잘못된 날짜,1000,승인,****3456,',
+            '2026.09.04,가게,천원,승인,****3456,',
+        ])
+        response = self.upload(statement, encoding='cp949')
+        self.assertEqual(response.status_code, 200)
+        result = response.data['result']
+        self.assertEqual((result['imported'], result['duplicates'], result['failed']), (2, 2, 2))
+        self.assertEqual([error['line'] for error in result['errors']], [6, 7])
+
+        starbucks = Expense.objects.get(approval_number='11110001')
+        self.assertEqual((starbucks.amount, starbucks.category, starbucks.user_card), (6500, self.cafe, self.user_card))
+        self.assertEqual(Expense.objects.get(approval_number='11110002').status, 'CANCELLED')
+        # bulk_create 후에도 롤업 반영 (취소 건 제외)
+        self.assertEqual(rollup.month_total(self.user, 2026, 9), 11500)
+
+    def test_exported_file_imports_as_duplicates(self):
+        for day in range(1, 6):
+            self.add_expense(1000 * day, aware(2026, 9, day, 12), approval_number=f'A{day}' if day % 2 else None)
+        exported = b''.join(self.client.get('/api/v1/expenses/export/').streaming_content).decode('utf-8')
+
+        result = importer.import_csv(self.user, io.StringIO(exported), chunk_size=2)
+        self.assertEqual((result['imported'], result['duplicates'], result['failed']), (0, 5, 0))
+
+    def test_missing_columns_save_nothing(self):
+        response = self.upload('가맹점명,이용금액\n스타벅스,5000\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('spent_at', response.data['message'])
+        self.assertEqual(self.upload('spent_at,merchant_name,amount\n', encoding='euc-kr').status_code, 400)
+        self.assertFalse(Expense.objects.exists())
+
+
+class CodefTokenProviderTests(TestCase):
+    """Codef 액세스 토큰 캐시 (만료 전 재사용, 미리 재발급, 실패 시 기존 토큰, 401 재발급)"""
+
+    def setUp(self):
+        self.key = token_provider._cache_key('client')
+        self.issued = iter(f'tok-{i}' for i in range(1, 10))
+
+    def token_response(self, *args, **kwargs):
+        return mock.Mock(**{'json.return_value': {'access_token': next(self.issued), 'expires_in': 3600}})
+
+    def cache_token(self, token, expires_in):
+        token_provider.cache.set(self.key, {'token': token, 'expires_at': time.time() + expires_in})
+
+    def test_reuses_token_until_refresh_margin(self):
+        with mock.patch.object(token_provider.transport, 'post', side_effect=self.token_response) as post:
+            self.assertEqual(token_provider.get_token('client', 'secret'), 'tok-1')
+            self.assertEqual(token_provider.get_token('client', 'secret'), 'tok-1')
+            self.assertEqual(post.call_count, 1)
+
+            # 만료 TOKEN_REFRESH_MARGIN 전이면 미리 재발급
+            self.cache_token('old', token_provider.TOKEN_REFRESH_MARGIN - 5)
+            self.assertEqual(token_provider.get_token('client', 'secret'), 'tok-2')
+
+    def test_refresh_in_progress_or_failed_keeps_cached_token(self):
+        self.cache_token('old', 60)
+        with mock.patch.object(token_provider.transport, 'post', side_effect=ConnectionError('down')) as post:
+            self.assertEqual(token_provider.get_token('client', 'secret'), 'old')
+            # 다른 요청이 발급 중(락)이면 발급 요청 없이 기존 토큰 사용
+            token_provider.cache.add(f'{self.key}:refresh', 1)
+            self.assertEqual(token_provider.get_token('client', 'secret'), 'old')
+        self.assertEqual(post.call_count, 1)
+
+        token_provider.cache.clear()
+        with mock.patch.object(token_provider.transport, 'post', side_effect=ConnectionError('down')):
+            with self.assertRaises(ConnectionError):
+                token_provider.get_token('client', 'secret')
+
+    def test_invalidate_only_matching_token(self):
+        self.cache_token('new', 3600)
+        token_provider.invalidate('client', 'stale')
+        self.assertEqual(token_provider.cache.get(self.key)['token'], 'new')
+        token_provider.invalidate('client', 'new')
+        self.assertIsNone(token_provider.cache.get(self.key))
+
+    @mock.patch.dict(os.environ, {'CODEF_CLIENT_ID': 'client', 'CODEF_CLIENT_SECRET': 'secret'})
+    def test_api_401_refreshes_token_once(self):
+        self.cache_token('revoked', 3600)
+        responses = {'card-list': iter([mock.Mock(status_code=401), mock.Mock(status_code=200)])}
+
+        def post(url, endpoint, **kwargs):
+            return self.token_response() if endpoint == 'token' else next(responses[endpoint])
+
+        service = CodefAPIService()
+        service.get_access_token()
+        with mock.patch.object(token_provider.transport, 'post', side_effect=post) as transport_post:
+            self.assertEqual(service._post('https://codef.test/card-list', {}, 'card-list').status_code, 200)
+        self.assertEqual(service.access_token, 'tok-1')
+        retried = transport_post.call_args_list[-1]
+        self.assertEqual(retried.kwargs['headers']['Authorization'], 'Bearer tok-1')
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Codef 대체 응답 (keep-alive 유지)"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = json.dumps({"result": {"code": "CF-00000"}, "data": []}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CodefTransportTests(SimpleTestCase):
+    """Codef 공유 연결 풀 (연결 재사용, 엔드포인트별 타임아웃)"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        host, port = cls.server.server_address
+        cls.url = f"http://{host}:{port}/v1/kr/card/p/account/approval-list"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        transport.close_session()
+        self.addCleanup(transport.close_session)
+
+    def test_sequential_requests_reuse_one_connection(self):
+        for _ in range(5):
+            self.assertEqual(transport.post(self.url, 'approval-list', json={}).json()['result']['code'], 'CF-00000')
+        [stats] = transport.pool_stats().values()
+        self.assertEqual((stats['connections'], stats['requests'], stats['idle']), (1, 5, 1))
+        self.assertIs(transport.get_session(), transport.get_session())
+
+    def test_endpoint_timeouts(self):
+        self.assertEqual(transport.timeout_for('account-create'), (transport.CONNECT_TIMEOUT, 60))
+        self.assertEqual(transport.timeout_for('unknown'), transport.DEFAULT_TIMEOUT)
+        with override_settings(CODEF_HTTP_TIMEOUTS={'card-list': (1, 2)}):
+            self.assertEqual(transport.timeout_for('card-list'), (1, 2))
+
+        with mock.patch.object(transport.get_session(), 'post') as post:
+            transport.post(self.url, 'billing-list', json={})
+        self.assertEqual(post.call_args.kwargs['timeout'], (transport.CONNECT_TIMEOUT, 30))
+
+
+def codef_response(body, status_code=200):
+    # [설명] Codef는 URL 인코딩된 JSON 본문을 반환
+    return httpx.Response(status_code, text=urllib.parse.quote(json.dumps(body)))
+
+
+class AsyncCodefClientTests(ExpenseTestCase):
+    """async Codef 클라이언트와 async 동기화 뷰 (응답 대기 중 이벤트 루프를 막지 않음)"""
+
+    ok = {'result': {'code': 'CF-00000'}, 'data': [approval('B1', 2, 4500), approval('B2', 3, 12000, merchant='이마트')]}
+
+    async def test_concurrent_requests_overlap(self):
+        async def apost(url, endpoint, **kwargs):
+            await asyncio.sleep(0.2)
+            return codef_response(self.ok)
+
+        service = AsyncCodefAPIService()
+        service.access_token = 'tok'
+        with mock.patch.object(transport, 'apost', side_effect=apost):
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                service.get_approval_list('0301', 'conn', '20260901', '20260930') for _ in range(5)
+            ))
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertTrue(all(result['success'] and len(result['data']) == 2 for result in results))
+
+    async def test_401_refreshes_token_once(self):
+        responses = iter([codef_response({}, status_code=401), codef_response(self.ok)])
+        service = AsyncCodefAPIService()
+        service.access_token = 'revoked'
+        with mock.patch.object(token_provider, 'aget_token', return_value='fresh') as aget_token, \
+                mock.patch.object(transport, 'apost', side_effect=lambda *args, **kwargs: next(responses)) as apost:
+            result = await service.get_approval_list('0301', 'conn', '20260901', '20260930')
+        self.assertTrue(result['success'])
+        aget_token.assert_awaited_once()
+        self.assertEqual(apost.call_args.kwargs['headers']['Authorization'], 'Bearer fresh')
+
+    async def test_request_payloads_match_sync_service(self):
+        calls = [
+            ('get_billing_list', ('0301', 'conn'), {'card_no': '1234', 'encrypted_card_password': 'sealed'}),
+            ('get_approval_list', ('0301', 'conn', '20260901', '20260930'), {'encrypted_card_password': 'sealed'}),
+        ]
+        for method, args, kwargs in calls:
+            with self.subTest(method=method):
+                sync_service, async_service = CodefAPIService(), AsyncCodefAPIService()
+                sync_service.access_token = async_service.access_token = 'tok'
+                with mock.patch.object(transport, 'post', return_value=codef_response(self.ok)) as post:
+                    getattr(sync_service, method)(*args, **kwargs)
+                with mock.patch.object(transport, 'apost', return_value=codef_response(self.ok)) as apost:
+                    await getattr(async_service, method)(*args, **kwargs)
+                self.assertEqual(apost.call_args.kwargs['json'], post.call_args.kwargs['json'])
+                self.assertEqual(apost.call_args.kwargs['json']['cardPassword'], 'sealed')
+
+    def test_async_approval_view_saves_expenses(self):
+        url = '/api/v1/codef/card/approval/'
+        params = {'organization': '0301', 'connected_id': 'conn', 'start_date': '20260901', 'end_date': '20260930'}
+        with mock.patch.object(transport, 'apost', return_value=codef_response(self.ok)):
+            response = self.client.post(url, params, format='json', HTTP_X_CODEF_TOKEN='tok')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['message'], 'Saved 2 transactions.')
+        self.assertEqual(rollup.month_total(self.user, 2026, 9), 16500)
+
+        response = self.client.post(url, {'organization': '0301'}, format='json', HTTP_X_CODEF_TOKEN='tok')
+        self.assertEqual(response.status_code, 400)
+
+        # X-Codef-Token이 없으면 공유 캐시 토큰 사용 (발급 실패 시 500)
+        with mock.patch.object(token_provider, 'aget_token', side_effect=ValueError('no token')):
+            self.assertEqual(self.client.post(url, params, format='json').status_code, 500)
+
+
+class CodefCryptoTests(SimpleTestCase):
+    """Codef 필드 RSA 암호화 (공개키 파싱 캐시, 일괄 암호화)와 서버 보관용 봉인"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = RSA.generate(2048)
+        cls.public_key = base64.b64encode(cls.private_key.publickey().export_key('DER')).decode()
+
+    def decrypt(self, value):
+        return PKCS1_v1_5.new(self.private_key).decrypt(base64.b64decode(value), None).decode()
+
+    def test_cipher_is_parsed_once_per_key(self):
+        crypto.get_cipher.cache_clear()
+        with mock.patch.object(crypto.RSA, 'importKey', wraps=crypto.RSA.importKey) as import_key:
+            self.assertIs(crypto.get_cipher(self.public_key), crypto.get_cipher(self.public_key))
+        import_key.assert_called_once()
+        with self.assertRaises(ValueError):
+            crypto.get_cipher(base64.b64encode(b'not a key').decode())
+
+    def test_encrypt_fields_keeps_empty_values(self):
+        encrypted = crypto.get_cipher(self.public_key).encrypt_fields({'password': 'pw!', 'identity': '', 'cardNo': '9410'})
+        self.assertEqual(encrypted['identity'], '')
+        self.assertEqual((self.decrypt(encrypted['password']), self.decrypt(encrypted['cardNo'])), ('pw!', '9410'))
+
+    def test_request_payload_encrypts_card_password(self):
+        with mock.patch.dict(os.environ, {'CODEF_CLIENT_PUBLIC': self.public_key}):
+            service = CodefAPIService()
+        payload = service._approval_list_payload('0301', 'conn', '20260901', '20260930', '9410', '37', '19900101', '0')
+        self.assertEqual(self.decrypt(payload['cardPassword']), '37')
+        # 동기화 작업에 저장된 암호문은 다시 암호화하지 않음
+        stored = service.encrypt_card_password('37')
+        payload = service._approval_list_payload('0301', 'conn', '20260901', '20260930', '', '', '', '0', stored)
+        self.assertEqual(payload['cardPassword'], stored)
+
+        with mock.patch.dict(os.environ, {'CODEF_CLIENT_PUBLIC': ''}):
+            with self.assertRaises(ValueError):
+                CodefAPIService().encrypt_card_password('37')
+
+    def test_seal_round_trip_and_tamper_detection(self):
+        sealed = crypto.seal('9410123456781234')
+        self.assertNotEqual(sealed, crypto.seal('9410123456781234'))  # nonce가 매번 다름
+        self.assertEqual(crypto.unseal(sealed), '9410123456781234')
+        self.assertEqual((crypto.seal(''), crypto.unseal('')), ('', ''))
+
+        raw = bytearray(base64.b64decode(sealed))
+        raw[-1] ^= 1
+        with self.assertRaises(ValueError):
+            crypto.unseal(base64.b64encode(bytes(raw)).decode())
+        with override_settings(SECRET_KEY='rotated'):
+            with self.assertRaises(ValueError):
+                crypto.unseal(sealed)
+        self.assertEqual(crypto.digest('37'), crypto.digest('37'))
+
+
+class UserCardMatcherTests(ExpenseTestCase):
+    """Codef 거래의 카드명/카드번호 → 보유 카드 매칭 (조회 한 번, 기존 매칭 규칙 유지)"""
+
+    def setUp(self):
+        super().setUp()
+        self.deep = UserCard.objects.create(
+            user=self.user, card=Card.objects.create(card_name='신한 Deep Dream', company='신한카드'),
+            card_number='9410-****-****-7777',
+        )
+        self.deep_copy = UserCard.objects.create(
+            user=self.user, card=Card.objects.create(card_name='Deep Dream 체크', company='신한카드'),
+        )
+
+    def test_matches_name_then_last4(self):
+        with self.assertNumQueries(1):
+            matcher = UserCardMatcher(self.user)
+            self.assertEqual(matcher.match('굿데이'), self.user_card)
+            self.assertEqual(matcher.match(' 신한deepdream '), self.deep)  # 대소문자/공백 무시
+            self.assertEqual(matcher.match('DEEP'), self.deep)  # 여러 카드면 먼저 등록한 카드
+            self.assertEqual(matcher.match('7777'), self.deep)
+            self.assertEqual(matcher.match('123456783456'), self.user_card)
+            self.assertIsNone(matcher.match('0000'))
+            self.assertIsNone(matcher.match(''))
+
+    def test_single_card_is_default(self):
+        other = User.objects.create_user(phone='01000000001', name='다른', password='pw')
+        only = UserCard.objects.create(user=other, card=self.card)
+        matcher = UserCardMatcher(other)
+        self.assertEqual((matcher.match('모르는 카드'), matcher.match(None)), (only, only))
+
+    def test_sync_assigns_cards_per_row(self):
+        rows = [approval('C1', 1, 1000), approval('C2', 2, 2000), {**approval('C3', 3, 3000), 'resCardName': '7777'}]
+        _save_approval_list(self.user, rows)
+        cards = dict(Expense.objects.values_list('approval_number', 'user_card'))
+        self.assertEqual(cards, {'C1': self.user_card.pk, 'C2': self.user_card.pk, 'C3': self.deep.pk})
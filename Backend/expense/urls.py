@@ -4,6 +4,8 @@ from .views import (
     DeleteSubscription,  # [설명] 구독 삭제 뷰
     ShowSubscription,  # [설명] 구독 목록 조회 뷰
     ShowExpense,  # [설명] 월간 지출 내역 조회 뷰
+    ExportExpenseView,  # [설명] 지출 내역 내보내기 뷰
+    ImportExpenseView,  # [설명] 지출 내역 가져오기 뷰
     # 홈화면용 신규 API
     AccumulatedDataView,
     DailySummaryView,
@@ -13,6 +15,10 @@ from .views import (
     CategorySummaryView,
     MonthComparisonView,
     CategoryDetailView,
+    DashboardView,
+    TrendView,
+    SpendingAnomalyView,
+    ForecastView,
 )
 
 urlpatterns = [
@@ -22,6 +28,8 @@ urlpatterns = [
     
     # 지출 내역 조회 (예: /api/expenses/?month=2026-01)
     path('expenses/', ShowExpense.as_view(), name='show-expense'),  # [설명] 월간 지출 내역 조회
+    path('expenses/export/', ExportExpenseView.as_view(), name='export-expense'),  # [설명] 지출 내역 내보내기 (CSV/NDJSON)
+    path('expenses/import/', ImportExpenseView.as_view(), name='import-expense'),  # [설명] 지출 내역 가져오기 (CSV 업로드)
     
     # 구독 목록 조회 및 삭제
     path('subscriptions/', ShowSubscription.as_view(), name='show-subscription'),  # [설명] 구독 목록 조회
@@ -51,4 +59,16 @@ urlpatterns = [
 
     # 8. 카테고리별 거래 상세
     path('transactions/category-detail', CategoryDetailView.as_view(), name='category-detail'),
+
+    # 9. 홈 대시보드 통합 (1~7 위젯을 한 번에)
+    path('transactions/dashboard', DashboardView.as_view(), name='dashboard'),
+
+    # 10. 월별 지출 추이 (예: ?from=2025-01&to=2025-12&group=category)
+    path('transactions/trend', TrendView.as_view(), name='trend'),
+
+    # 11. 카테고리별 이상 지출 (예: ?days=7)
+    path('transactions/anomalies', SpendingAnomalyView.as_view(), name='spending-anomalies'),
+
+    # 12. 월말 지출 예측 (예: ?year=2026&month=1)
+    path('transactions/forecast', ForecastView.as_view(), name='forecast'),
 ]
@@ -1,20 +1,32 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.db.models import Sum, Avg, Q
+from django.db.models import Sum, Avg, Count, Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from calendar import monthrange
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from .models import Expense, Subscription
+from . import rollup, home, pagination
+from . import export as export_service
+from . import importer as import_service
+from . import response_cache
+from . import distribution as distribution_service
+from . import monthly_stats
+from . import anomaly_detector
+from . import forecast
+from . import cohort as cohort_service
 from cards.models import CardBenefit, Card
 from users.models import UserCard
 from category.models import Category
 from .serializers import (
     AccumulatedDataSerializer, DailySummarySerializer, TransactionSerializer,
     WeeklyDataSerializer, MonthlyDataSerializer, CategoryDataSerializer,
-    MonthComparisonSerializer, CategoryDetailSerializer, CATEGORY_MAPPING
+    MonthComparisonSerializer, CategoryDetailSerializer, DashboardSerializer, TrendSerializer,
+    SpendingAnomalyListSerializer, ForecastSerializer, CATEGORY_MAPPING
 )
 
 # 1. 공통 Base 클래스 (인증 및 에러 응답 통일)
@@ -39,12 +51,16 @@ class BaseAuthView(APIView):
 class ConsumptionPatternAnalysisView(BaseAuthView):
     @extend_schema(
         summary="소비 패턴 분석",
-        description="특정 월의 지출을 그룹 평균과 비교하고 혜택 달성률 및 백분위를 분석합니다.",
+        description=(
+            "특정 월의 지출을 그룹 평균과 비교하고 혜택 달성률 및 백분위를 분석합니다. "
+            "cohort_comparison은 같은 연령대/성별 사용자와의 총지출·카테고리별 비교이며, 코호트 집계가 없으면 null입니다."
+        ),
         parameters=[
             OpenApiParameter(name='month', description='조회 대상 월 (YYYY-MM)', required=True, type=str)
         ],
         tags=['Expense']
     )
+    @response_cache.cached_response('consumption-analysis')
     def get(self, request): # 소비자에게 패턴 분석 데이터 제공
         user = request.user    # 인증된 사용자
         target_month = request.query_params.get('month') # YYYY-MM 형식
@@ -55,59 +71,34 @@ class ConsumptionPatternAnalysisView(BaseAuthView):
         try: # 년, 월 분리
             year, month = map(int, target_month.split('-'))
             
-            # 1. 내 지출 데이터 조회
-            my_expenses = Expense.objects.filter(
-                user=user, 
-                spent_at__year=year, 
-                spent_at__month=month,
-                deleted_at__isnull=True
-            )
-            
-            my_total_spent = my_expenses.aggregate(Sum('amount'))['amount__sum'] or 0 # 내 총 지출
+            # 1. 내 월별 통계 조회 (MonthlyStat, 없으면 즉시 구체화)
+            stat = monthly_stats.get_stat(user, year, month)
+            my_total_spent = stat.total_spent # 내 총 지출
 
             # 2. 그룹(전체 유저) 평균 및 백분위 계산
-            # 모든 유저의 해당 월 총 지출 리스트를 가져옴
-            all_user_totals = Expense.objects.filter(
-                spent_at__year=year, 
-                spent_at__month=month, 
-                deleted_at__isnull=True
-            ).values('user').annotate(user_total=Sum('amount')).order_by('user_total')
+            # 미리 계산된 월별 지출 분포(사용자별 총지출 분위수 + 평균)를 사용
+            distribution = distribution_service.get_distribution(year, month)
+            group_avg_spent = round(distribution.mean) or 1
 
-            total_users = all_user_totals.count()
-            group_avg_spent = all_user_totals.aggregate(Avg('user_total'))['user_total__avg'] or 1
-            
-            # 내 위치(백분위) 계산
-            my_rank = 0
-            for index, entry in enumerate(all_user_totals):
-                if entry['user_total'] >= my_total_spent:
-                    my_rank = index
-                    break
-            
-            # 백분위 (0~100, 낮을수록 적게 씀)
-            percentile = round((my_rank / total_users) * 100) if total_users > 0 else 0
+            # 백분위 (0~100, 낮을수록 적게 씀) - 분위수 이진 탐색
+            percentile = distribution.percentile_of(my_total_spent)
             diff_percent = round(((my_total_spent - group_avg_spent) / group_avg_spent) * 100, 1)
 
-            # 3. 실시간 혜택 달성률 계산 (게이지바용)
-            total_benefit_received = 0
+            # 3. 혜택 달성률 계산 (게이지바용, 혜택 금액은 MonthlyStat에 구체화된 값)
+            total_benefit_received = stat.total_benefit
             user_benefits = CardBenefit.objects.filter(card__usercard__user=user)
-            
-            for benefit in user_benefits: # 각 혜택별로 계산, 필터로 기준 정함
-                cat_expense = my_expenses.filter(category=benefit.category).aggregate(Sum('amount'))['amount__sum'] or 0
-                if cat_expense > 0:
-                    raw_benefit = cat_expense * (float(benefit.benefit_rate) / 100)
-                    total_benefit_received += min(raw_benefit, benefit.benefit_limit or raw_benefit)
 
             max_limit = user_benefits.aggregate(Sum('benefit_limit'))['benefit_limit__sum'] or 1
             achievement_rate = round((total_benefit_received / max_limit) * 100, 1)
 
             # 4. 카드별 사용 내역 집계 (화면 하단 카드용)
-            # UserCard 별로 Expense group by sum
-            user_card_usage = my_expenses.values(
+            # UserCard 별로 일별 롤업 group by sum
+            user_card_usage = rollup.month_rollups(user, year, month).values(
                 'user_card__card__card_name', 
                 'user_card__card_number', 
                 'user_card__card__card_image_url',
                 'user_card__card__company'
-            ).annotate(total_amount=Sum('amount')).order_by('-total_amount')
+            ).annotate(total_amount=Sum('total_amount')).order_by('-total_amount')
 
             cards_usage = []
             for usage in user_card_usage:
@@ -124,8 +115,19 @@ class ConsumptionPatternAnalysisView(BaseAuthView):
                 })
             
             # 최소 2개 이상의 카드가 필요하다면, 없으면 빈 리스트 혹은 더미(현재는 DB실제값만)
-            
-            # 5. JSON 응답 (사용자 요구 형식 반영)
+
+            # 5. 같은 연령대/성별 코호트와 비교 (미리 계산된 코호트 집계 한 행 조회, 없으면 null)
+            cohort_comparison = None
+            cohort = cohort_service.get_cohort(user, year, month)
+            if cohort is not None:
+                my_categories = {
+                    (row['category__category_name'] or "기타"): row['total']
+                    for row in rollup.month_rollups(user, year, month)
+                    .values('category__category_name').annotate(total=Sum('total_amount')).order_by()
+                }
+                cohort_comparison = cohort_service.build_comparison(cohort, my_total_spent, my_categories)
+
+            # 6. JSON 응답 (사용자 요구 형식 반영)
             return Response({
                 "message": "소비 패턴 분석 데이터 조회 성공",
                 "result": {
@@ -142,7 +144,8 @@ class ConsumptionPatternAnalysisView(BaseAuthView):
                         "max_benefit_limit": max_limit,
                         "achievement_rate": min(achievement_rate, 100.0) # 100% 초과 방지
                     },
-                    "cards_usage": cards_usage
+                    "cards_usage": cards_usage,
+                    "cohort_comparison": cohort_comparison
                 }
             }, status=200)
 
@@ -175,12 +178,18 @@ class DeleteSubscription(BaseAuthView):
 class ShowExpense(BaseAuthView):
     @extend_schema(
         summary="월간 소비 내역 조회",
-        description="특정 월의 전체 소비 내역 리스트를 조회합니다.",
+        description=(
+            "특정 월의 소비 내역을 최신순으로 페이지 단위 조회합니다. "
+            "응답의 next_cursor를 cursor로 넘기면 다음 페이지를 조회하며, 합계/건수는 월 전체 기준입니다."
+        ),
         parameters=[
-            OpenApiParameter(name='month', description='조회 대상 월 (YYYY-MM)', required=True, type=str)
+            OpenApiParameter(name='month', description='조회 대상 월 (YYYY-MM)', required=True, type=str),
+            OpenApiParameter(name='cursor', description='이전 응답의 next_cursor', required=False, type=str),
+            OpenApiParameter(name='page_size', description=f'페이지 크기 (기본 {pagination.DEFAULT_PAGE_SIZE}, 최대 {pagination.MAX_PAGE_SIZE})', required=False, type=int)
         ],
         tags=['Expense']
     )
+    @response_cache.cached_response('show-expense')
     def get(self, request):
         target_month = request.query_params.get('month')
         if not target_month:
@@ -188,31 +197,133 @@ class ShowExpense(BaseAuthView):
 
         try:
             year, month = map(int, target_month.split('-'))
-            expenses = Expense.objects.filter(
-                user=request.user, spent_at__year=year, spent_at__month=month, deleted_at__isnull=True
-            ).select_related('category', 'user_card__card')
-
-            total_spent = expenses.aggregate(total=Sum('amount'))['total'] or 0
+            page_size = pagination.parse_page_size(request.query_params.get('page_size'))
+            expenses = Expense.objects.for_month(request.user, year, month)
+
+            # 합계/건수는 목록과 별도로 집계 (인덱스만으로 처리)
+            summary = expenses.aggregate(total=Sum('amount'), count=Count('expense_id'))
+            rows, next_cursor = pagination.paginate(
+                expenses,
+                ['merchant_name', 'amount', 'category__category_name', 'user_card__card__card_name'],
+                cursor=request.query_params.get('cursor'),
+                page_size=page_size
+            )
             expense_list = [{
-                "expense_id": e.expense_id,
-                "merchant_name": e.merchant_name,
-                "amount": e.amount,
-                "spent_at": e.spent_at.strftime("%Y-%m-%dT%H:%M:%S"),
-                "category_name": e.category.category_name if e.category else "미분류",
-                "card_name": e.user_card.card.card_name if e.user_card else "기타"
-            } for e in expenses]
+                "expense_id": row['expense_id'],
+                "merchant_name": row['merchant_name'],
+                "amount": row['amount'],
+                "spent_at": row['spent_at'].strftime("%Y-%m-%dT%H:%M:%S"),
+                "category_name": row['category__category_name'] or "미분류",
+                "card_name": row['user_card__card__card_name'] or "기타"
+            } for row in rows]
 
             return Response({
                 "message": "월간 지출 내역 조회 성공",
-                "result": {"total_spent": total_spent, "expense_list": expense_list}
+                "result": {
+                    "total_spent": summary['total'] or 0,
+                    "total_count": summary['count'],
+                    "expense_list": expense_list,
+                    "next_cursor": next_cursor
+                }
             }, status=200)
         except Exception as e:
             return Response({"message": str(e)}, status=400)
 
 
+# 4-1. 소비 내역 내보내기 (CSV / NDJSON 스트리밍)
+class ExportExpenseView(BaseAuthView):
+    @extend_schema(
+        summary="소비 내역 내보내기",
+        description=(
+            "전체 또는 기간/카테고리로 필터링한 소비 내역을 CSV 또는 NDJSON으로 스트리밍합니다. "
+            "행을 나눠 읽으며 바로 전송하므로 기간이 길어도 메모리 사용량이 일정합니다."
+        ),
+        parameters=[
+            OpenApiParameter(name='type', description='파일 형식 (csv, ndjson / 기본 csv)', required=False, type=str),
+            OpenApiParameter(name='from', description='시작 날짜 (YYYY-MM-DD, 포함)', required=False, type=str),
+            OpenApiParameter(name='to', description='종료 날짜 (YYYY-MM-DD, 포함)', required=False, type=str),
+            OpenApiParameter(name='category_name', description='카테고리명 필터', required=False, type=str)
+        ],
+        tags=['Expense']
+    )
+    def get(self, request):
+        # [설명] DRF가 format 파라미터를 렌더러 선택에 사용하므로 형식은 type으로 받음
+        export_format = request.query_params.get('type', 'csv')
+        if export_format not in export_service.EXPORT_FORMATS:
+            return Response({"message": "type은 csv 또는 ndjson이어야 합니다."}, status=400)
+
+        try:
+            start = request.query_params.get('from')
+            end = request.query_params.get('to')
+            start = datetime.strptime(start, '%Y-%m-%d').date() if start else None
+            end = datetime.strptime(end, '%Y-%m-%d').date() + timedelta(days=1) if end else None
+        except ValueError:
+            return Response({"message": "from/to는 YYYY-MM-DD 형식이어야 합니다."}, status=400)
+
+        queryset = export_service.export_queryset(
+            request.user, start, end, request.query_params.get('category_name')
+        )
+        # [설명] ASGI(uvicorn)는 async 이터레이터만 버퍼링 없이 전송하므로 서버 방식에 맞는 제너레이터 사용
+        iter_export = export_service.aiter_export if isinstance(request._request, ASGIRequest) else export_service.iter_export
+        response = StreamingHttpResponse(
+            iter_export(queryset, export_format),
+            content_type=export_service.EXPORT_FORMATS[export_format]
+        )
+        filename = f"expenses_{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+# 4-2. 소비 내역 가져오기 (CSV 명세서 업로드)
+class ImportExpenseView(BaseAuthView):
+    @extend_schema(
+        summary="소비 내역 가져오기",
+        description=(
+            "Codef가 지원하지 않는 카드의 CSV 명세서를 업로드해 소비 내역으로 저장합니다. "
+            "필수 컬럼은 spent_at(이용일시), merchant_name(가맹점명), amount(이용금액)이며 내보내기 CSV도 그대로 가져올 수 있습니다. "
+            "이미 저장된 내역(승인번호 또는 결제 시각+가맹점명+금액 기준)은 건너뜁니다."
+        ),
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'file': {'type': 'string', 'format': 'binary', 'description': 'CSV 파일'},
+                    'user_card_id': {'type': 'integer', 'description': '카드를 찾지 못한 행에 사용할 보유 카드 ID (선택)'},
+                    'encoding': {'type': 'string', 'description': '파일 인코딩 (utf-8, cp949 / 기본 utf-8)'},
+                },
+                'required': ['file'],
+            }
+        },
+        tags=['Expense']
+    )
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"message": "file이 필요합니다."}, status=400)
+        if upload.size > import_service.IMPORT_MAX_FILE_SIZE:
+            return Response({"message": "파일은 20MB 이하여야 합니다."}, status=400)
+
+        try:
+            user_card_id = request.data.get('user_card_id')
+            user_card_id = int(user_card_id) if user_card_id else None
+        except ValueError:
+            return Response({"message": "user_card_id는 정수여야 합니다."}, status=400)
+
+        try:
+            stream = import_service.open_upload(upload.file, request.data.get('encoding', 'utf-8'))
+            result = import_service.import_csv(request.user, stream, user_card_id)
+        except import_service.ImportFormatError as e:
+            return Response({"message": str(e)}, status=400)
+        except Exception as e:
+            return Response({"message": f"가져오기 실패: {str(e)}"}, status=500)
+
+        return Response({"message": "가져오기 완료", "result": result}, status=200)
+
+
 # 5. 구독 내역 조회 (보안 및 데이터 보완 버전)
 class ShowSubscription(BaseAuthView):
     @extend_schema(summary="구독 내역 조회", description="사용자의 활성 구독 목록을 조회합니다.", tags=['Expense'])
+    @response_cache.cached_response('show-subscription')
     def get(self, request):
         try:
             # 결제일이 가까운 순서로 정렬 추가
@@ -259,6 +370,7 @@ class AccumulatedDataView(BaseAuthView):
         responses={200: AccumulatedDataSerializer},
         tags=['Home']
     )
+    @response_cache.cached_response('accumulated-data')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -268,36 +380,9 @@ class AccumulatedDataView(BaseAuthView):
 
         try:
             user = request.user
-            expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                deleted_at__isnull=True
-            ).order_by('spent_at')
 
-            # 일별 지출 집계
-            daily_totals = {}
-            for expense in expenses:
-                day = expense.spent_at.day
-                daily_totals[day] = daily_totals.get(day, 0) + expense.amount
-
-            # 누적 합계 계산
-            daily_data = []
-            accumulated = 0
-            days_in_month = monthrange(year, month)[1]
-            
-            for day in range(1, days_in_month + 1):
-                daily_amount = daily_totals.get(day, 0)
-                accumulated += daily_amount
-                daily_data.append({
-                    "day": day,
-                    "amount": float(accumulated)
-                })
-
-            result = {
-                "total": accumulated,
-                "dailyData": daily_data
-            }
+            # 일별/누적 합계를 DB에서 계산 (일별 롤업 + 윈도 함수, 최대 31행)
+            result = home.build_accumulated(rollup.day_series(user, year, month))
 
             serializer = AccumulatedDataSerializer(result)
             return Response(serializer.data, status=200)
@@ -318,6 +403,7 @@ class DailySummaryView(BaseAuthView):
         responses={200: DailySummarySerializer},
         tags=['Home']
     )
+    @response_cache.cached_response('daily-summary')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -327,20 +413,9 @@ class DailySummaryView(BaseAuthView):
 
         try:
             user = request.user
-            expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                deleted_at__isnull=True
-            )
 
-            # 일별 합계
-            daily_expenses = {}
-            for expense in expenses:
-                day = expense.spent_at.day
-                daily_expenses[str(day)] = daily_expenses.get(str(day), 0) + expense.amount
-
-            result = {"expenses": daily_expenses}
+            # 일별 합계 (일별 롤업 + 윈도 함수)
+            result = home.build_daily_summary(rollup.day_series(user, year, month))
             serializer = DailySummarySerializer(result)
             return Response(serializer.data, status=200)
 
@@ -360,6 +435,7 @@ class DailyDetailView(BaseAuthView):
         ],
         tags=['Home']
     )
+    @response_cache.cached_response('daily-detail')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -370,13 +446,7 @@ class DailyDetailView(BaseAuthView):
 
         try:
             user = request.user
-            expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                spent_at__day=day,
-                deleted_at__isnull=True
-            ).select_related('category').order_by('-spent_at')
+            expenses = Expense.objects.for_day(user, year, month, day).select_related('category').order_by('-spent_at')
 
             transactions = []
             for expense in expenses:
@@ -408,6 +478,7 @@ class WeeklyAverageView(BaseAuthView):
         responses={200: WeeklyDataSerializer},
         tags=['Home']
     )
+    @response_cache.cached_response('weekly-average')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -417,22 +488,11 @@ class WeeklyAverageView(BaseAuthView):
 
         try:
             user = request.user
-            
-            # 해당 월의 총 지출
-            total_spent = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                deleted_at__isnull=True
-            ).aggregate(total=Sum('amount'))['total'] or 0
 
-            # 해당 월의 주 수 계산 (대략 4주로 계산)
-            days_in_month = monthrange(year, month)[1]
-            weeks = days_in_month / 7
-            
-            average = int(total_spent / weeks) if weeks > 0 else 0
+            # 해당 월의 총 지출을 주 수(일수 / 7)로 나눈 값
+            total_spent = rollup.month_total(user, year, month)
+            result = home.build_weekly_average(total_spent, year, month)
 
-            result = {"average": average}
             serializer = WeeklyDataSerializer(result)
             return Response(serializer.data, status=200)
 
@@ -452,6 +512,7 @@ class MonthlyAverageView(BaseAuthView):
         responses={200: MonthlyDataSerializer},
         tags=['Home']
     )
+    @response_cache.cached_response('monthly-average')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -463,21 +524,15 @@ class MonthlyAverageView(BaseAuthView):
             user = request.user
             current_date = datetime(year, month, 1)
             
-            # 최근 6개월 데이터 집계
-            monthly_totals = []
-            for i in range(6):
-                target_date = current_date - relativedelta(months=i)
-                month_total = Expense.objects.filter(
-                    user=user,
-                    spent_at__year=target_date.year,
-                    spent_at__month=target_date.month,
-                    deleted_at__isnull=True
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                monthly_totals.append(month_total)
-
-            average = int(sum(monthly_totals) / len(monthly_totals)) if monthly_totals else 0
-
-            result = {"average": average}
+            # 최근 6개월 월별 합계 (월별 추이와 같은 단일 GROUP BY 쿼리)
+            start_date = current_date - relativedelta(months=5)
+            months = home.month_range(start_date.year, start_date.month, year, month)
+            rows = rollup.monthly_trend(
+                user, start_date.date(), (current_date + relativedelta(months=1)).date()
+            )
+            trend = home.build_trend(rows, months, 'none')
+
+            result = home.build_monthly_average(trend['totals'])
             serializer = MonthlyDataSerializer(result)
             return Response(serializer.data, status=200)
 
@@ -496,6 +551,7 @@ class CategorySummaryView(BaseAuthView):
         ],
         tags=['Home']
     )
+    @response_cache.cached_response('category-summary')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -506,60 +562,12 @@ class CategorySummaryView(BaseAuthView):
         try:
             user = request.user
             
-            # 이번 달 카테고리별 지출
-            current_expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                deleted_at__isnull=True
-            ).values('category__category_name').annotate(
-                total=Sum('amount')
-            )
-
-            # 전월 카테고리별 지출
+            # 이번 달/전월 카테고리별 지출 (대시보드 categorySummary와 같은 일별 롤업 기준)
             prev_date = datetime(year, month, 1) - relativedelta(months=1)
-            prev_expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=prev_date.year,
-                spent_at__month=prev_date.month,
-                deleted_at__isnull=True
-            ).values('category__category_name').annotate(
-                total=Sum('amount')
-            )
+            current_totals = rollup.month_category_totals(user, year, month)
+            prev_totals = rollup.month_category_totals(user, prev_date.year, prev_date.month)
 
-            # 전월 데이터를 딕셔너리로 변환
-            prev_dict = {item['category__category_name']: item['total'] for item in prev_expenses}
-            
-            # 이번 달 총 지출
-            total_spent = sum(item['total'] for item in current_expenses) or 1
-
-            categories = []
-            for item in current_expenses:
-                category_name = item['category__category_name'] or "기타"
-                current_amount = item['total']
-                prev_amount = prev_dict.get(category_name, 0)
-                change = current_amount - prev_amount
-                percent = int((current_amount / total_spent) * 100)
-                
-                category_info = CATEGORY_MAPPING.get(category_name, {
-                    'emoji': '🏷️',
-                    'color': '#757575',
-                    'en_name': 'other'
-                })
-
-                categories.append({
-                    "name": category_name,
-                    "emoji": category_info['emoji'],
-                    "amount": current_amount,
-                    "change": change,
-                    "percent": percent,
-                    "color": category_info['color']
-                })
-
-            # 금액순 정렬
-            categories.sort(key=lambda x: x['amount'], reverse=True)
-
-            return Response({"categories": categories}, status=200)
+            return Response(home.build_category_summary(current_totals, prev_totals), status=200)
 
         except Exception as e:
             return Response({"message": f"데이터 조회 실패: {str(e)}"}, status=500)
@@ -577,6 +585,7 @@ class MonthComparisonView(BaseAuthView):
         responses={200: MonthComparisonSerializer},
         tags=['Home']
     )
+    @response_cache.cached_response('month-comparison')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -587,59 +596,14 @@ class MonthComparisonView(BaseAuthView):
         try:
             user = request.user
             current_date = datetime(year, month, 1)
-            today = datetime.now()
-            current_day = today.day if today.year == year and today.month == month else monthrange(year, month)[1]
-
-            # 이번 달 일별 누적 데이터
-            this_month_expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                deleted_at__isnull=True
-            ).order_by('spent_at')
-
-            this_month_daily = {}
-            for expense in this_month_expenses:
-                day = expense.spent_at.day
-                this_month_daily[day] = this_month_daily.get(day, 0) + expense.amount
+            current_day = home.comparison_day(year, month)
 
-            this_month_data = []
-            accumulated = 0
-            for day in range(1, current_day + 1):
-                accumulated += this_month_daily.get(day, 0)
-                this_month_data.append({"day": day, "amount": float(accumulated)})
-
-            this_month_total = accumulated
-
-            # 지난 달 같은 날짜까지의 누적 데이터
+            # 이번 달과 지난 달의 1일~기준일 누적 곡선 (DB 윈도 함수로 계산)
             prev_date = current_date - relativedelta(months=1)
-            prev_expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=prev_date.year,
-                spent_at__month=prev_date.month,
-                spent_at__day__lte=current_day,
-                deleted_at__isnull=True
-            ).order_by('spent_at')
-
-            prev_daily = {}
-            for expense in prev_expenses:
-                day = expense.spent_at.day
-                prev_daily[day] = prev_daily.get(day, 0) + expense.amount
-
-            last_month_data = []
-            accumulated = 0
-            for day in range(1, current_day + 1):
-                accumulated += prev_daily.get(day, 0)
-                last_month_data.append({"day": day, "amount": float(accumulated)})
+            this_series = rollup.day_series(user, year, month, current_day)
+            prev_series = rollup.day_series(user, prev_date.year, prev_date.month, current_day)
 
-            last_month_same_day = accumulated
-
-            result = {
-                "thisMonthTotal": this_month_total,
-                "lastMonthSameDay": last_month_same_day,
-                "thisMonthData": this_month_data,
-                "lastMonthData": last_month_data
-            }
+            result = home.build_month_comparison(this_series, prev_series)
 
             serializer = MonthComparisonSerializer(result)
             return Response(serializer.data, status=200)
@@ -652,15 +616,21 @@ class MonthComparisonView(BaseAuthView):
 class CategoryDetailView(BaseAuthView):
     @extend_schema(
         summary="카테고리별 거래 상세 내역",
-        description="특정 월의 특정 카테고리에 해당하는 모든 거래 내역을 반환합니다.",
+        description=(
+            "특정 월의 특정 카테고리 거래 내역을 최신순으로 페이지 단위 반환합니다. "
+            "total_amount/transaction_count는 페이지와 무관하게 월 전체 기준입니다."
+        ),
         parameters=[
             OpenApiParameter(name='year', description='연도', required=True, type=int),
             OpenApiParameter(name='month', description='월', required=True, type=int),
-            OpenApiParameter(name='category_name', description='카테고리명 (예: 온라인쇼핑)', required=True, type=str)
+            OpenApiParameter(name='category_name', description='카테고리명 (예: 온라인쇼핑)', required=True, type=str),
+            OpenApiParameter(name='cursor', description='이전 응답의 next_cursor', required=False, type=str),
+            OpenApiParameter(name='page_size', description=f'페이지 크기 (기본 {pagination.DEFAULT_PAGE_SIZE}, 최대 {pagination.MAX_PAGE_SIZE})', required=False, type=int)
         ],
         responses={200: CategoryDetailSerializer},
         tags=['Home']
     )
+    @response_cache.cached_response('category-detail')
     def get(self, request):
         try:
             year = int(request.query_params.get('year'))
@@ -672,27 +642,36 @@ class CategoryDetailView(BaseAuthView):
         if not category_name:
             return Response({"message": "category_name 파라미터가 필요합니다."}, status=400)
 
+        try:
+            page_size = pagination.parse_page_size(request.query_params.get('page_size'))
+        except ValueError:
+            return Response({"message": "page_size는 1 이상의 정수여야 합니다."}, status=400)
+
         try:
             user = request.user
-            expenses = Expense.objects.filter(
-                user=user,
-                spent_at__year=year,
-                spent_at__month=month,
-                category__category_name=category_name,
-                deleted_at__isnull=True
-            ).select_related('category', 'user_card__card').order_by('-spent_at')
+            expenses = Expense.objects.for_month(user, year, month).filter(
+                category__category_name=category_name
+            )
 
-            transactions = []
-            total_amount = 0
-            for expense in expenses:
-                total_amount += expense.amount
-                transactions.append({
-                    "expense_id": expense.expense_id,
-                    "merchant_name": expense.merchant_name,
-                    "amount": expense.amount,
-                    "spent_at": expense.spent_at,
-                    "card_name": expense.user_card.card.card_name if expense.user_card and expense.user_card.card else "기타"
-                })
+            # 합계/건수는 목록과 별도로 집계
+            summary = expenses.aggregate(total=Sum('amount'), count=Count('expense_id'))
+            try:
+                rows, next_cursor = pagination.paginate(
+                    expenses,
+                    ['merchant_name', 'amount', 'user_card__card__card_name'],
+                    cursor=request.query_params.get('cursor'),
+                    page_size=page_size
+                )
+            except ValueError as e:
+                return Response({"message": str(e)}, status=400)
+
+            transactions = [{
+                "expense_id": row['expense_id'],
+                "merchant_name": row['merchant_name'],
+                "amount": row['amount'],
+                "spent_at": row['spent_at'],
+                "card_name": row['user_card__card__card_name'] or "기타"
+            } for row in rows]
 
             category_info = CATEGORY_MAPPING.get(category_name, {
                 'emoji': '🏷️',
@@ -704,9 +683,10 @@ class CategoryDetailView(BaseAuthView):
                 "category_name": category_name,
                 "emoji": category_info['emoji'],
                 "color": category_info['color'],
-                "total_amount": total_amount,
-                "transaction_count": len(transactions),
-                "transactions": transactions
+                "total_amount": summary['total'] or 0,
+                "transaction_count": summary['count'],
+                "transactions": transactions,
+                "next_cursor": next_cursor
             }
 
             serializer = CategoryDetailSerializer(result)
@@ -714,3 +694,195 @@ class CategoryDetailView(BaseAuthView):
 
         except Exception as e:
             return Response({"message": f"데이터 조회 실패: {str(e)}"}, status=500)
+
+
+# 14. 홈 대시보드 통합 API
+class DashboardView(BaseAuthView):
+    @extend_schema(
+        summary="홈 대시보드 통합 조회",
+        description=(
+            "누적 데이터, 일별 요약, 주간/월간 평균, 카테고리 요약, 월간 비교, 월말 예측을 한 번에 반환합니다. "
+            "최근 6개월 일별 롤업을 한 번만 조회하여 모든 위젯을 계산합니다."
+        ),
+        parameters=[
+            OpenApiParameter(name='year', description='연도', required=True, type=int),
+            OpenApiParameter(name='month', description='월', required=True, type=int)
+        ],
+        responses={200: DashboardSerializer},
+        tags=['Home']
+    )
+    @response_cache.cached_response('dashboard')
+    def get(self, request):
+        try:
+            year = int(request.query_params.get('year'))
+            month = int(request.query_params.get('month'))
+        except (TypeError, ValueError):
+            return Response({"message": "year와 month 파라미터가 필요합니다."}, status=400)
+
+        try:
+            user = request.user
+            current_date = datetime(year, month, 1)
+            prev_date = current_date - relativedelta(months=1)
+            window_months = [current_date - relativedelta(months=i) for i in range(6)]
+
+            this_key = (year, month)
+            prev_key = (prev_date.year, prev_date.month)
+            monthly_totals = {(d.year, d.month): 0 for d in window_months}
+            this_daily, prev_daily = {}, {}
+            this_categories, prev_categories = {}, {}
+
+            # 최근 6개월(이번 달/전월 포함) 일별·카테고리별 합계를 한 번에 조회
+            rows = rollup.daily_category_totals(
+                user,
+                window_months[-1].date(),
+                current_date.replace(day=monthrange(year, month)[1]).date()
+            )
+            for row in rows:
+                day, category_name, amount = row['day'], row['category__category_name'], row['total']
+                key = (day.year, day.month)
+                monthly_totals[key] += amount
+
+                if key == this_key:
+                    this_daily[day.day] = this_daily.get(day.day, 0) + amount
+                    this_categories[category_name] = this_categories.get(category_name, 0) + amount
+                elif key == prev_key:
+                    prev_daily[day.day] = prev_daily.get(day.day, 0) + amount
+                    prev_categories[category_name] = prev_categories.get(category_name, 0) + amount
+
+            current_day = home.comparison_day(year, month)
+            this_series = home.day_series_from_totals(this_daily, monthrange(year, month)[1])
+            result = {
+                "accumulated": home.build_accumulated(this_series),
+                "dailySummary": home.build_daily_summary(this_series),
+                "weeklyAverage": home.build_weekly_average(monthly_totals[this_key], year, month),
+                "monthlyAverage": home.build_monthly_average(list(monthly_totals.values())),
+                "categorySummary": home.build_category_summary(this_categories, prev_categories),
+                "monthComparison": home.build_month_comparison(
+                    home.day_series_from_totals(this_daily, current_day),
+                    home.day_series_from_totals(prev_daily, current_day)
+                ),
+                # 조회한 6개월 구간이 예측에 필요한 최근 84일을 포함하므로 같은 행을 재사용
+                "forecast": forecast.build_forecast(rows, year, month),
+            }
+
+            serializer = DashboardSerializer(result)
+            return Response(serializer.data, status=200)
+
+        except Exception as e:
+            return Response({"message": f"데이터 조회 실패: {str(e)}"}, status=500)
+
+
+# 15. 월별 지출 추이 API
+class TrendView(BaseAuthView):
+    MAX_MONTHS = 36  # [설명] 한 번에 조회 가능한 최대 개월 수
+
+    @extend_schema(
+        summary="월별 지출 추이",
+        description=(
+            "from~to 기간의 월별 지출 합계를 반환합니다. group=category|card 이면 그룹별 월별 시계열도 함께 반환합니다. "
+            "일별 롤업을 월 단위로 한 번만 GROUP BY 하여 계산하며, 지출이 없는 달은 0으로 채웁니다."
+        ),
+        parameters=[
+            OpenApiParameter(name='from', description='시작 월 (YYYY-MM)', required=True, type=str),
+            OpenApiParameter(name='to', description='종료 월 (YYYY-MM, 포함)', required=True, type=str),
+            OpenApiParameter(name='group', description='그룹 기준 (none, category, card)', required=False, type=str),
+        ],
+        responses={200: TrendSerializer},
+        tags=['Home']
+    )
+    @response_cache.cached_response('trend')
+    def get(self, request):
+        try:
+            start_date = datetime.strptime(request.query_params.get('from', ''), '%Y-%m')
+            end_date = datetime.strptime(request.query_params.get('to', ''), '%Y-%m')
+        except ValueError:
+            return Response({"message": "from과 to 파라미터가 필요합니다. (YYYY-MM)"}, status=400)
+
+        group = request.query_params.get('group', 'none')
+        if group not in rollup.TREND_GROUP_FIELDS:
+            return Response({"message": "group은 none, category, card 중 하나여야 합니다."}, status=400)
+
+        months = home.month_range(start_date.year, start_date.month, end_date.year, end_date.month)
+        if not months:
+            return Response({"message": "from은 to보다 이후일 수 없습니다."}, status=400)
+        if len(months) > self.MAX_MONTHS:
+            return Response({"message": f"최대 {self.MAX_MONTHS}개월까지 조회할 수 있습니다."}, status=400)
+
+        try:
+            rows = rollup.monthly_trend(
+                request.user, start_date.date(), (end_date + relativedelta(months=1)).date(), group
+            )
+            result = home.build_trend(rows, months, group)
+            serializer = TrendSerializer(result)
+            return Response(serializer.data, status=200)
+
+        except Exception as e:
+            return Response({"message": f"데이터 조회 실패: {str(e)}"}, status=500)
+
+
+# 16. 카테고리별 이상 지출 조회 API
+class SpendingAnomalyView(BaseAuthView):
+    MAX_DAYS = 90  # [설명] 조회 가능한 최대 기간 (일)
+
+    @extend_schema(
+        summary="카테고리별 이상 지출",
+        description=(
+            "최근 days일 안에 평소보다 크게 벗어난 결제가 있었던 카테고리를 표준점수 내림차순으로 반환합니다. "
+            "카테고리별 결제 금액의 지수가중 이동평균/분산은 Codef 동기화 시 증분 갱신되며, 조회 시 이력을 다시 읽지 않습니다."
+        ),
+        parameters=[
+            OpenApiParameter(name='days', description=f'조회 기간 (일, 기본 {anomaly_detector.DEFAULT_WINDOW_DAYS}, 최대 90)', required=False, type=int),
+        ],
+        responses={200: SpendingAnomalyListSerializer},
+        tags=['Home']
+    )
+    @response_cache.cached_response('anomalies')
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', anomaly_detector.DEFAULT_WINDOW_DAYS))
+        except ValueError:
+            return Response({"message": "days는 정수여야 합니다."}, status=400)
+        if not 1 <= days <= self.MAX_DAYS:
+            return Response({"message": f"days는 1~{self.MAX_DAYS} 사이여야 합니다."}, status=400)
+
+        try:
+            result = {"days": days, "anomalies": anomaly_detector.current_anomalies(request.user, days)}
+            serializer = SpendingAnomalyListSerializer(result)
+            return Response(serializer.data, status=200)
+
+        except Exception as e:
+            return Response({"message": f"데이터 조회 실패: {str(e)}"}, status=500)
+
+
+# 17. 월말 지출 예측 API
+class ForecastView(BaseAuthView):
+    @extend_schema(
+        summary="월말 지출 예측",
+        description=(
+            "기준일(이번 달이면 오늘)까지의 실제 지출에 남은 날짜의 예상 지출을 더한 월말 지출과 90% 신뢰 구간을 "
+            "전체/카테고리별로 반환합니다. 최근 12주 일별 롤업에서 요일별 지수와 최근 4주 평균을 계산합니다."
+        ),
+        parameters=[
+            OpenApiParameter(name='year', description='연도', required=True, type=int),
+            OpenApiParameter(name='month', description='월', required=True, type=int)
+        ],
+        responses={200: ForecastSerializer},
+        tags=['Home']
+    )
+    @response_cache.cached_response('forecast')
+    def get(self, request):
+        try:
+            year = int(request.query_params.get('year'))
+            month = int(request.query_params.get('month'))
+            start, end = forecast.query_range(year, month)
+        except (TypeError, ValueError):
+            return Response({"message": "year와 month 파라미터가 필요합니다."}, status=400)
+
+        try:
+            rows = rollup.daily_category_totals(request.user, start, end)
+            result = forecast.build_forecast(rows, year, month)
+            serializer = ForecastSerializer(result)
+            return Response(serializer.data, status=200)
+
+        except Exception as e:
+            return Response({"message": f"데이터 조회 실패: {str(e)}"}, status=500)
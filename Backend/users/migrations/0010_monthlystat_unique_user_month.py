@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_user_birth_date'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='monthlystat',
+            constraint=models.UniqueConstraint(fields=('user', 'target_month'), name='uniq_monthly_stat_user_month'),
+        ),
+    ]
@@ -67,4 +67,8 @@ class MonthlyStat(models.Model):
     deleted_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        db_table = 'monthly_stats'
\ No newline at end of file
+        db_table = 'monthly_stats'
+        constraints = [
+            # (사용자, 월)당 한 행만 유지 (expense.monthly_stats 구체화 기준)
+            models.UniqueConstraint(fields=['user', 'target_month'], name='uniq_monthly_stat_user_month'),
+        ]
\ No newline at end of file
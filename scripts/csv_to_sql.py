@@ -28,69 +28,9 @@ CATEGORY_MAP = {
     '여행/숙박': '@cat_travel',
 }
 
-# Keyword to category mapping
-KEYWORD_TO_CATEGORY = {
-    # 식비
-    '식음료': '식비', '식비': '식비', '음식점': '식비', '외식': '식비',
-    '일반음식점': '식비', '식당': '식비', '레스토랑': '식비',
-
-    # 카페/디저트
-    '카페': '카페/디저트', '디저트': '카페/디저트', '커피': '카페/디저트',
-    '스타벅스': '카페/디저트', '베이커리': '카페/디저트',
-
-    # 대중교통
-    '교통': '대중교통', '대중교통': '대중교통', '택시': '대중교통',
-    '버스': '대중교통', '지하철': '대중교통', '전철': '대중교통',
-
-    # 편의점
-    '편의점': '편의점', 'CVS': '편의점', 'GS25': '편의점', 'CU': '편의점',
-    '세븐일레븐': '편의점',
-
-    # 온라인쇼핑
-    '온라인': '온라인쇼핑', '쇼핑': '온라인쇼핑', '인터넷': '온라인쇼핑',
-    '온라인쇼핑': '온라인쇼핑', '쿠팡': '온라인쇼핑', '배달': '온라인쇼핑',
-    '배달앱': '온라인쇼핑', '간편결제': '온라인쇼핑',
-
-    # 대형마트
-    '마트': '대형마트', '대형마트': '대형마트', '슈퍼마켓': '대형마트',
-    '백화점': '대형마트', '대형할인점': '대형마트', '이마트': '대형마트',
-    '홈플러스': '대형마트', '롯데마트': '대형마트',
-
-    # 주유/차량
-    '주유': '주유/차량', '차량': '주유/차량', '자동차': '주유/차량',
-    '정유사': '주유/차량', '차량서비스': '주유/차량', '주차': '주유/차량',
-
-    # 통신/공과금
-    '통신': '통신/공과금', '공과금': '통신/공과금', 'SKT': '통신/공과금',
-    'KT': '통신/공과금', 'LG': '통신/공과금', '통신요금': '통신/공과금',
-    '관리비': '통신/공과금', '아파트관리비': '통신/공과금',
-
-    # 디지털구독
-    '디지털': '디지털구독', '구독': '디지털구독', 'OTT': '디지털구독',
-    '넷플릭스': '디지털구독', '스포티파이': '디지털구독', '스트리밍': '디지털구독',
-    '디지털콘텐츠': '디지털구독', '멤버십': '디지털구독', '인앱': '디지털구독',
-
-    # 문화/여가
-    '문화': '문화/여가', '영화': '문화/여가', '공연': '문화/여가',
-    'CGV': '문화/여가', '롯데시네마': '문화/여가', '메가박스': '문화/여가',
-    '여가': '문화/여가',
-
-    # 의료/건강
-    '의료': '의료/건강', '건강': '의료/건강', '병원': '의료/건강',
-    '약국': '의료/건강',
-
-    # 교육
-    '교육': '교육', '학원': '교육', '도서': '교육', '서점': '교육',
-
-    # 뷰티/잡화
-    '뷰티': '뷰티/잡화', '화장품': '뷰티/잡화', '올리브영': '뷰티/잡화',
-    '패션': '뷰티/잡화', '의류': '뷰티/잡화',
-
-    # 여행/숙박
-    '여행': '여행/숙박', '숙박': '여행/숙박', '항공': '여행/숙박',
-    '호텔': '여행/숙박', '면세': '여행/숙박', '면세점': '여행/숙박',
-    '공항': '여행/숙박', '라운지': '여행/숙박', '골프': '여행/숙박',
-}
+# Keyword to category mapping (single source: Backend/category/keywords.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Backend'))
+from category.keywords import KEYWORD_TO_CATEGORY  # noqa: E402
 
 # Keywords to skip (not actual spending categories)
 SKIP_KEYWORDS = {